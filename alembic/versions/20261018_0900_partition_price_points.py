@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import calendar
+import time
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261018_0900"
+down_revision: str | None = "20260116_1932"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+_MONTHS_AHEAD = 3
+
+
+def _month_start(index: int) -> int:
+    return calendar.timegm((index // 12, index % 12 + 1, 1, 0, 0, 0))
+
+
+def _month_index(ts_unix: int) -> int:
+    dt = datetime.fromtimestamp(ts_unix, tz=timezone.utc)
+    return dt.year * 12 + dt.month - 1
+
+
+def _month_ranges(indexes: Iterable[int]) -> Iterator[tuple[str, int, int]]:
+    for index in sorted(set(indexes)):
+        name = f"price_points_p{index // 12:04d}{index % 12 + 1:02d}"
+        yield name, _month_start(index), _month_start(index + 1)
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE price_points RENAME TO price_points_unpartitioned")
+    op.execute(
+        "ALTER TABLE price_points_unpartitioned"
+        " RENAME CONSTRAINT price_points_pkey TO price_points_unpartitioned_pkey"
+    )
+    op.execute(
+        "ALTER TABLE price_points_unpartitioned RENAME CONSTRAINT"
+        " uq_price_points_ticker_ts_unix TO uq_price_points_unpartitioned_ticker_ts_unix"
+    )
+    op.execute(
+        "ALTER INDEX ix_price_points_ts_unix RENAME TO ix_price_points_unpartitioned_ts_unix"
+    )
+    op.execute("ALTER SEQUENCE price_points_id_seq OWNED BY NONE")
+
+    # The partition key must be part of every unique constraint, so the
+    # primary key becomes (id, ts_unix); (ticker, ts_unix) already qualifies.
+    op.execute(
+        """
+        CREATE TABLE price_points (
+            id BIGINT NOT NULL DEFAULT nextval('price_points_id_seq'),
+            ticker TEXT NOT NULL,
+            ts_unix BIGINT NOT NULL,
+            price NUMERIC(20, 10) NOT NULL,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            CONSTRAINT price_points_pkey PRIMARY KEY (id, ts_unix),
+            CONSTRAINT uq_price_points_ticker_ts_unix UNIQUE (ticker, ts_unix)
+        ) PARTITION BY RANGE (ts_unix)
+        """
+    )
+    op.create_index("ix_price_points_ts_unix", "price_points", ["ts_unix"])
+    op.execute("CREATE TABLE price_points_default PARTITION OF price_points DEFAULT")
+
+    # One partition per month that already holds data, plus the current month
+    # and a few ahead; anything else lands in the default partition.
+    bind = op.get_bind()
+    data_months = bind.execute(
+        sa.text(
+            "SELECT DISTINCT CAST(extract(year FROM month) * 12"
+            " + extract(month FROM month) - 1 AS INTEGER) FROM ("
+            " SELECT date_trunc('month', to_timestamp(ts_unix) AT TIME ZONE 'UTC')"
+            " AS month FROM price_points_unpartitioned) AS months"
+        )
+    ).scalars()
+    current = _month_index(int(time.time()))
+    months = [*data_months, *range(current, current + _MONTHS_AHEAD + 1)]
+
+    for name, start, end in _month_ranges(months):
+        op.execute(
+            f"CREATE TABLE {name} PARTITION OF price_points"
+            f" FOR VALUES FROM ({start}) TO ({end})"
+        )
+
+    op.execute(
+        "INSERT INTO price_points (id, ticker, ts_unix, price, created_at)"
+        " SELECT id, ticker, ts_unix, price, created_at FROM price_points_unpartitioned"
+    )
+    op.execute("DROP TABLE price_points_unpartitioned")
+    op.execute("ALTER SEQUENCE price_points_id_seq OWNED BY price_points.id")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE price_points RENAME TO price_points_partitioned")
+    op.execute(
+        "ALTER TABLE price_points_partitioned"
+        " RENAME CONSTRAINT price_points_pkey TO price_points_partitioned_pkey"
+    )
+    op.execute(
+        "ALTER TABLE price_points_partitioned RENAME CONSTRAINT"
+        " uq_price_points_ticker_ts_unix TO uq_price_points_partitioned_ticker_ts_unix"
+    )
+    op.execute(
+        "ALTER INDEX ix_price_points_ts_unix RENAME TO ix_price_points_partitioned_ts_unix"
+    )
+    op.execute("ALTER SEQUENCE price_points_id_seq OWNED BY NONE")
+
+    op.execute(
+        """
+        CREATE TABLE price_points (
+            id BIGINT NOT NULL DEFAULT nextval('price_points_id_seq'),
+            ticker TEXT NOT NULL,
+            ts_unix BIGINT NOT NULL,
+            price NUMERIC(20, 10) NOT NULL,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            CONSTRAINT price_points_pkey PRIMARY KEY (id),
+            CONSTRAINT uq_price_points_ticker_ts_unix UNIQUE (ticker, ts_unix)
+        )
+        """
+    )
+    op.create_index("ix_price_points_ts_unix", "price_points", ["ts_unix"])
+    op.execute(
+        "INSERT INTO price_points (id, ticker, ts_unix, price, created_at)"
+        " SELECT id, ticker, ts_unix, price, created_at FROM price_points_partitioned"
+    )
+    # Dropping the parent drops every partition with it.
+    op.execute("DROP TABLE price_points_partitioned")
+    op.execute("ALTER SEQUENCE price_points_id_seq OWNED BY price_points.id")
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261018_0930"
+down_revision: str | None = "20261018_0900"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def _rename_with_indexes(table: str, suffix: str) -> None:
+    # Index (and thus constraint) names are schema-wide, so they move aside
+    # with the table to let the rebuilt one reuse them.
+    bind = op.get_bind()
+    indexes = bind.execute(
+        sa.text("SELECT indexname FROM pg_indexes WHERE tablename = :table"),
+        {"table": table},
+    ).scalars()
+    for index in list(indexes):
+        op.execute(f"ALTER INDEX {index} RENAME TO {index}{suffix}")
+    op.execute(f"ALTER TABLE {table} RENAME TO {table}{suffix}")
+
+
+def _partitions(parent: str) -> list[tuple[str, str]]:
+    bind = op.get_bind()
+    result = bind.execute(
+        sa.text(
+            "SELECT child.relname, pg_get_expr(child.relpartbound, child.oid)"
+            " FROM pg_inherits"
+            " JOIN pg_class parent ON parent.oid = pg_inherits.inhparent"
+            " JOIN pg_class child ON child.oid = pg_inherits.inhrelid"
+            " WHERE parent.relname = :parent"
+        ),
+        {"parent": parent},
+    )
+    return [(name, bound) for name, bound in result]
+
+
+def _move_aside(suffix: str) -> list[tuple[str, str]]:
+    partitions = _partitions("price_points")
+    for name, _ in partitions:
+        _rename_with_indexes(name, suffix)
+    _rename_with_indexes("price_points", suffix)
+    return partitions
+
+
+def _create_partitions(partitions: Sequence[tuple[str, str]]) -> None:
+    for name, bound in partitions:
+        op.execute(f"CREATE TABLE {name} PARTITION OF price_points {bound}")
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE tickers (
+            id SMALLINT GENERATED BY DEFAULT AS IDENTITY,
+            name TEXT NOT NULL,
+            CONSTRAINT tickers_pkey PRIMARY KEY (id),
+            CONSTRAINT uq_tickers_name UNIQUE (name)
+        )
+        """
+    )
+    op.execute(
+        "INSERT INTO tickers (name)"
+        " SELECT DISTINCT ticker FROM price_points ORDER BY ticker"
+    )
+
+    partitions = _move_aside("_wide")
+
+    # ts_unix leads so the BIGINT is 8-byte aligned without padding after
+    # the SMALLINT; the surrogate id and unused created_at are gone.
+    op.execute(
+        """
+        CREATE TABLE price_points (
+            ts_unix BIGINT NOT NULL,
+            ticker_id SMALLINT NOT NULL,
+            price NUMERIC(20, 10) NOT NULL,
+            CONSTRAINT price_points_pkey PRIMARY KEY (ticker_id, ts_unix),
+            CONSTRAINT fk_price_points_ticker_id_tickers
+                FOREIGN KEY (ticker_id) REFERENCES tickers (id)
+        ) PARTITION BY RANGE (ts_unix)
+        """
+    )
+    op.create_index("ix_price_points_ts_unix", "price_points", ["ts_unix"])
+    _create_partitions(partitions)
+
+    op.execute(
+        "INSERT INTO price_points (ts_unix, ticker_id, price)"
+        " SELECT p.ts_unix, t.id, p.price FROM price_points_wide AS p"
+        " JOIN tickers AS t ON t.name = p.ticker"
+    )
+    # Dropping the parent drops every partition with it.
+    op.execute("DROP TABLE price_points_wide")
+
+
+def downgrade() -> None:
+    partitions = _move_aside("_compact")
+
+    op.execute("CREATE SEQUENCE price_points_id_seq AS BIGINT")
+    op.execute(
+        """
+        CREATE TABLE price_points (
+            id BIGINT NOT NULL DEFAULT nextval('price_points_id_seq'),
+            ticker TEXT NOT NULL,
+            ts_unix BIGINT NOT NULL,
+            price NUMERIC(20, 10) NOT NULL,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            CONSTRAINT price_points_pkey PRIMARY KEY (id, ts_unix),
+            CONSTRAINT uq_price_points_ticker_ts_unix UNIQUE (ticker, ts_unix)
+        ) PARTITION BY RANGE (ts_unix)
+        """
+    )
+    op.execute("ALTER SEQUENCE price_points_id_seq OWNED BY price_points.id")
+    op.create_index("ix_price_points_ts_unix", "price_points", ["ts_unix"])
+    _create_partitions(partitions)
+
+    op.execute(
+        "INSERT INTO price_points (ticker, ts_unix, price)"
+        " SELECT t.name, p.ts_unix, p.price FROM price_points_compact AS p"
+        " JOIN tickers AS t ON t.id = p.ticker_id"
+        " ORDER BY p.ts_unix, t.name"
+    )
+    op.execute("DROP TABLE price_points_compact")
+    op.execute("DROP TABLE tickers")
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261018_1000"
+down_revision: str | None = "20261018_0930"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "tickers",
+        sa.Column("enabled", sa.Boolean(), nullable=False, server_default=sa.true()),
+    )
+    # The two indices the service always tracked stay in the registry even on
+    # an empty database; the rest arrive via the Deribit index list refresh.
+    op.execute(
+        "INSERT INTO tickers (name) VALUES ('btc_usd'), ('eth_usd')"
+        " ON CONFLICT (name) DO NOTHING"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("tickers", "enabled")
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261018_1100"
+down_revision: str | None = "20261018_1000"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+_ROLLUP_TABLES = ("price_rollups_1h", "price_rollups_1d")
+
+
+def _create_rollup_table(name: str) -> None:
+    op.create_table(
+        name,
+        sa.Column("bucket_ts", sa.BigInteger(), nullable=False),
+        sa.Column("ticker_id", sa.SmallInteger(), nullable=False),
+        sa.Column("open", sa.Numeric(20, 10), nullable=False),
+        sa.Column("high", sa.Numeric(20, 10), nullable=False),
+        sa.Column("low", sa.Numeric(20, 10), nullable=False),
+        sa.Column("close", sa.Numeric(20, 10), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.Column("price_sum", sa.Numeric(), nullable=False),
+        sa.PrimaryKeyConstraint("ticker_id", "bucket_ts", name=f"{name}_pkey"),
+        sa.ForeignKeyConstraint(
+            ["ticker_id"], ["tickers.id"], name=f"fk_{name}_ticker_id_tickers"
+        ),
+    )
+
+
+def upgrade() -> None:
+    for name in _ROLLUP_TABLES:
+        _create_rollup_table(name)
+    op.create_table(
+        "price_rollup_dirty",
+        sa.Column("bucket_ts", sa.BigInteger(), nullable=False),
+        sa.Column("ticker_id", sa.SmallInteger(), nullable=False),
+        sa.PrimaryKeyConstraint(
+            "ticker_id", "bucket_ts", name="price_rollup_dirty_pkey"
+        ),
+    )
+
+    # Statement-level triggers see every row a statement wrote through the
+    # transition table, so a multi-row upsert or bulk load marks each touched
+    # hour once instead of firing per row. Transition tables allow a single
+    # event per trigger, hence one for inserts and one for upsert updates.
+    op.execute(
+        """
+        CREATE FUNCTION mark_price_rollups_dirty() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO price_rollup_dirty (ticker_id, bucket_ts)
+            SELECT DISTINCT ticker_id, ts_unix - ts_unix % 3600 FROM changed_rows
+            ON CONFLICT DO NOTHING;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    for event in ("INSERT", "UPDATE"):
+        op.execute(
+            f"CREATE TRIGGER price_points_rollup_dirty_{event.lower()}"
+            f" AFTER {event} ON price_points"
+            " REFERENCING NEW TABLE AS changed_rows"
+            " FOR EACH STATEMENT EXECUTE FUNCTION mark_price_rollups_dirty()"
+        )
+
+    # Existing history is queued as dirty; the worker folds it in batches and
+    # reads fall back to raw points for any hour not rolled up yet.
+    op.execute(
+        "INSERT INTO price_rollup_dirty (ticker_id, bucket_ts)"
+        " SELECT DISTINCT ticker_id, ts_unix - ts_unix % 3600 FROM price_points"
+    )
+
+
+def downgrade() -> None:
+    for event in ("insert", "update"):
+        op.execute(f"DROP TRIGGER price_points_rollup_dirty_{event} ON price_points")
+    op.execute("DROP FUNCTION mark_price_rollups_dirty()")
+    op.drop_table("price_rollup_dirty")
+    for name in reversed(_ROLLUP_TABLES):
+        op.drop_table(name)
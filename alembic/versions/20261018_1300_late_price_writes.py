@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261018_1300"
+down_revision: str | None = "20261018_1200"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("tickers", sa.Column("late_write_ts", sa.BigInteger(), nullable=True))
+
+    # A row older than the previous minute bucket lands in a window the API
+    # already serves as closed. Stamping the ticker (and notifying the API)
+    # changes that window's validators, so clients see backfilled rows.
+    # clock_timestamp() rather than now(): a long backfill transaction must
+    # not judge its rows by when it started.
+    op.execute(
+        """
+        CREATE FUNCTION mark_late_price_writes() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            written_at BIGINT := floor(extract(epoch FROM clock_timestamp()));
+            closed_before BIGINT := written_at - written_at % 60 - 60;
+            ticker_name TEXT;
+        BEGIN
+            FOR ticker_name IN
+                UPDATE tickers SET late_write_ts = written_at
+                WHERE id IN (
+                    SELECT ticker_id FROM changed_rows WHERE ts_unix < closed_before
+                )
+                RETURNING name
+            LOOP
+                PERFORM pg_notify(
+                    'price_points_late',
+                    json_build_object(
+                        'ticker', ticker_name, 'late_write_ts', written_at
+                    )::text
+                );
+            END LOOP;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    for event in ("INSERT", "UPDATE"):
+        op.execute(
+            f"CREATE TRIGGER price_points_late_write_{event.lower()}"
+            f" AFTER {event} ON price_points"
+            " REFERENCING NEW TABLE AS changed_rows"
+            " FOR EACH STATEMENT EXECUTE FUNCTION mark_late_price_writes()"
+        )
+
+
+def downgrade() -> None:
+    for event in ("insert", "update"):
+        op.execute(f"DROP TRIGGER price_points_late_write_{event} ON price_points")
+    op.execute("DROP FUNCTION mark_late_price_writes()")
+    op.drop_column("tickers", "late_write_ts")
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from dataclasses import dataclass
+from datetime import UTC
+from email.utils import formatdate, parsedate_to_datetime
+
+from fastapi import Request, Response
+
+from app.core.config import get_settings
+from app.services.latest_price_cache import LatestPriceCache
+from app.services.price_service import compute_minute_bucket
+
+# Bump when the response body format changes, so old ETags stop matching.
+_ETAG_VERSION = "1"
+
+# Matches the bound on DB_REPLICA_MAX_LAG_SECONDS.
+_LATE_WRITE_SETTLE_SECONDS = 60
+
+
+@dataclass(frozen=True)
+class CacheValidators:
+    etag: str | None
+    last_modified: int | None
+    max_age: int
+
+    def headers(self) -> dict[str, str]:
+        headers = {"Cache-Control": f"public, max-age={self.max_age}"}
+        if self.etag is not None:
+            headers["ETag"] = self.etag
+        if self.last_modified is not None:
+            headers["Last-Modified"] = formatdate(self.last_modified, usegmt=True)
+        return headers
+
+
+def window_is_closed(to_ts: int, *, now_ts: int | None = None) -> bool:
+    # The previous bucket may still be in flight (stream mode writes it when
+    # the next one opens), so only windows ending before that are final.
+    return to_ts < compute_minute_bucket(now_ts) - 60
+
+
+def window_validators(
+    request: Request,
+    *,
+    ticker: str,
+    to_ts: int | None,
+    cache: LatestPriceCache,
+    now_ts: int | None = None,
+) -> CacheValidators:
+    settings = get_settings()
+    if to_ts is not None and window_is_closed(to_ts, now_ts=now_ts):
+        # Live ingest no longer writes here, but backfill and late upserts
+        # can; those stamp the ticker, and the stamp versions the window.
+        late_write_ts = cache.late_write_ts(ticker)
+        now = int(now_ts if now_ts is not None else time.time())
+        if late_write_ts is None or now - late_write_ts < _LATE_WRITE_SETTLE_SECONDS:
+            # Unknown while the listener is down; fresh stamps wait out the
+            # replica lag guard so no replica pins the old data to a new tag.
+            return CacheValidators(
+                etag=None,
+                last_modified=None,
+                max_age=settings.http_cache_open_max_age_seconds,
+            )
+        return CacheValidators(
+            etag=_etag(request, state=f"closed:{late_write_ts}"),
+            last_modified=max(to_ts + 60, late_write_ts),
+            max_age=settings.http_cache_closed_max_age_seconds,
+        )
+
+    # An open window changes whenever a new bucket lands, which the
+    # latest-price cache already tracks without a query.
+    latest = cache.get(ticker)
+    if latest is None:
+        return CacheValidators(
+            etag=None,
+            last_modified=None,
+            max_age=settings.http_cache_open_max_age_seconds,
+        )
+    return CacheValidators(
+        etag=_etag(request, state=f"{latest.ts_unix}:{latest.price}"),
+        last_modified=latest.ts_unix,
+        max_age=settings.http_cache_open_max_age_seconds,
+    )
+
+
+def is_not_modified(request: Request, validators: CacheValidators) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if validators.etag is None:
+            return False
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or validators.etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or validators.last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=UTC)
+    return validators.last_modified <= since.timestamp()
+
+
+def not_modified_response(
+    request: Request, validators: CacheValidators
+) -> Response | None:
+    if is_not_modified(request, validators):
+        return Response(status_code=304, headers=validators.headers())
+    return None
+
+
+def _etag(request: Request, *, state: str) -> str:
+    query = sorted(request.query_params.multi_items())
+    digest = hashlib.blake2b(
+        repr((_ETAG_VERSION, request.url.path, query, state)).encode(),
+        digest_size=16,
+    )
+    return f'"{digest.hexdigest()}"'
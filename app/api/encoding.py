@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from functools import cache
+from typing import Any
+
+from fastapi import Response
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+_REQUIRED = object()
+
+
+class FastJSONResponse(Response):
+    # pydantic-core's encoder: Decimal becomes an exact string, as it does
+    # through the response models.
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+
+@cache
+def _schema_fields(schema: type[BaseModel]) -> tuple[tuple[str, object], ...]:
+    return tuple(
+        (name, _REQUIRED if field.is_required() else field.default)
+        for name, field in schema.model_fields.items()
+    )
+
+
+def encode_rows(
+    rows: Sequence[Any], *, schema: type[BaseModel]
+) -> list[dict[str, object]]:
+    # Rows come straight from typed DB columns, so the schema only picks and
+    # names the fields; no model is built or validated per row.
+    fields = _schema_fields(schema)
+    return [
+        {
+            name: getattr(row, name)
+            if default is _REQUIRED
+            else getattr(row, name, default)
+            for name, default in fields
+        }
+        for row in rows
+    ]
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import csv
+import importlib.util
+import io
+import json
+from collections.abc import AsyncIterator, Sequence
+from typing import TYPE_CHECKING, Literal, Protocol
+
+from sqlalchemy import Row
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+ExportFormat = Literal["ndjson", "csv", "arrow", "parquet"]
+
+COLUMNAR_FORMATS: frozenset[str] = frozenset({"arrow", "parquet"})
+
+CSV_HEADER = ("ticker", "ts_unix", "price")
+
+MEDIA_TYPES: dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+class _Encoder(Protocol):
+    def __call__(self, rows: Sequence[Row]) -> bytes: ...
+
+
+def columnar_available() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def encode_ndjson(rows: Sequence[Row]) -> bytes:
+    # Prices stay exact decimal strings, as in PricePointOut.
+    return "".join(
+        json.dumps({"ticker": ticker, "ts_unix": ts_unix, "price": str(price)}) + "\n"
+        for ticker, ts_unix, price in rows
+    ).encode()
+
+
+def encode_csv(rows: Sequence[Row]) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerows((ticker, ts_unix, str(price)) for ticker, ts_unix, price in rows)
+    return buffer.getvalue().encode()
+
+
+async def encode_stream(
+    chunks: AsyncIterator[Sequence[Row]], *, fmt: ExportFormat, ticker: str
+) -> AsyncIterator[bytes]:
+    if fmt in COLUMNAR_FORMATS:
+        async for data in _encode_columnar(chunks, fmt=fmt, ticker=ticker):
+            yield data
+        return
+
+    encoder: _Encoder = encode_csv if fmt == "csv" else encode_ndjson
+    if fmt == "csv":
+        yield (",".join(CSV_HEADER) + "\n").encode()
+
+    async for rows in chunks:
+        yield encoder(rows)
+
+
+class _ChunkSink(io.RawIOBase):
+    # Collects what pyarrow writers emit so each batch can be yielded as bytes.
+    def __init__(self) -> None:
+        super().__init__()
+        self._parts: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: object) -> int:
+        chunk = bytes(data)  # pyright: ignore[reportArgumentType]
+        self._parts.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+def _price_schema(ticker: str) -> pa.Schema:
+    import pyarrow as pa
+
+    # Matches price_points.price NUMERIC(20, 10).
+    return pa.schema(
+        [("ts_unix", pa.int64()), ("price", pa.decimal128(20, 10))],
+        metadata={"ticker": ticker},
+    )
+
+
+def _record_batch(rows: Sequence[Row], schema: pa.Schema) -> pa.RecordBatch:
+    import pyarrow as pa
+
+    _, ts_unix, price = zip(*rows, strict=True)
+    return pa.RecordBatch.from_arrays(
+        [
+            pa.array(ts_unix, type=pa.int64()),
+            pa.array(price, type=pa.decimal128(20, 10)),
+        ],
+        schema=schema,
+    )
+
+
+async def _encode_columnar(
+    chunks: AsyncIterator[Sequence[Row]], *, fmt: str, ticker: str
+) -> AsyncIterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _price_schema(ticker)
+    sink = _ChunkSink()
+    writer = (
+        pq.ParquetWriter(sink, schema)
+        if fmt == "parquet"
+        else pa.ipc.new_stream(sink, schema)
+    )
+
+    try:
+        async for rows in chunks:
+            if not rows:
+                continue
+            writer.write_batch(_record_batch(rows, schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
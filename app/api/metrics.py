@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import HTTP_REQUEST_SECONDS, HTTP_REQUESTS_IN_FLIGHT
+
+_UNMATCHED = "<unmatched>"
+
+
+def route_template(scope: Scope) -> str:
+    # Labels use the matched route's path template, never the raw URL, so
+    # series stay bounded whatever clients put in the path. The router only
+    # records the route once it has dispatched the request.
+    return getattr(scope.get("route"), "path", _UNMATCHED)
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+
+        async def _send(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_flight = HTTP_REQUESTS_IN_FLIGHT.labels(method=method)
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            # Streaming responses are timed until their last chunk is sent.
+            in_flight.dec()
+            HTTP_REQUEST_SECONDS.labels(
+                method=method, route=route_template(scope), status=str(status)
+            ).observe(time.perf_counter() - started)
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
-from collections.abc import Sequence
-from typing import Protocol
+import base64
+import binascii
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from typing import Protocol, TypeVar
 
 
 class _RequestWithUrl(Protocol):
@@ -9,7 +12,79 @@ class _RequestWithUrl(Protocol):
     def url(self) -> object: ...
 
 
-def _replace_query_params(url: str, *, limit: int, offset: int) -> str:
+class _HasTsUnix(Protocol):
+    @property
+    def ts_unix(self) -> int: ...
+
+
+RowT = TypeVar("RowT", bound=_HasTsUnix)
+
+
+@dataclass(frozen=True)
+class Cursor:
+    after_ts: int | None = None
+    before_ts: int | None = None
+
+
+@dataclass(frozen=True)
+class CursorPage:
+    next_cursor: str | None
+    previous_cursor: str | None
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    if cursor.after_ts is not None:
+        raw = f"a:{cursor.after_ts}"
+    elif cursor.before_ts is not None:
+        raw = f"b:{cursor.before_ts}"
+    else:
+        raise ValueError("cursor must have after_ts or before_ts")
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(value: str) -> Cursor:
+    padded = value + "=" * (-len(value) % 4)
+    try:
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+    except (binascii.Error, UnicodeDecodeError) as exc:
+        raise ValueError("malformed cursor") from exc
+
+    direction, _, ts = raw.partition(":")
+    if not ts.isdigit():
+        raise ValueError("malformed cursor")
+    if direction == "a":
+        return Cursor(after_ts=int(ts))
+    if direction == "b":
+        return Cursor(before_ts=int(ts))
+    raise ValueError("malformed cursor")
+
+
+def split_keyset_page(
+    rows: Sequence[RowT], *, limit: int, cursor: Cursor | None
+) -> tuple[Sequence[RowT], CursorPage]:
+    has_more = len(rows) > limit
+
+    if cursor is not None and cursor.before_ts is not None:
+        page = rows[1:] if has_more else rows
+        previous_cursor = (
+            encode_cursor(Cursor(before_ts=page[0].ts_unix)) if has_more else None
+        )
+        next_after = page[-1].ts_unix if page else cursor.before_ts - 1
+        return page, CursorPage(
+            next_cursor=encode_cursor(Cursor(after_ts=next_after)),
+            previous_cursor=previous_cursor,
+        )
+
+    page = rows[:limit]
+    next_cursor = encode_cursor(Cursor(after_ts=page[-1].ts_unix)) if has_more else None
+    previous_cursor: str | None = None
+    if cursor is not None and cursor.after_ts is not None:
+        previous_before = page[0].ts_unix if page else cursor.after_ts + 1
+        previous_cursor = encode_cursor(Cursor(before_ts=previous_before))
+    return page, CursorPage(next_cursor=next_cursor, previous_cursor=previous_cursor)
+
+
+def _replace_query_params(url: str, updates: Mapping[str, str | None]) -> str:
     base, _, query = url.partition("?")
     params: dict[str, list[str]] = {}
     if query:
@@ -19,8 +94,11 @@ def _replace_query_params(url: str, *, limit: int, offset: int) -> str:
             key, _, value = part.partition("=")
             params.setdefault(key, []).append(value)
 
-    params["limit"] = [str(limit)]
-    params["offset"] = [str(offset)]
+    for key, value in updates.items():
+        if value is None:
+            params.pop(key, None)
+        else:
+            params[key] = [value]
 
     encoded = "&".join(
         f"{k}={v}" for k in sorted(params.keys()) for v in params[k] if v is not None
@@ -31,27 +109,34 @@ def _replace_query_params(url: str, *, limit: int, offset: int) -> str:
 def build_paginated_response(
     request: _RequestWithUrl,
     *,
-    count: int,
+    count: int | None,
     limit: int,
     offset: int,
     results: Sequence[object],
+    cursor_page: CursorPage | None = None,
+    has_next: bool | None = None,
 ) -> dict[str, object]:
     url = str(request.url)
 
     next_url: str | None
     previous_url: str | None
 
-    if offset + limit < count:
-        next_url = _replace_query_params(url, limit=limit, offset=offset + limit)
+    if cursor_page is not None:
+        next_url = _cursor_url(url, limit=limit, cursor=cursor_page.next_cursor)
+        previous_url = _cursor_url(url, limit=limit, cursor=cursor_page.previous_cursor)
     else:
-        next_url = None
+        if has_next is None:
+            has_next = count is not None and offset + limit < count
 
-    if offset > 0:
-        previous_url = _replace_query_params(
-            url, limit=limit, offset=max(offset - limit, 0)
-        )
-    else:
-        previous_url = None
+        if has_next:
+            next_url = _offset_url(url, limit=limit, offset=offset + limit)
+        else:
+            next_url = None
+
+        if offset > 0:
+            previous_url = _offset_url(url, limit=limit, offset=max(offset - limit, 0))
+        else:
+            previous_url = None
 
     return {
         "count": count,
@@ -59,3 +144,15 @@ def build_paginated_response(
         "previous": previous_url,
         "results": results,
     }
+
+
+def _offset_url(url: str, *, limit: int, offset: int) -> str:
+    return _replace_query_params(url, {"limit": str(limit), "offset": str(offset)})
+
+
+def _cursor_url(url: str, *, limit: int, cursor: str | None) -> str | None:
+    if cursor is None:
+        return None
+    return _replace_query_params(
+        url, {"limit": str(limit), "offset": None, "cursor": cursor}
+    )
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import logging
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.api.metrics import route_template
+from app.db.instrumentation import QueryAccount, account_queries
+
+logger = logging.getLogger(__name__)
+
+
+def server_timing(account: QueryAccount, *, elapsed: float) -> str:
+    return (
+        f'db;dur={account.seconds * 1000:.2f};desc="{account.count} queries", '
+        f"app;dur={elapsed * 1000:.2f}"
+    )
+
+
+class RequestLogMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+        with account_queries(f"{scope['method']} {scope['path']}") as account:
+
+            async def _send(message: Message) -> None:
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    # Covers the queries behind the response; a streamed body
+                    # may run more, which only the log line below includes.
+                    MutableHeaders(scope=message).append(
+                        "Server-Timing",
+                        server_timing(account, elapsed=time.perf_counter() - started),
+                    )
+                await send(message)
+
+            try:
+                await self.app(scope, receive, _send)
+            finally:
+                logger.info(
+                    "request",
+                    extra={
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "route": route_template(scope),
+                        "status": status,
+                        "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+                        "db_queries": account.count,
+                        "db_time_ms": round(account.seconds * 1000, 3),
+                    },
+                )
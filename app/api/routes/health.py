@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+
+from app.db.replicas import ReadRouter, get_read_router
+from app.db.session import Database, get_database
 
 router = APIRouter(tags=["health"])
 
@@ -8,3 +11,15 @@ router = APIRouter(tags=["health"])
 @router.get("/health")
 def health() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@router.get("/health/db-pool")
+def db_pool(db: Database = Depends(get_database)) -> dict[str, object]:
+    return db.pool_status()
+
+
+@router.get("/health/db-replicas")
+def db_replicas(
+    reads: ReadRouter = Depends(get_read_router),
+) -> list[dict[str, object]]:
+    return reads.status()
@@ -1,14 +1,54 @@
 from __future__ import annotations
 
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Mapping, Sequence
+from typing import Any, Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.pagination import build_paginated_response
-from app.db.session import get_db_session
-from app.schemas.prices import PaginatedPricePointsOut, PricePointOut
-from app.services.price_service import SUPPORTED_TICKERS, PriceService
+from app.api.caching import not_modified_response, window_validators
+from app.api.encoding import FastJSONResponse, encode_rows
+from app.api.export import (
+    COLUMNAR_FORMATS,
+    MEDIA_TYPES,
+    ExportFormat,
+    columnar_available,
+    encode_stream,
+)
+from app.api.pagination import (
+    Cursor,
+    CursorPage,
+    build_paginated_response,
+    decode_cursor,
+    split_keyset_page,
+)
+from app.core.config import get_settings
+from app.db.replicas import (
+    ReadRouter,
+    connect_read_session,
+    get_lazy_read_db_session,
+    get_read_db_session,
+    get_read_router,
+)
+from app.schemas.prices import (
+    DownsampledPointOut,
+    DownsampleOut,
+    OhlcCandleOut,
+    PaginatedOhlcOut,
+    PaginatedPriceGapsOut,
+    PaginatedPricePointsOut,
+    PaginatedRangePricePointsOut,
+    PriceGapOut,
+    PricePointOut,
+    PriceStatsOut,
+    RangePricePointOut,
+)
+from app.services.downsample import DownsampleMethod, lttb_available
+from app.services.latest_price_cache import LatestPriceCache, get_latest_price_cache
+from app.services.price_service import CountMode, FillMode, PriceService
+from app.services.ticker_registry import TickerRegistry, get_ticker_registry
 
 router = APIRouter(tags=["prices"])
 
@@ -16,53 +56,230 @@ _DEFAULT_LIMIT = 100
 _MAX_LIMIT = 1000
 
 
-def _validate_ticker(ticker: str) -> str:
-    if ticker not in SUPPORTED_TICKERS:
+def _validated_ticker(
+    ticker: str, registry: TickerRegistry = Depends(get_ticker_registry)
+) -> str:
+    if ticker not in registry:
         raise HTTPException(
             status_code=422,
             detail={
                 "error": "invalid_ticker",
-                "message": f"ticker must be one of {', '.join(SUPPORTED_TICKERS)}",
+                "message": f"ticker {ticker!r} is not tracked",
             },
         )
     return ticker
 
 
+def _validate_range(from_ts: int | None, to_ts: int | None) -> None:
+    if from_ts is not None and to_ts is not None and from_ts > to_ts:
+        raise HTTPException(
+            status_code=422,
+            detail={
+                "error": "invalid_range",
+                "message": "from_ts must be <= to_ts",
+            },
+        )
+
+
+_INTERVAL_UNITS = {"m": 60, "h": 3600, "d": 86400}
+
+
+def _parse_interval(interval: str) -> int:
+    value = interval.strip().lower()
+    if value[-1:] in _INTERVAL_UNITS:
+        number, multiplier = value[:-1], _INTERVAL_UNITS[value[-1]]
+    else:
+        number, multiplier = value, 1
+
+    seconds = int(number) * multiplier if number.isdigit() else 0
+    if seconds <= 0 or seconds % 60 != 0:
+        raise HTTPException(
+            status_code=422,
+            detail={
+                "error": "invalid_interval",
+                "message": "interval must be a positive multiple of 60 seconds, "
+                "e.g. 300, 5m, 1h or 1d",
+            },
+        )
+    return seconds
+
+
+def _resolve_cursor(
+    pagination: Literal["offset", "cursor"], cursor: str | None, offset: int
+) -> Cursor | None:
+    if cursor is None and pagination == "offset":
+        return None
+
+    if offset:
+        raise HTTPException(
+            status_code=422,
+            detail={
+                "error": "invalid_pagination",
+                "message": "offset cannot be combined with cursor pagination",
+            },
+        )
+    if cursor is None:
+        return Cursor()
+
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=422,
+            detail={"error": "invalid_cursor", "message": "cursor is malformed"},
+        ) from None
+
+
+def _needs_probe(keyset: Cursor | None, count_mode: CountMode) -> bool:
+    # Without an exact count, one surplus row tells whether a next page exists.
+    return keyset is not None or count_mode != "exact"
+
+
+def _build_page(
+    request: Request,
+    *,
+    rows: Sequence[Any],
+    count: int | None,
+    limit: int,
+    offset: int,
+    keyset: Cursor | None,
+    probe: bool,
+    schema: type[BaseModel],
+    headers: Mapping[str, str] | None = None,
+) -> Response:
+    cursor_page: CursorPage | None = None
+    has_next: bool | None = None
+    if keyset is not None:
+        rows, cursor_page = split_keyset_page(rows, limit=limit, cursor=keyset)
+    elif probe:
+        has_next = len(rows) > limit
+        rows = rows[:limit]
+
+    # Encoded in one go instead of validating a model per row and then the
+    # whole envelope again through response_model, which stays for the docs.
+    envelope = build_paginated_response(
+        request,
+        count=count,
+        limit=limit,
+        offset=offset,
+        results=encode_rows(rows, schema=schema),
+        cursor_page=cursor_page,
+        has_next=has_next,
+    )
+    return FastJSONResponse(envelope, headers=headers)
+
+
+async def _paginated_prices(
+    request: Request,
+    *,
+    session: AsyncSession,
+    ticker: str,
+    from_ts: int | None,
+    to_ts: int | None,
+    limit: int,
+    offset: int,
+    keyset: Cursor | None,
+    count_mode: CountMode,
+    fill: FillMode = "none",
+    schema: type[BaseModel] = PricePointOut,
+    headers: Mapping[str, str] | None = None,
+) -> Response:
+    await connect_read_session(session)
+    probe = _needs_probe(keyset, count_mode)
+    service = PriceService()
+
+    if fill == "none":
+        page = await service.page_prices(
+            session=session,
+            ticker=ticker,
+            from_ts=from_ts,
+            to_ts=to_ts,
+            limit=limit + 1 if probe else limit,
+            offset=offset,
+            after_ts=keyset.after_ts if keyset else None,
+            before_ts=keyset.before_ts if keyset else None,
+            count_mode=count_mode,
+        )
+    else:
+        if from_ts is None or to_ts is None:
+            raise HTTPException(
+                status_code=422,
+                detail={
+                    "error": "invalid_fill",
+                    "message": f"fill={fill} requires both from_ts and to_ts",
+                },
+            )
+        page = await service.page_filled_prices(
+            session=session,
+            ticker=ticker,
+            from_ts=from_ts,
+            to_ts=to_ts,
+            fill=fill,
+            limit=limit + 1 if probe else limit,
+            offset=offset,
+            after_ts=keyset.after_ts if keyset else None,
+            before_ts=keyset.before_ts if keyset else None,
+            count_mode=count_mode,
+        )
+
+    return _build_page(
+        request,
+        rows=page.rows,
+        count=page.count,
+        limit=limit,
+        offset=offset,
+        keyset=keyset,
+        probe=probe,
+        schema=schema,
+        headers=headers,
+    )
+
+
 @router.get("/prices", response_model=PaginatedPricePointsOut)
 async def list_prices(
     request: Request,
-    ticker: str,
+    ticker: str = Depends(_validated_ticker),
     limit: int = Query(default=_DEFAULT_LIMIT, ge=1, le=_MAX_LIMIT),
     offset: int = Query(default=0, ge=0),
-    session: AsyncSession = Depends(get_db_session),
-) -> dict[str, object]:
-    ticker = _validate_ticker(ticker)
-
-    service = PriceService()
-    count = await service.count_prices(session=session, ticker=ticker)
-    results: Sequence[PricePointOut] = [
-        PricePointOut.model_validate(p)
-        for p in await service.list_prices(
-            session=session, ticker=ticker, limit=limit, offset=offset
-        )
-    ]
+    pagination: Literal["offset", "cursor"] = Query(default="offset"),
+    cursor: str | None = Query(default=None),
+    count: CountMode = Query(default="exact"),
+    cache: LatestPriceCache = Depends(get_latest_price_cache),
+    session: AsyncSession = Depends(get_lazy_read_db_session),
+) -> Response:
+    keyset = _resolve_cursor(pagination, cursor, offset)
+    validators = window_validators(request, ticker=ticker, to_ts=None, cache=cache)
+    not_modified = not_modified_response(request, validators)
+    if not_modified is not None:
+        return not_modified
 
-    return build_paginated_response(
+    return await _paginated_prices(
         request,
-        count=count,
+        session=session,
+        ticker=ticker,
+        from_ts=None,
+        to_ts=None,
         limit=limit,
         offset=offset,
-        results=results,
+        keyset=keyset,
+        count_mode=count,
+        headers=validators.headers(),
     )
 
 
 @router.get("/prices/latest", response_model=PricePointOut)
 async def latest_price(
-    ticker: str,
-    session: AsyncSession = Depends(get_db_session),
+    ticker: str = Depends(_validated_ticker),
+    cache: LatestPriceCache = Depends(get_latest_price_cache),
+    session: AsyncSession = Depends(get_lazy_read_db_session),
 ) -> PricePointOut:
-    ticker = _validate_ticker(ticker)
+    cached = cache.get(ticker)
+    if cached is not None:
+        return PricePointOut(
+            ticker=cached.ticker, ts_unix=cached.ts_unix, price=cached.price
+        )
 
+    await connect_read_session(session)
     service = PriceService()
     price_point = await service.latest_price(session=session, ticker=ticker)
     if price_point is None:
@@ -74,54 +291,250 @@ async def latest_price(
             },
         )
 
+    cache.put(
+        ticker=price_point.ticker,
+        ts_unix=price_point.ts_unix,
+        price=price_point.price,
+    )
     return PricePointOut.model_validate(price_point)
 
 
-@router.get("/prices/range", response_model=PaginatedPricePointsOut)
+@router.get("/prices/range", response_model=PaginatedRangePricePointsOut)
 async def list_prices_range(
     request: Request,
-    ticker: str,
+    ticker: str = Depends(_validated_ticker),
     from_ts: int | None = Query(default=None, ge=0),
     to_ts: int | None = Query(default=None, ge=0),
     limit: int = Query(default=_DEFAULT_LIMIT, ge=1, le=_MAX_LIMIT),
     offset: int = Query(default=0, ge=0),
-    session: AsyncSession = Depends(get_db_session),
-) -> dict[str, object]:
-    ticker = _validate_ticker(ticker)
+    pagination: Literal["offset", "cursor"] = Query(default="offset"),
+    cursor: str | None = Query(default=None),
+    count: CountMode = Query(default="exact"),
+    fill: FillMode = Query(default="none"),
+    cache: LatestPriceCache = Depends(get_latest_price_cache),
+    session: AsyncSession = Depends(get_lazy_read_db_session),
+) -> Response:
+    _validate_range(from_ts, to_ts)
+    keyset = _resolve_cursor(pagination, cursor, offset)
+    # Checked before any query: a 304 never touches the connection pool.
+    validators = window_validators(request, ticker=ticker, to_ts=to_ts, cache=cache)
+    not_modified = not_modified_response(request, validators)
+    if not_modified is not None:
+        return not_modified
 
-    if from_ts is not None and to_ts is not None and from_ts > to_ts:
+    return await _paginated_prices(
+        request,
+        session=session,
+        ticker=ticker,
+        from_ts=from_ts,
+        to_ts=to_ts,
+        limit=limit,
+        offset=offset,
+        keyset=keyset,
+        count_mode=count,
+        fill=fill,
+        schema=RangePricePointOut,
+        headers=validators.headers(),
+    )
+
+
+@router.get("/prices/gaps", response_model=PaginatedPriceGapsOut)
+async def list_price_gaps(
+    request: Request,
+    ticker: str = Depends(_validated_ticker),
+    from_ts: int = Query(ge=0),
+    to_ts: int = Query(ge=0),
+    limit: int = Query(default=_DEFAULT_LIMIT, ge=1, le=_MAX_LIMIT),
+    offset: int = Query(default=0, ge=0),
+    session: AsyncSession = Depends(get_read_db_session),
+) -> Response:
+    _validate_range(from_ts, to_ts)
+
+    gaps = await PriceService().list_gaps(
+        session=session,
+        ticker=ticker,
+        from_ts=from_ts,
+        to_ts=to_ts,
+        limit=limit + 1,
+        offset=offset,
+    )
+
+    return _build_page(
+        request,
+        rows=gaps,
+        count=None,
+        limit=limit,
+        offset=offset,
+        keyset=None,
+        probe=True,
+        schema=PriceGapOut,
+    )
+
+
+@router.get("/prices/ohlc", response_model=PaginatedOhlcOut)
+async def list_prices_ohlc(
+    request: Request,
+    ticker: str = Depends(_validated_ticker),
+    interval: str = Query(),
+    from_ts: int | None = Query(default=None, ge=0),
+    to_ts: int | None = Query(default=None, ge=0),
+    limit: int = Query(default=_DEFAULT_LIMIT, ge=1, le=_MAX_LIMIT),
+    offset: int = Query(default=0, ge=0),
+    pagination: Literal["offset", "cursor"] = Query(default="offset"),
+    cursor: str | None = Query(default=None),
+    count: CountMode = Query(default="exact"),
+    session: AsyncSession = Depends(get_read_db_session),
+) -> Response:
+    interval_seconds = _parse_interval(interval)
+    _validate_range(from_ts, to_ts)
+    keyset = _resolve_cursor(pagination, cursor, offset)
+    probe = _needs_probe(keyset, count)
+
+    page = await PriceService().page_ohlc(
+        session=session,
+        ticker=ticker,
+        interval=interval_seconds,
+        from_ts=from_ts,
+        to_ts=to_ts,
+        limit=limit + 1 if probe else limit,
+        offset=offset,
+        after_ts=keyset.after_ts if keyset else None,
+        before_ts=keyset.before_ts if keyset else None,
+        count_mode=count,
+    )
+
+    return _build_page(
+        request,
+        rows=page.rows,
+        count=page.count,
+        limit=limit,
+        offset=offset,
+        keyset=keyset,
+        probe=probe,
+        schema=OhlcCandleOut,
+    )
+
+
+@router.get("/prices/stats", response_model=PriceStatsOut)
+async def price_stats(
+    request: Request,
+    ticker: str = Depends(_validated_ticker),
+    from_ts: int | None = Query(default=None, ge=0),
+    to_ts: int | None = Query(default=None, ge=0),
+    cache: LatestPriceCache = Depends(get_latest_price_cache),
+    session: AsyncSession = Depends(get_lazy_read_db_session),
+) -> Response:
+    _validate_range(from_ts, to_ts)
+    validators = window_validators(request, ticker=ticker, to_ts=to_ts, cache=cache)
+    not_modified = not_modified_response(request, validators)
+    if not_modified is not None:
+        return not_modified
+
+    await connect_read_session(session)
+    stats = await PriceService().price_stats(
+        session=session, ticker=ticker, from_ts=from_ts, to_ts=to_ts
+    )
+
+    return FastJSONResponse(
+        {
+            "ticker": ticker,
+            "from_ts": from_ts,
+            "to_ts": to_ts,
+            "open": stats.open,
+            "high": stats.high,
+            "low": stats.low,
+            "close": stats.close,
+            "count": stats.count,
+            "mean": stats.mean,
+        },
+        headers=validators.headers(),
+    )
+
+
+@router.get("/prices/downsample", response_model=DownsampleOut)
+async def downsample_prices(
+    request: Request,
+    ticker: str = Depends(_validated_ticker),
+    from_ts: int = Query(ge=0),
+    to_ts: int = Query(ge=0),
+    points: int = Query(default=1000, ge=3, le=10_000),
+    method: DownsampleMethod = Query(default="lttb"),
+    cache: LatestPriceCache = Depends(get_latest_price_cache),
+    session: AsyncSession = Depends(get_lazy_read_db_session),
+) -> Response:
+    _validate_range(from_ts, to_ts)
+    if method == "lttb" and not lttb_available():
         raise HTTPException(
-            status_code=422,
+            status_code=501,
             detail={
-                "error": "invalid_range",
-                "message": "from_ts must be <= to_ts",
+                "error": "method_unavailable",
+                "message": "lttb downsampling requires the 'downsample' extra (numpy)",
             },
         )
+    validators = window_validators(request, ticker=ticker, to_ts=to_ts, cache=cache)
+    not_modified = not_modified_response(request, validators)
+    if not_modified is not None:
+        return not_modified
 
-    service = PriceService()
-    count = await service.count_prices(
+    await connect_read_session(session)
+    results = await PriceService().downsample(
         session=session,
         ticker=ticker,
         from_ts=from_ts,
         to_ts=to_ts,
+        points=points,
+        method=method,
+        chunk_size=get_settings().export_chunk_size,
     )
 
-    results: Sequence[PricePointOut] = [
-        PricePointOut.model_validate(p)
-        for p in await service.list_range(
-            session=session,
-            ticker=ticker,
-            from_ts=from_ts,
-            to_ts=to_ts,
-            limit=limit,
-            offset=offset,
+    return FastJSONResponse(
+        {
+            "ticker": ticker,
+            "method": method,
+            "from_ts": from_ts,
+            "to_ts": to_ts,
+            "results": encode_rows(results, schema=DownsampledPointOut),
+        },
+        headers=validators.headers(),
+    )
+
+
+@router.get("/prices/export", response_class=StreamingResponse)
+async def export_prices(
+    ticker: str = Depends(_validated_ticker),
+    from_ts: int | None = Query(default=None, ge=0),
+    to_ts: int | None = Query(default=None, ge=0),
+    fmt: ExportFormat = Query(default="ndjson", alias="format"),
+    reads: ReadRouter = Depends(get_read_router),
+) -> StreamingResponse:
+    _validate_range(from_ts, to_ts)
+    if fmt in COLUMNAR_FORMATS and not columnar_available():
+        raise HTTPException(
+            status_code=501,
+            detail={
+                "error": "format_unavailable",
+                "message": f"{fmt} export requires the 'arrow' extra (pyarrow)",
+            },
         )
-    ]
+    chunk_size = get_settings().export_chunk_size
 
-    return build_paginated_response(
-        request,
-        count=count,
-        limit=limit,
-        offset=offset,
-        results=results,
+    # The session is opened inside the body so it lives as long as the stream.
+    async def _body() -> AsyncIterator[bytes]:
+        async with reads.session() as session:
+            chunks = PriceService().stream_prices(
+                session=session,
+                ticker=ticker,
+                from_ts=from_ts,
+                to_ts=to_ts,
+                chunk_size=chunk_size,
+            )
+            async for data in encode_stream(chunks, fmt=fmt, ticker=ticker):
+                yield data
+
+    return StreamingResponse(
+        _body(),
+        media_type=MEDIA_TYPES[fmt],
+        headers={
+            "Content-Disposition": f'attachment; filename="{ticker}_prices.{fmt}"'
+        },
     )
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from functools import lru_cache
-from typing import Annotated, ClassVar, final
+from typing import Annotated, ClassVar, Literal, final
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -18,6 +18,13 @@ class Settings(BaseSettings):
     database_url: Annotated[
         str, Field(description="SQLAlchemy database URL, e.g. postgresql+asyncpg://...")
     ] = ""
+    database_read_url: Annotated[
+        str,
+        Field(
+            description="Comma-separated read-replica URLs for read-only API routes "
+            "(empty = everything goes to database_url)"
+        ),
+    ] = ""
     redis_url: Annotated[
         str, Field(description="Redis URL, e.g. redis://localhost:6379/0")
     ] = ""
@@ -27,7 +34,164 @@ class Settings(BaseSettings):
             description="Deribit API base URL (defaults to testnet)",
         ),
     ] = "https://test.deribit.com/api/v2"
+    deribit_ws_url: Annotated[
+        str,
+        Field(description="Deribit JSON-RPC WebSocket URL (defaults to testnet)"),
+    ] = "wss://test.deribit.com/ws/api/v2"
+    ingest_mode: Annotated[
+        Literal["poll", "stream"],
+        Field(
+            description="poll: REST once a minute via Celery beat; "
+            "stream: WebSocket subscription process"
+        ),
+    ] = "poll"
+    stream_bucket_seconds: Annotated[
+        int, Field(ge=1, description="Bucket width for WebSocket-ingested prices")
+    ] = 60
+    stream_heartbeat_seconds: Annotated[
+        int, Field(ge=10, description="Deribit heartbeat interval for the WebSocket")
+    ] = 30
+    deribit_rate_limit_per_second: Annotated[
+        float,
+        Field(gt=0, description="Sustained Deribit requests per second per client"),
+    ] = 20.0
+    deribit_rate_limit_burst: Annotated[
+        int, Field(ge=1, description="Deribit requests allowed in a burst per client")
+    ] = 100
+    deribit_max_retries: Annotated[
+        int,
+        Field(ge=0, description="Retries for rate-limited or failed Deribit requests"),
+    ] = 3
+    deribit_retry_backoff_seconds: Annotated[
+        float, Field(gt=0, description="Base of the jittered exponential backoff")
+    ] = 0.25
+    deribit_retry_backoff_max_seconds: Annotated[
+        float, Field(gt=0, description="Upper bound for a single retry backoff")
+    ] = 5.0
     log_level: Annotated[str, Field(description="Application log level")] = "INFO"
+    worker_metrics_port: Annotated[
+        int,
+        Field(
+            ge=0,
+            le=65535,
+            description="Port the Celery worker serves Prometheus metrics on "
+            "(0 = off; the API's /metrics covers processes sharing its "
+            "PROMETHEUS_MULTIPROC_DIR)",
+        ),
+    ] = 0
+    db_pool_size: Annotated[
+        int, Field(ge=1, description="Persistent connections kept in the DB pool")
+    ] = 5
+    db_max_overflow: Annotated[
+        int, Field(ge=0, description="Extra connections allowed above the pool size")
+    ] = 10
+    db_pool_timeout_seconds: Annotated[
+        float, Field(gt=0, description="Seconds to wait for a free pooled connection")
+    ] = 30.0
+    db_pool_recycle_seconds: Annotated[
+        int,
+        Field(description="Recycle pooled connections older than this (-1 = never)"),
+    ] = 1800
+    db_pool_pre_ping: Annotated[
+        bool, Field(description="Test pooled connections for liveness on checkout")
+    ] = True
+    db_slow_query_ms: Annotated[
+        float,
+        Field(
+            ge=0,
+            description="Log statements slower than this with their parameters "
+            "(0 disables the slow-query log)",
+        ),
+    ] = 500.0
+    db_replica_check_seconds: Annotated[
+        float, Field(gt=0, description="How often replica health and lag are probed")
+    ] = 5.0
+    db_replica_max_lag_seconds: Annotated[
+        float,
+        Field(
+            ge=0,
+            lt=60,
+            description="Route reads to the primary while a replica lags more than "
+            "this; kept under the minute after which a window counts as closed and "
+            "is cached for a day (0 disables the lag guard)",
+        ),
+    ] = 30.0
+    http_cache_closed_max_age_seconds: Annotated[
+        int,
+        Field(
+            ge=0,
+            description="Cache-Control max-age for windows that ended in the past "
+            "(backfilled gaps show up once it expires)",
+        ),
+    ] = 86_400
+    http_cache_open_max_age_seconds: Annotated[
+        int,
+        Field(
+            ge=0, description="Cache-Control max-age for windows still receiving data"
+        ),
+    ] = 5
+    latest_price_cache_max_age_seconds: Annotated[
+        float,
+        Field(
+            ge=0,
+            description="Serve /prices/latest from memory while younger than this "
+            "(0 disables the cache)",
+        ),
+    ] = 90.0
+    export_chunk_size: Annotated[
+        int,
+        Field(ge=1, description="Rows fetched per server-side cursor batch on export"),
+    ] = 5000
+    price_points_partition_months_ahead: Annotated[
+        int,
+        Field(ge=0, description="Monthly price_points partitions created in advance"),
+    ] = 3
+    price_points_retention_months: Annotated[
+        int,
+        Field(
+            ge=0,
+            description="Drop price_points partitions older than this many months "
+            "(0 keeps everything)",
+        ),
+    ] = 0
+    ingest_fetch_concurrency: Annotated[
+        int,
+        Field(ge=1, description="Deribit index prices fetched in parallel per ingest"),
+    ] = 8
+    ingest_batch_size: Annotated[
+        int,
+        Field(ge=1, description="Tickers per ingest batch spread across the minute"),
+    ] = 50
+    ingest_spread_seconds: Annotated[
+        float,
+        Field(
+            ge=0,
+            lt=60,
+            description="Window over which ingest batches are started (0 = no spread)",
+        ),
+    ] = 30.0
+    ticker_registry_refresh_seconds: Annotated[
+        float,
+        Field(
+            gt=0, description="How often the API reloads enabled tickers from the DB"
+        ),
+    ] = 60.0
+    backfill_lookback_days: Annotated[
+        int,
+        Field(ge=1, description="How far back the backfill job looks for gaps"),
+    ] = 30
+    backfill_chunk_size: Annotated[
+        int,
+        Field(ge=1, description="Rows written and committed per backfill transaction"),
+    ] = 5_000
+    backfill_concurrency: Annotated[
+        int,
+        Field(ge=1, description="Tickers backfilled in parallel"),
+    ] = 4
+    rollup_batch_size: Annotated[
+        int,
+        Field(ge=1, description="Dirty hours folded into rollups per transaction"),
+    ] = 500
 
     @field_validator("database_url", "redis_url")
     @classmethod
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import os
+
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    start_http_server,
+)
+
+# With PROMETHEUS_MULTIPROC_DIR set (uvicorn workers, Celery prefork
+# children) every process writes its samples to files in that directory and
+# the exporter sums them up; without it the in-process registry is used.
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+DB_QUERY_SECONDS = Histogram(
+    "db_query_duration_seconds",
+    "Database statement execution time",
+    ["operation"],
+)
+DB_POOL_WAIT_SECONDS = Histogram(
+    "db_pool_wait_seconds",
+    "Time spent waiting for a pooled connection",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Pooled connections currently checked out",
+    multiprocess_mode="livesum",
+)
+DERIBIT_REQUEST_SECONDS = Histogram(
+    "deribit_request_duration_seconds",
+    "Latency of single Deribit API attempts",
+    ["method"],
+)
+DERIBIT_ERRORS = Counter(
+    "deribit_errors",
+    "Failed Deribit API attempts by exception type",
+    ["method", "error"],
+)
+INGEST_LAG_SECONDS = Histogram(
+    "ingest_lag_seconds",
+    "Seconds from the minute boundary to the ingest commit",
+    buckets=(1, 2, 5, 10, 15, 20, 30, 45, 60, 90, 120),
+)
+ADVISORY_LOCK_SKIPS = Counter(
+    "advisory_lock_skips",
+    "Runs skipped because another process held the advisory lock",
+    ["lock"],
+)
+
+
+def multiprocess_enabled() -> bool:
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def metrics_registry() -> CollectorRegistry:
+    if not multiprocess_enabled():
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def render_metrics() -> bytes:
+    return generate_latest(metrics_registry())
+
+
+def serve_metrics(port: int) -> None:
+    start_http_server(port, registry=metrics_registry())
+
+
+def mark_process_dead(pid: int) -> None:
+    # Drops the exited process's live gauges; its counters are kept.
+    if multiprocess_enabled():
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import get_settings
+from app.core.metrics import DB_POOL_CHECKED_OUT, DB_QUERY_SECONDS
+
+slow_query_logger = logging.getLogger("app.db.slow_query")
+
+_OPERATIONS = frozenset({"SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "COPY"})
+_MAX_LOGGED_CHARS = 2_000
+
+
+@dataclass
+class QueryAccount:
+    source: str
+    count: int = 0
+    seconds: float = 0.0
+
+
+# SQLAlchemy runs engine events in a greenlet that shares the calling
+# task's context, so statements land on the request that issued them.
+_current_account: ContextVar[QueryAccount | None] = ContextVar(
+    "query_account", default=None
+)
+
+
+@contextmanager
+def account_queries(source: str) -> Iterator[QueryAccount]:
+    account = QueryAccount(source=source)
+    token = _current_account.set(account)
+    try:
+        yield account
+    finally:
+        _current_account.reset(token)
+
+
+def _operation(statement: str) -> str:
+    head = statement.lstrip().split(None, 1)
+    operation = head[0].upper() if head else ""
+    return operation if operation in _OPERATIONS else "OTHER"
+
+
+def _clip(value: object) -> str:
+    text = value if isinstance(value, str) else repr(value)
+    if len(text) <= _MAX_LOGGED_CHARS:
+        return text
+    return f"{text[:_MAX_LOGGED_CHARS]}... ({len(text)} chars)"
+
+
+def record_query(statement: str, parameters: object, seconds: float) -> None:
+    DB_QUERY_SECONDS.labels(operation=_operation(statement)).observe(seconds)
+
+    account = _current_account.get()
+    if account is not None:
+        account.count += 1
+        account.seconds += seconds
+
+    threshold_ms = get_settings().db_slow_query_ms
+    if threshold_ms and seconds * 1000 >= threshold_ms:
+        slow_query_logger.warning(
+            "slow query",
+            extra={
+                "duration_ms": round(seconds * 1000, 3),
+                "statement": _clip(statement),
+                "parameters": _clip(parameters),
+                "source": account.source if account is not None else None,
+            },
+        )
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn: Any, _cursor: Any, _statement: str, *_args: Any) -> None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(
+        conn: Any,
+        _cursor: Any,
+        statement: str,
+        parameters: object,
+        *_args: Any,
+    ) -> None:
+        started = conn.info["query_started"].pop()
+        record_query(statement, parameters, time.perf_counter() - started)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(context: Any) -> None:
+        # after_cursor_execute does not run for a failed statement, which
+        # still counts against the request and may well be the slow one.
+        connection = context.connection
+        if context.execution_context is not None and connection is not None:
+            started = connection.info.get("query_started")
+            if started:
+                record_query(
+                    context.statement or "",
+                    context.parameters,
+                    time.perf_counter() - started.pop(),
+                )
+
+    @event.listens_for(sync_engine, "checkout")
+    def _checkout(*_args: Any) -> None:
+        DB_POOL_CHECKED_OUT.inc()
+
+    @event.listens_for(sync_engine, "checkin")
+    def _checkin(*_args: Any) -> None:
+        DB_POOL_CHECKED_OUT.dec()
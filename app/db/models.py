@@ -1,16 +1,21 @@
 from __future__ import annotations
 
-from datetime import datetime
 from decimal import Decimal
 
 from sqlalchemy import (
     BigInteger,
-    DateTime,
+    Boolean,
+    ForeignKey,
+    ForeignKeyConstraint,
+    Identity,
     Index,
+    Integer,
     Numeric,
+    PrimaryKeyConstraint,
+    SmallInteger,
     String,
     UniqueConstraint,
-    func,
+    true,
 )
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
@@ -19,19 +24,86 @@ class Base(DeclarativeBase):
     pass
 
 
+class Ticker(Base):
+    __tablename__ = "tickers"
+    __table_args__ = (UniqueConstraint("name", name="uq_tickers_name"),)
+
+    id: Mapped[int] = mapped_column(SmallInteger, Identity(), primary_key=True)
+    name: Mapped[str] = mapped_column(String, nullable=False)
+    enabled: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, server_default=true()
+    )
+    # False for tickers whose prices are loaded from elsewhere (benchmark
+    # data): the API serves them, but ingest, backfill and the stream skip them.
+    ingest: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default=true())
+    # Set by a trigger whenever rows land in a window that already counts as
+    # closed (backfill, late upserts), so cached closed windows revalidate.
+    late_write_ts: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+
+
 class PricePoint(Base):
     __tablename__ = "price_points"
     __table_args__ = (
-        UniqueConstraint("ticker", "ts_unix", name="uq_price_points_ticker_ts_unix"),
+        PrimaryKeyConstraint("ticker_id", "ts_unix", name="price_points_pkey"),
+        {"postgresql_partition_by": "RANGE (ts_unix)"},
     )
 
-    id: Mapped[int] = mapped_column(primary_key=True)
-    ticker: Mapped[str] = mapped_column(String, nullable=False)
+    # Widest fixed-width column first so the row carries no alignment padding.
     ts_unix: Mapped[int] = mapped_column(BigInteger, nullable=False)
-    price: Mapped[Decimal] = mapped_column(Numeric(20, 10), nullable=False)
-    created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False, server_default=func.now()
+    ticker_id: Mapped[int] = mapped_column(
+        SmallInteger,
+        ForeignKey("tickers.id", name="fk_price_points_ticker_id_tickers"),
+        nullable=False,
     )
+    price: Mapped[Decimal] = mapped_column(Numeric(20, 10), nullable=False)
 
 
 Index("ix_price_points_ts_unix", PricePoint.ts_unix)
+
+
+class _PriceRollup:
+    # One OHLC summary per ticker and bucket; price_sum / count is the mean.
+    bucket_ts: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    ticker_id: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    open: Mapped[Decimal] = mapped_column(Numeric(20, 10), nullable=False)
+    high: Mapped[Decimal] = mapped_column(Numeric(20, 10), nullable=False)
+    low: Mapped[Decimal] = mapped_column(Numeric(20, 10), nullable=False)
+    close: Mapped[Decimal] = mapped_column(Numeric(20, 10), nullable=False)
+    count: Mapped[int] = mapped_column(Integer, nullable=False)
+    price_sum: Mapped[Decimal] = mapped_column(Numeric, nullable=False)
+
+
+class PriceRollupHourly(_PriceRollup, Base):
+    __tablename__ = "price_rollups_1h"
+    __table_args__ = (
+        PrimaryKeyConstraint("ticker_id", "bucket_ts", name="price_rollups_1h_pkey"),
+        ForeignKeyConstraint(
+            ["ticker_id"],
+            ["tickers.id"],
+            name="fk_price_rollups_1h_ticker_id_tickers",
+        ),
+    )
+
+
+class PriceRollupDaily(_PriceRollup, Base):
+    __tablename__ = "price_rollups_1d"
+    __table_args__ = (
+        PrimaryKeyConstraint("ticker_id", "bucket_ts", name="price_rollups_1d_pkey"),
+        ForeignKeyConstraint(
+            ["ticker_id"],
+            ["tickers.id"],
+            name="fk_price_rollups_1d_ticker_id_tickers",
+        ),
+    )
+
+
+class PriceRollupDirty(Base):
+    # Hours whose raw points changed since the rollups last covered them,
+    # filled by statement triggers on price_points.
+    __tablename__ = "price_rollup_dirty"
+    __table_args__ = (
+        PrimaryKeyConstraint("ticker_id", "bucket_ts", name="price_rollup_dirty_pkey"),
+    )
+
+    bucket_ts: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    ticker_id: Mapped[int] = mapped_column(SmallInteger, nullable=False)
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Mapping
+from decimal import Decimal
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+LATEST_PRICE_CHANNEL = "price_points_latest"
+# Sent by the mark_late_price_writes trigger with {"ticker", "late_write_ts"}.
+LATE_WRITE_CHANNEL = "price_points_late"
+
+
+async def notify_latest_prices(
+    session: AsyncSession, *, ts_unix: int, prices: Mapping[str, Decimal]
+) -> None:
+    if not prices:
+        return
+
+    # NOTIFY is transactional: listeners only see it once the upsert commits.
+    payloads = [
+        json.dumps({"ticker": ticker, "ts_unix": ts_unix, "price": str(price)})
+        for ticker, price in prices.items()
+    ]
+    await session.execute(
+        text(
+            "SELECT pg_notify(:channel, payload)"
+            " FROM unnest(CAST(:payloads AS TEXT[])) AS payload"
+        ),
+        {"channel": LATEST_PRICE_CHANNEL, "payloads": payloads},
+    )
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import calendar
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+PARENT_TABLE = "price_points"
+DEFAULT_PARTITION = "price_points_default"
+
+_PARTITION_NAME_RE = re.compile(r"^price_points_p(\d{4})(\d{2})$")
+
+
+@dataclass(frozen=True, order=True)
+class MonthPartition:
+    year: int
+    month: int
+
+    @classmethod
+    def containing(cls, ts_unix: int) -> MonthPartition:
+        dt = datetime.fromtimestamp(ts_unix, tz=timezone.utc)
+        return cls(year=dt.year, month=dt.month)
+
+    @classmethod
+    def from_name(cls, name: str) -> MonthPartition | None:
+        match = _PARTITION_NAME_RE.match(name)
+        if match is None:
+            return None
+        return cls(year=int(match.group(1)), month=int(match.group(2)))
+
+    @property
+    def name(self) -> str:
+        return f"{PARENT_TABLE}_p{self.year:04d}{self.month:02d}"
+
+    @property
+    def start_ts(self) -> int:
+        return calendar.timegm((self.year, self.month, 1, 0, 0, 0))
+
+    @property
+    def end_ts(self) -> int:
+        return self.shift(1).start_ts
+
+    def shift(self, months: int) -> MonthPartition:
+        index = self.year * 12 + (self.month - 1) + months
+        return MonthPartition(year=index // 12, month=index % 12 + 1)
+
+
+async def list_partitions(connection: AsyncConnection) -> list[MonthPartition]:
+    result = await connection.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits"
+            " JOIN pg_class parent ON parent.oid = pg_inherits.inhparent"
+            " JOIN pg_class child ON child.oid = pg_inherits.inhrelid"
+            " WHERE parent.relname = :parent"
+        ),
+        {"parent": PARENT_TABLE},
+    )
+    partitions = (MonthPartition.from_name(name) for name in result.scalars())
+    return sorted(p for p in partitions if p is not None)
+
+
+async def create_partition(
+    connection: AsyncConnection, partition: MonthPartition
+) -> None:
+    bounds = {"start": partition.start_ts, "end": partition.end_ts}
+    stray = await connection.execute(
+        text(
+            f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION}"
+            " WHERE ts_unix >= :start AND ts_unix < :end)"
+        ),
+        bounds,
+    )
+
+    # Identifiers come from MonthPartition.name and integer bounds only.
+    if not stray.scalar_one():
+        await connection.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {partition.name}"
+                f" PARTITION OF {PARENT_TABLE}"
+                f" FOR VALUES FROM ({partition.start_ts}) TO ({partition.end_ts})"
+            )
+        )
+        return
+
+    # Rows already landed in the default partition: move them into a
+    # standalone table first, since Postgres refuses to carve the range out.
+    await connection.execute(
+        text(
+            f"CREATE TABLE {partition.name}"
+            f" (LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        )
+    )
+    await connection.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION}"
+            " WHERE ts_unix >= :start AND ts_unix < :end RETURNING *)"
+            f" INSERT INTO {partition.name} SELECT * FROM moved"
+        ),
+        bounds,
+    )
+    await connection.execute(
+        text(
+            f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {partition.name}"
+            f" FOR VALUES FROM ({partition.start_ts}) TO ({partition.end_ts})"
+        )
+    )
+
+
+async def drop_partition(
+    connection: AsyncConnection, partition: MonthPartition
+) -> None:
+    await connection.execute(text(f"DROP TABLE IF EXISTS {partition.name}"))
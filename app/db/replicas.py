@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import time
+from collections.abc import AsyncIterator, Sequence
+from contextlib import (
+    AbstractAsyncContextManager,
+    AsyncExitStack,
+    asynccontextmanager,
+)
+from dataclasses import dataclass
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
+
+from app.core.config import get_settings
+from app.db.session import Database
+
+logger = logging.getLogger(__name__)
+
+# An idle primary still sends a keepalive every wal_sender_timeout / 2
+# (30s by default); a receiver silent for longer has lost the primary.
+_RECEIVER_SILENCE_SECONDS = 60
+
+# Lag is zero when the replica has replayed everything it received, so an
+# idle primary does not look like growing lag. That also holds once the
+# replica is cut off from the primary, hence the separate receiver check.
+# Reading pg_stat_wal_receiver.status needs pg_read_all_stats.
+_LAG_SQL = text(
+    "SELECT"
+    " NOT pg_is_in_recovery() OR EXISTS ("
+    "SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming'"
+    f" AND last_msg_receipt_time > now() - interval '{_RECEIVER_SILENCE_SECONDS} s'"
+    ") AS streaming,"
+    " CASE"
+    " WHEN NOT pg_is_in_recovery() THEN 0"
+    " WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+    " ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)"
+    " END AS lag"
+)
+
+
+_FAILOVER_KEY = "read_failover"
+
+
+def parse_read_urls(value: str) -> list[str]:
+    return [url.strip() for url in value.split(",") if url.strip()]
+
+
+def _connection_lost(exc: BaseException) -> bool:
+    if isinstance(exc, OSError):
+        return True
+    return isinstance(exc, DBAPIError) and exc.connection_invalidated
+
+
+@dataclass
+class ReplicaState:
+    database: Database
+    healthy: bool = True
+    lag_seconds: float | None = None
+    checked_at: float | None = None
+
+
+class ReadRouter:
+    def __init__(
+        self,
+        primary: Database,
+        replicas: Sequence[Database] = (),
+        *,
+        max_lag_seconds: float = 0.0,
+        check_timeout_seconds: float = 2.0,
+    ) -> None:
+        self.primary = primary
+        self._replicas = [ReplicaState(database=replica) for replica in replicas]
+        self._max_lag_seconds = max_lag_seconds
+        self._check_timeout_seconds = check_timeout_seconds
+        self._turn = itertools.count()
+
+    @classmethod
+    def create(cls, primary: Database) -> ReadRouter:
+        settings = get_settings()
+        replicas = [
+            Database.create(database_url=url)
+            for url in parse_read_urls(settings.database_read_url)
+        ]
+        return cls(
+            primary, replicas, max_lag_seconds=settings.db_replica_max_lag_seconds
+        )
+
+    @property
+    def has_replicas(self) -> bool:
+        return bool(self._replicas)
+
+    def _eligible(self, replica: ReplicaState) -> bool:
+        if not replica.healthy:
+            return False
+        if self._max_lag_seconds <= 0:
+            return True
+        # With the guard on, a replica serves only once its lag was measured.
+        return (
+            replica.lag_seconds is not None
+            and replica.lag_seconds <= self._max_lag_seconds
+        )
+
+    def pick(self) -> ReplicaState | None:
+        eligible = [replica for replica in self._replicas if self._eligible(replica)]
+        if not eligible:
+            return None
+        return eligible[next(self._turn) % len(eligible)]
+
+    def mark_failed(self, replica: ReplicaState) -> None:
+        # Stays out of rotation until the next successful probe.
+        if replica.healthy:
+            logger.warning(
+                "read replica %s failed; routing reads to the primary",
+                replica.database.engine.url.render_as_string(hide_password=True),
+            )
+        replica.healthy = False
+
+    async def check(self) -> None:
+        await asyncio.gather(*(self._check(replica) for replica in self._replicas))
+
+    async def _check(self, replica: ReplicaState) -> None:
+        try:
+            async with asyncio.timeout(self._check_timeout_seconds):
+                async with replica.database.engine.connect() as connection:
+                    streaming, lag = (await connection.execute(_LAG_SQL)).one()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.debug("read replica probe failed", exc_info=True)
+            self.mark_failed(replica)
+        else:
+            if streaming:
+                replica.healthy = True
+                replica.lag_seconds = float(lag)
+            else:
+                logger.debug("read replica has no streaming WAL receiver")
+                self.mark_failed(replica)
+                replica.lag_seconds = None
+        replica.checked_at = time.time()
+
+    async def run(self, *, interval_seconds: float) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(interval_seconds)
+
+    @asynccontextmanager
+    async def session(self, *, lazy: bool = False) -> AsyncIterator[AsyncSession]:
+        async with AsyncExitStack() as stack:
+            replica = self.pick()
+            session: AsyncSession | None = None
+            if replica is not None:
+                try:
+                    session = await stack.enter_async_context(
+                        _open_session(replica.database, lazy=lazy)
+                    )
+                except (OSError, DBAPIError):
+                    # Failing to connect up front falls over transparently.
+                    self.mark_failed(replica)
+                    replica = None
+            if session is None:
+                session = await stack.enter_async_context(
+                    _open_session(self.primary, lazy=lazy)
+                )
+            elif lazy:
+                # Nothing is connected yet; connect_read_session does that
+                # once the route needs the database, with the same failover.
+                session.info[_FAILOVER_KEY] = (self, replica)
+
+            try:
+                yield session
+            except Exception as exc:
+                # A replica dropping the connection mid-request fails that
+                # request and is skipped from the next.
+                if (
+                    replica is not None
+                    and session.bind is replica.database.engine
+                    and _connection_lost(exc)
+                ):
+                    self.mark_failed(replica)
+                raise
+
+    async def connect(self, session: AsyncSession, replica: ReplicaState) -> None:
+        try:
+            await session.connection()
+        except (OSError, DBAPIError):
+            self.mark_failed(replica)
+            # Nothing ran on the session yet, so it can be pointed at the
+            # primary instead of failing the request.
+            await session.close()
+            session.bind = self.primary.engine
+            session.sync_session.bind = self.primary.engine.sync_engine
+            await session.connection()
+
+    def status(self) -> list[dict[str, object]]:
+        return [
+            {
+                "url": replica.database.engine.url.render_as_string(hide_password=True),
+                "healthy": replica.healthy,
+                "eligible": self._eligible(replica),
+                "lag_seconds": replica.lag_seconds,
+                "checked_at": replica.checked_at,
+            }
+            for replica in self._replicas
+        ]
+
+    async def dispose(self) -> None:
+        for replica in self._replicas:
+            await replica.database.dispose()
+
+
+def _open_session(
+    database: Database, *, lazy: bool
+) -> AbstractAsyncContextManager[AsyncSession]:
+    return database.sessionmaker() if lazy else database.session()
+
+
+async def connect_read_session(session: AsyncSession) -> None:
+    # Called by routes on lazy sessions once a 304 or cache hit is ruled out.
+    failover = session.info.pop(_FAILOVER_KEY, None)
+    if failover is not None:
+        router, replica = failover
+        await router.connect(session, replica)
+
+
+def get_read_router(request: Request) -> ReadRouter:
+    return request.app.state.read_router
+
+
+async def get_read_db_session(request: Request) -> AsyncIterator[AsyncSession]:
+    async with get_read_router(request).session() as session:
+        yield session
+
+
+async def get_lazy_read_db_session(request: Request) -> AsyncIterator[AsyncSession]:
+    # Only checks out a connection once the session is first used.
+    async with get_read_router(request).session(lazy=True) as session:
+        yield session
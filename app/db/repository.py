@@ -1,13 +1,265 @@
 from __future__ import annotations
 
-from collections.abc import Sequence
+import json
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Mapping, Sequence
 from decimal import Decimal
+from typing import Literal
 
-from sqlalchemy import func, select
-from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    ColumnElement,
+    Identity,
+    MetaData,
+    Numeric,
+    Row,
+    ScalarSelect,
+    Select,
+    String,
+    Subquery,
+    Table,
+    and_,
+    any_,
+    bindparam,
+    column,
+    func,
+    literal,
+    select,
+    text,
+    true,
+    union_all,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import (
+    ARRAY,
+    aggregate_order_by,
+    distinct_on,
+    insert,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.schema import CreateTable
 
-from app.db.models import PricePoint
+from app.db.models import PricePoint, PriceRollupDirty, Ticker
+from app.db.rollups import ROLLUPS, RollupModel
+
+# Kept out of Base.metadata: bulk_load creates it as a temp table on first
+# use per connection, and its rows never outlive a transaction.
+_staging = Table(
+    "price_points_staging",
+    MetaData(),
+    Column("seq", BigInteger, Identity()),
+    Column("ticker", String, nullable=False),
+    Column("ts_unix", BigInteger, nullable=False),
+    Column("price", Numeric(20, 10), nullable=False),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DELETE ROWS",
+)
+
+
+async def _take(iterator: AsyncIterator[tuple], count: int) -> AsyncIterator[tuple]:
+    for _ in range(count):
+        try:
+            yield await anext(iterator)
+        except StopAsyncIteration:
+            return
+
+
+def _ticker_id(ticker: str) -> ScalarSelect[int]:
+    # Evaluated once as an InitPlan, so the outer query still seeks the
+    # (ticker_id, ts_unix) primary key without joining tickers per row.
+    return select(Ticker.id).where(Ticker.name == ticker).scalar_subquery()
+
+
+def _point_columns(ticker: str) -> Select:
+    # Rows keep the (ticker, ts_unix, price) shape callers and schemas expect.
+    return select(
+        literal(ticker, String).label("ticker"), PricePoint.ts_unix, PricePoint.price
+    )
+
+
+def _filter_range(
+    stmt: Select, *, ticker: str, from_ts: int | None, to_ts: int | None
+) -> Select:
+    stmt = stmt.where(PricePoint.ticker_id == _ticker_id(ticker))
+    if from_ts is not None:
+        stmt = stmt.where(PricePoint.ts_unix >= from_ts)
+    if to_ts is not None:
+        stmt = stmt.where(PricePoint.ts_unix <= to_ts)
+    return stmt
+
+
+def series_bounds(*, from_ts: int, to_ts: int, step: int = 60) -> tuple[int, int]:
+    # First and last grid timestamps inside [from_ts, to_ts].
+    return -(-from_ts // step) * step, (to_ts // step) * step
+
+
+def _ohlc_bucket(
+    ts_unix: ColumnElement[int], interval: int, *, origin: int = 0
+) -> ColumnElement[int]:
+    # Rendered inline so the GROUP BY and SELECT expressions are identical.
+    step = bindparam("interval", interval, type_=BigInteger, literal_execute=True)
+    if not origin:
+        return ts_unix - ts_unix % step
+    start = bindparam("origin", origin, type_=BigInteger, literal_execute=True)
+    return ts_unix - (ts_unix - start) % step
+
+
+def _pick_rollup(
+    *, from_ts: int | None, to_ts: int | None, interval: int | None = None
+) -> tuple[int, RollupModel] | None:
+    # The coarsest grain whose buckets nest inside the requested ones and
+    # that covers at least one whole bucket of the window.
+    for grain, rollup in ROLLUPS:
+        if interval is not None and interval % grain:
+            continue
+        if from_ts is None or to_ts is None:
+            return grain, rollup
+        if -(-from_ts // grain) * grain < (to_ts + 1) // grain * grain:
+            return grain, rollup
+    return None
+
+
+def _partials(
+    *,
+    ticker: str,
+    from_ts: int | None,
+    to_ts: int | None,
+    interval: int | None = None,
+) -> Subquery:
+    # Rows of (ts_unix, open, high, low, close, count, price_sum) that
+    # together hold exactly the points in [from_ts, to_ts]: clean rollup
+    # buckets for the aligned middle, raw points for the ragged edges and
+    # for buckets whose hours were written since the last fold.
+    ticker_id = _ticker_id(ticker)
+    raw = select(
+        PricePoint.ts_unix,
+        PricePoint.price.label("open"),
+        PricePoint.price.label("high"),
+        PricePoint.price.label("low"),
+        PricePoint.price.label("close"),
+        literal(1).label("count"),
+        PricePoint.price.label("price_sum"),
+    )
+    picked = _pick_rollup(from_ts=from_ts, to_ts=to_ts, interval=interval)
+    if picked is None:
+        return _filter_range(
+            raw, ticker=ticker, from_ts=from_ts, to_ts=to_ts
+        ).subquery()
+
+    grain, rollup = picked
+    mid_start = None if from_ts is None else -(-from_ts // grain) * grain
+    mid_end = None if to_ts is None else (to_ts + 1) // grain * grain
+
+    stale_bucket = PriceRollupDirty.bucket_ts - PriceRollupDirty.bucket_ts % grain
+    stale = select(stale_bucket.label("bucket_ts")).where(
+        PriceRollupDirty.ticker_id == ticker_id
+    )
+    clean = select(
+        rollup.bucket_ts.label("ts_unix"),
+        rollup.open,
+        rollup.high,
+        rollup.low,
+        rollup.close,
+        rollup.count,
+        rollup.price_sum,
+    ).where(rollup.ticker_id == ticker_id)
+    if mid_start is not None:
+        stale = stale.where(PriceRollupDirty.bucket_ts >= mid_start)
+        clean = clean.where(rollup.bucket_ts >= mid_start)
+    if mid_end is not None:
+        stale = stale.where(PriceRollupDirty.bucket_ts < mid_end)
+        clean = clean.where(rollup.bucket_ts < mid_end)
+    stale = stale.distinct().subquery("stale")
+    clean = clean.where(rollup.bucket_ts.not_in(select(stale.c.bucket_ts)))
+
+    parts = [
+        clean,
+        raw.join(
+            stale,
+            and_(
+                PricePoint.ts_unix >= stale.c.bucket_ts,
+                PricePoint.ts_unix < stale.c.bucket_ts + grain,
+            ),
+        ).where(PricePoint.ticker_id == ticker_id),
+    ]
+    if from_ts is not None and from_ts < mid_start:
+        parts.append(
+            _filter_range(raw, ticker=ticker, from_ts=from_ts, to_ts=mid_start - 1)
+        )
+    if to_ts is not None and mid_end <= to_ts:
+        parts.append(_filter_range(raw, ticker=ticker, from_ts=mid_end, to_ts=to_ts))
+    return union_all(*parts).subquery()
+
+
+def _candle_columns(partials: Subquery) -> list[ColumnElement]:
+    ts_unix = partials.c.ts_unix
+    return [
+        func.array_agg(aggregate_order_by(partials.c.open, ts_unix.asc()))[1].label(
+            "open"
+        ),
+        func.max(partials.c.high).label("high"),
+        func.min(partials.c.low).label("low"),
+        func.array_agg(aggregate_order_by(partials.c.close, ts_unix.desc()))[1].label(
+            "close"
+        ),
+        func.coalesce(func.sum(partials.c["count"]), 0).label("count"),
+    ]
+
+
+def _count_statement(*, ticker: str, from_ts: int | None, to_ts: int | None) -> Select:
+    partials = _partials(ticker=ticker, from_ts=from_ts, to_ts=to_ts)
+    return select(func.coalesce(func.sum(partials.c["count"]), 0))
+
+
+def _ohlc_count_statement(
+    *, ticker: str, interval: int, from_ts: int | None, to_ts: int | None
+) -> Select:
+    partials = _partials(ticker=ticker, from_ts=from_ts, to_ts=to_ts, interval=interval)
+    return select(func.count(_ohlc_bucket(partials.c.ts_unix, interval).distinct()))
+
+
+class TickerRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def list_enabled(self) -> list[str]:
+        stmt = select(Ticker.name).where(Ticker.enabled).order_by(Ticker.name)
+        result = await self._session.execute(stmt)
+        return list(result.scalars())
+
+    async def list_ingested(self) -> list[str]:
+        stmt = (
+            select(Ticker.name)
+            .where(Ticker.enabled, Ticker.ingest)
+            .order_by(Ticker.name)
+        )
+        result = await self._session.execute(stmt)
+        return list(result.scalars())
+
+    async def exclude_from_ingest(self, tickers: Iterable[str]) -> None:
+        stmt = update(Ticker).where(Ticker.name.in_(list(tickers))).values(ingest=False)
+        await self._session.execute(stmt)
+
+    async def list_late_writes(self) -> dict[str, int]:
+        stmt = select(Ticker.name, Ticker.late_write_ts).where(
+            Ticker.late_write_ts.is_not(None)
+        )
+        result = await self._session.execute(stmt)
+        return {name: int(late_write_ts) for name, late_write_ts in result}
+
+    async def register(self, tickers: Iterable[str]) -> list[str]:
+        rows = [{"name": ticker} for ticker in tickers]
+        if not rows:
+            return []
+        stmt = (
+            insert(Ticker)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=[Ticker.name])
+            .returning(Ticker.name)
+        )
+        result = await self._session.execute(stmt)
+        return sorted(result.scalars())
 
 
 class PricePointRepository:
@@ -17,12 +269,137 @@ class PricePointRepository:
     async def upsert_price_point(
         self, *, ticker: str, ts_unix: int, price: Decimal
     ) -> None:
-        stmt = insert(PricePoint).values(ticker=ticker, ts_unix=ts_unix, price=price)
+        await self.upsert_price_points(ts_unix=ts_unix, prices={ticker: price})
+
+    async def upsert_price_points(
+        self, *, ts_unix: int, prices: Mapping[str, Decimal]
+    ) -> None:
+        if not prices:
+            return
+
+        # One INSERT ... SELECT for the whole bucket, joining the incoming
+        # (name, price) pairs to tickers to pick up each ticker_id.
+        incoming = values(
+            column("name", String), column("price", Numeric(20, 10)), name="incoming"
+        ).data(list(prices.items()))
+        source = select(
+            literal(ts_unix, BigInteger), Ticker.id, incoming.c.price
+        ).join_from(incoming, Ticker, Ticker.name == incoming.c.name)
+        stmt = insert(PricePoint).from_select(
+            [PricePoint.ts_unix, PricePoint.ticker_id, PricePoint.price], source
+        )
         stmt = stmt.on_conflict_do_update(
-            index_elements=[PricePoint.ticker, PricePoint.ts_unix],
+            index_elements=[PricePoint.ticker_id, PricePoint.ts_unix],
             set_={"price": stmt.excluded.price},
+        ).returning(PricePoint.ticker_id)
+
+        result = await self._session.execute(stmt)
+        if len(result.all()) < len(prices):
+            # Some tickers were written for the first time: register them,
+            # then replay the (idempotent) upsert once.
+            await self.register_tickers(prices.keys())
+            await self._session.execute(stmt)
+
+    async def register_tickers(self, tickers: Iterable[str]) -> None:
+        await TickerRepository(self._session).register(tickers)
+
+    async def bulk_load(
+        self,
+        rows: AsyncIterable[tuple[str, int, Decimal]],
+        *,
+        overwrite: bool = True,
+        batch_size: int = 100_000,
+    ) -> int:
+        # Rows are streamed over binary COPY into a session-local staging
+        # table and merged with one INSERT ... SELECT per batch, so neither
+        # the caller nor this method holds more than the current record.
+        connection = await self._session.connection()
+        await connection.execute(CreateTable(_staging, if_not_exists=True))
+        raw = await connection.get_raw_connection()
+        driver = raw.driver_connection
+        if driver is None:
+            raise RuntimeError("bulk_load needs a live asyncpg connection")
+
+        iterator = aiter(rows)
+        written = 0
+        while True:
+            status = await driver.copy_records_to_table(
+                _staging.name,
+                records=_take(iterator, batch_size),
+                columns=["ticker", "ts_unix", "price"],
+            )
+            copied = int(status.split()[-1])
+            if copied:
+                written += await self._merge_staging(overwrite=overwrite)
+                await connection.execute(text(f"TRUNCATE {_staging.name}"))
+            if copied < batch_size:
+                return written
+
+    async def _merge_staging(self, *, overwrite: bool) -> int:
+        await self._session.execute(
+            insert(Ticker)
+            .from_select(["name"], select(_staging.c.ticker).distinct())
+            .on_conflict_do_nothing(index_elements=[Ticker.name])
         )
-        await self._session.execute(stmt)
+
+        # DISTINCT ON keeps the last copy of a (ticker, ts_unix) pair, since
+        # one INSERT cannot touch the same target row twice.
+        source = (
+            select(_staging.c.ts_unix, Ticker.id, _staging.c.price)
+            .join_from(_staging, Ticker, Ticker.name == _staging.c.ticker)
+            .ext(distinct_on(Ticker.id, _staging.c.ts_unix))
+            .order_by(Ticker.id, _staging.c.ts_unix, _staging.c.seq.desc())
+        )
+        stmt = insert(PricePoint).from_select(
+            [PricePoint.ts_unix, PricePoint.ticker_id, PricePoint.price], source
+        )
+        index_elements = [PricePoint.ticker_id, PricePoint.ts_unix]
+        if overwrite:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=index_elements, set_={"price": stmt.excluded.price}
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=index_elements)
+
+        merged = stmt.returning(PricePoint.ticker_id).cte("merged")
+        count = await self._session.scalar(select(func.count()).select_from(merged))
+        return int(count or 0)
+
+    async def find_gaps(
+        self,
+        *,
+        ticker: str,
+        from_ts: int,
+        to_ts: int,
+        step: int = 60,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[tuple[int, int]]:
+        # Sentinels one step outside the window turn leading and trailing
+        # holes into ordinary gaps between neighbours.
+        points = union_all(
+            _filter_range(
+                select(PricePoint.ts_unix), ticker=ticker, from_ts=from_ts, to_ts=to_ts
+            ),
+            select(literal(from_ts - step, BigInteger).label("ts_unix")),
+            select(literal(to_ts + step, BigInteger).label("ts_unix")),
+        ).subquery("points")
+        neighbours = select(
+            points.c.ts_unix,
+            func.lead(points.c.ts_unix)
+            .over(order_by=points.c.ts_unix)
+            .label("next_ts"),
+        ).subquery("neighbours")
+        stmt = (
+            select(neighbours.c.ts_unix + step, neighbours.c.next_ts)
+            .where(neighbours.c.next_ts - neighbours.c.ts_unix > step)
+            .order_by(neighbours.c.ts_unix)
+            .limit(limit)
+            .offset(offset)
+        )
+        result = await self._session.execute(stmt)
+        # Each gap is [start, end): end is the next stored point (or sentinel).
+        return [(int(start), int(end)) for start, end in result]
 
     async def count_price_points(
         self,
@@ -31,41 +408,91 @@ class PricePointRepository:
         from_ts: int | None = None,
         to_ts: int | None = None,
     ) -> int:
-        stmt = (
-            select(func.count())
-            .select_from(PricePoint)
-            .where(PricePoint.ticker == ticker)
+        stmt = _count_statement(ticker=ticker, from_ts=from_ts, to_ts=to_ts)
+        result = await self._session.execute(stmt)
+        return int(result.scalar_one())
+
+    async def estimate_price_points(
+        self,
+        *,
+        ticker: str,
+        from_ts: int | None = None,
+        to_ts: int | None = None,
+    ) -> int:
+        # Planner row estimate from table statistics; no rows are scanned.
+        sql = (
+            "EXPLAIN (FORMAT JSON) SELECT 1 FROM price_points"
+            " WHERE ticker_id = (SELECT id FROM tickers WHERE name = :ticker)"
         )
+        params: dict[str, object] = {"ticker": ticker}
         if from_ts is not None:
-            stmt = stmt.where(PricePoint.ts_unix >= from_ts)
+            sql += " AND ts_unix >= :from_ts"
+            params["from_ts"] = from_ts
         if to_ts is not None:
-            stmt = stmt.where(PricePoint.ts_unix <= to_ts)
+            sql += " AND ts_unix <= :to_ts"
+            params["to_ts"] = to_ts
 
-        result = await self._session.execute(stmt)
-        return int(result.scalar_one())
+        result = await self._session.execute(text(sql), params)
+        plan = result.scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
 
     async def list_price_points(
-        self, *, ticker: str, limit: int, offset: int
-    ) -> Sequence[PricePoint]:
+        self,
+        *,
+        ticker: str,
+        limit: int,
+        offset: int,
+        after_ts: int | None = None,
+        before_ts: int | None = None,
+    ) -> Sequence[Row]:
+        return await self.list_range(
+            ticker=ticker,
+            from_ts=None,
+            to_ts=None,
+            limit=limit,
+            offset=offset,
+            after_ts=after_ts,
+            before_ts=before_ts,
+        )
+
+    async def get_latest(self, *, ticker: str) -> Row | None:
         stmt = (
-            select(PricePoint)
-            .where(PricePoint.ticker == ticker)
-            .order_by(PricePoint.ts_unix.asc())
-            .limit(limit)
-            .offset(offset)
+            _point_columns(ticker)
+            .where(PricePoint.ticker_id == _ticker_id(ticker))
+            .order_by(PricePoint.ts_unix.desc())
+            .limit(1)
         )
         result = await self._session.execute(stmt)
-        return result.scalars().all()
+        return result.first()
 
-    async def get_latest(self, *, ticker: str) -> PricePoint | None:
+    async def get_first_ts(self, *, ticker: str) -> int | None:
         stmt = (
-            select(PricePoint)
-            .where(PricePoint.ticker == ticker)
+            select(PricePoint.ts_unix)
+            .where(PricePoint.ticker_id == _ticker_id(ticker))
+            .order_by(PricePoint.ts_unix.asc())
+            .limit(1)
+        )
+        result = await self._session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def get_latest_all(self) -> Sequence[Row]:
+        # One index probe per enabled ticker instead of a query each.
+        latest = (
+            select(PricePoint.ts_unix, PricePoint.price)
+            .where(PricePoint.ticker_id == Ticker.id)
             .order_by(PricePoint.ts_unix.desc())
             .limit(1)
+            .lateral("latest")
+        )
+        stmt = (
+            select(Ticker.name.label("ticker"), latest.c.ts_unix, latest.c.price)
+            .join(latest, true())
+            .where(Ticker.enabled)
         )
         result = await self._session.execute(stmt)
-        return result.scalars().first()
+        return result.all()
 
     async def list_range(
         self,
@@ -75,13 +502,354 @@ class PricePointRepository:
         to_ts: int | None,
         limit: int,
         offset: int,
-    ) -> Sequence[PricePoint]:
-        stmt = select(PricePoint).where(PricePoint.ticker == ticker)
-        if from_ts is not None:
-            stmt = stmt.where(PricePoint.ts_unix >= from_ts)
-        if to_ts is not None:
-            stmt = stmt.where(PricePoint.ts_unix <= to_ts)
+        after_ts: int | None = None,
+        before_ts: int | None = None,
+    ) -> Sequence[Row]:
+        stmt = self._page_statement(
+            ticker=ticker,
+            from_ts=from_ts,
+            to_ts=to_ts,
+            limit=limit,
+            offset=offset,
+            after_ts=after_ts,
+            before_ts=before_ts,
+        )
+        result = await self._session.execute(stmt)
+        rows = result.all()
+        return rows[::-1] if before_ts is not None else rows
+
+    async def list_range_with_count(
+        self,
+        *,
+        ticker: str,
+        from_ts: int | None,
+        to_ts: int | None,
+        limit: int,
+        offset: int,
+        after_ts: int | None = None,
+        before_ts: int | None = None,
+    ) -> tuple[Sequence[Row], int]:
+        # The total rides along as an uncorrelated scalar subquery, so the
+        # page and its exact count come back in a single round trip.
+        total = _count_statement(
+            ticker=ticker, from_ts=from_ts, to_ts=to_ts
+        ).scalar_subquery()
+        stmt = self._page_statement(
+            ticker=ticker,
+            from_ts=from_ts,
+            to_ts=to_ts,
+            limit=limit,
+            offset=offset,
+            after_ts=after_ts,
+            before_ts=before_ts,
+        ).add_columns(total.label("total"))
+
+        result = await self._session.execute(stmt)
+        rows = result.all()
+        if not rows:
+            count = await self.count_price_points(
+                ticker=ticker, from_ts=from_ts, to_ts=to_ts
+            )
+            return [], count
+
+        total_count = int(rows[0].total)
+        if before_ts is not None:
+            rows.reverse()
+        return rows, total_count
+
+    async def stream_range(
+        self,
+        *,
+        ticker: str,
+        from_ts: int | None,
+        to_ts: int | None,
+        chunk_size: int,
+    ) -> AsyncIterator[Sequence[Row]]:
+        stmt = _filter_range(
+            _point_columns(ticker),
+            ticker=ticker,
+            from_ts=from_ts,
+            to_ts=to_ts,
+        ).order_by(PricePoint.ts_unix.asc())
+
+        # Server-side cursor: memory stays bounded by chunk_size rows.
+        result = await self._session.stream(
+            stmt.execution_options(yield_per=chunk_size)
+        )
+        async for partition in result.partitions():
+            yield partition
+
+    async def list_filled_range(
+        self,
+        *,
+        ticker: str,
+        from_ts: int,
+        to_ts: int,
+        fill: Literal["previous", "null"],
+        limit: int,
+        offset: int,
+        after_ts: int | None = None,
+        before_ts: int | None = None,
+        step: int = 60,
+    ) -> Sequence[Row]:
+        # Paging over a dense grid is plain arithmetic, so only the rows of
+        # the requested page are generated and joined.
+        first, last = series_bounds(from_ts=from_ts, to_ts=to_ts, step=step)
+        if after_ts is not None:
+            first = max(first, (after_ts // step + 1) * step)
+        if before_ts is not None:
+            last = min(last, ((before_ts - 1) // step) * step)
+            start = last - offset * step
+            stop = max(first, start - (limit - 1) * step)
+            step = -step
+        else:
+            start = first + offset * step
+            stop = min(last, start + (limit - 1) * step)
+        if (stop - start) * step < 0:
+            return []
+
+        series = (
+            func.generate_series(
+                literal(start, BigInteger),
+                literal(stop, BigInteger),
+                literal(step, BigInteger),
+            )
+            .table_valued("ts_unix")
+            .render_derived(name="series")
+        )
+        if fill == "null":
+            stmt = select(
+                literal(ticker, String).label("ticker"),
+                series.c.ts_unix,
+                PricePoint.price,
+                PricePoint.ts_unix.is_(None).label("filled"),
+            ).outerjoin_from(
+                series,
+                PricePoint,
+                and_(
+                    PricePoint.ticker_id == _ticker_id(ticker),
+                    PricePoint.ts_unix == series.c.ts_unix,
+                ),
+            )
+        else:
+            # Latest point at or before each grid timestamp: one backward
+            # index probe per row, reaching before the window when needed.
+            carried = (
+                select(PricePoint.ts_unix, PricePoint.price)
+                .where(
+                    PricePoint.ticker_id == _ticker_id(ticker),
+                    PricePoint.ts_unix <= series.c.ts_unix,
+                )
+                .order_by(PricePoint.ts_unix.desc())
+                .limit(1)
+                .lateral("carried")
+            )
+            stmt = select(
+                literal(ticker, String).label("ticker"),
+                series.c.ts_unix,
+                carried.c.price,
+                func.coalesce(carried.c.ts_unix != series.c.ts_unix, true()).label(
+                    "filled"
+                ),
+            ).outerjoin_from(series, carried, true())
+
+        order_by = series.c.ts_unix.desc() if step < 0 else series.c.ts_unix.asc()
+        result = await self._session.execute(stmt.order_by(order_by))
+        rows = result.all()
+        return rows[::-1] if before_ts is not None else rows
+
+    def _page_statement(
+        self,
+        *,
+        ticker: str,
+        from_ts: int | None,
+        to_ts: int | None,
+        limit: int,
+        offset: int,
+        after_ts: int | None,
+        before_ts: int | None,
+    ) -> Select:
+        stmt = _filter_range(
+            _point_columns(ticker), ticker=ticker, from_ts=from_ts, to_ts=to_ts
+        )
+        if after_ts is not None:
+            stmt = stmt.where(PricePoint.ts_unix > after_ts)
+
+        if before_ts is not None:
+            # Seek backwards from the cursor; callers restore ascending order.
+            stmt = stmt.where(PricePoint.ts_unix < before_ts)
+            order_by = PricePoint.ts_unix.desc()
+        else:
+            order_by = PricePoint.ts_unix.asc()
+
+        return stmt.order_by(order_by).limit(limit).offset(offset)
+
+    async def list_ohlc(
+        self,
+        *,
+        ticker: str,
+        interval: int,
+        from_ts: int | None,
+        to_ts: int | None,
+        limit: int,
+        offset: int,
+        after_ts: int | None = None,
+        before_ts: int | None = None,
+    ) -> Sequence[Row]:
+        stmt = self._ohlc_statement(
+            ticker=ticker,
+            interval=interval,
+            from_ts=from_ts,
+            to_ts=to_ts,
+            limit=limit,
+            offset=offset,
+            after_ts=after_ts,
+            before_ts=before_ts,
+        )
+        result = await self._session.execute(stmt)
+        rows = result.all()
+        return rows[::-1] if before_ts is not None else rows
 
-        stmt = stmt.order_by(PricePoint.ts_unix.asc()).limit(limit).offset(offset)
+    async def count_ohlc_buckets(
+        self,
+        *,
+        ticker: str,
+        interval: int,
+        from_ts: int | None = None,
+        to_ts: int | None = None,
+    ) -> int:
+        stmt = _ohlc_count_statement(
+            ticker=ticker, interval=interval, from_ts=from_ts, to_ts=to_ts
+        )
         result = await self._session.execute(stmt)
-        return result.scalars().all()
+        return int(result.scalar_one())
+
+    async def list_ohlc_with_count(
+        self,
+        *,
+        ticker: str,
+        interval: int,
+        from_ts: int | None,
+        to_ts: int | None,
+        limit: int,
+        offset: int,
+        after_ts: int | None = None,
+        before_ts: int | None = None,
+    ) -> tuple[Sequence[Row], int]:
+        total = _ohlc_count_statement(
+            ticker=ticker, interval=interval, from_ts=from_ts, to_ts=to_ts
+        ).scalar_subquery()
+        stmt = self._ohlc_statement(
+            ticker=ticker,
+            interval=interval,
+            from_ts=from_ts,
+            to_ts=to_ts,
+            limit=limit,
+            offset=offset,
+            after_ts=after_ts,
+            before_ts=before_ts,
+        ).add_columns(total.label("total"))
+
+        result = await self._session.execute(stmt)
+        rows = result.all()
+        if not rows:
+            count = await self.count_ohlc_buckets(
+                ticker=ticker, interval=interval, from_ts=from_ts, to_ts=to_ts
+            )
+            return [], count
+
+        total_count = int(rows[0].total)
+        if before_ts is not None:
+            rows.reverse()
+        return rows, total_count
+
+    async def get_stats(
+        self, *, ticker: str, from_ts: int | None, to_ts: int | None
+    ) -> Row:
+        partials = _partials(ticker=ticker, from_ts=from_ts, to_ts=to_ts)
+        stmt = select(
+            *_candle_columns(partials),
+            func.sum(partials.c.price_sum).label("price_sum"),
+        )
+        result = await self._session.execute(stmt)
+        return result.one()
+
+    async def list_min_max(
+        self, *, ticker: str, from_ts: int, to_ts: int, interval: int
+    ) -> Sequence[Row]:
+        # The extremes of every bucket and when they happened, reduced in
+        # the database so only two points per bucket come back. Buckets start
+        # at from_ts, so an unaligned window gets no partial bucket at either
+        # end and the bucket count stays within what the interval was cut for.
+        bucket = _ohlc_bucket(PricePoint.ts_unix, interval, origin=from_ts)
+        stmt = _filter_range(
+            select(
+                bucket.label("ts_unix"),
+                func.array_agg(
+                    aggregate_order_by(
+                        PricePoint.ts_unix, PricePoint.price.asc(), PricePoint.ts_unix
+                    )
+                )[1].label("low_ts"),
+                func.min(PricePoint.price).label("low"),
+                func.array_agg(
+                    aggregate_order_by(
+                        PricePoint.ts_unix, PricePoint.price.desc(), PricePoint.ts_unix
+                    )
+                )[1].label("high_ts"),
+                func.max(PricePoint.price).label("high"),
+            ),
+            ticker=ticker,
+            from_ts=from_ts,
+            to_ts=to_ts,
+        )
+        result = await self._session.execute(
+            stmt.group_by(bucket).order_by(bucket.asc())
+        )
+        return result.all()
+
+    async def list_points_at(
+        self, *, ticker: str, timestamps: Sequence[int]
+    ) -> Sequence[Row]:
+        stmt = (
+            _point_columns(ticker)
+            .where(
+                PricePoint.ticker_id == _ticker_id(ticker),
+                # One array parameter, whatever the number of timestamps.
+                PricePoint.ts_unix
+                == any_(literal(list(timestamps), ARRAY(BigInteger))),
+            )
+            .order_by(PricePoint.ts_unix.asc())
+        )
+        result = await self._session.execute(stmt)
+        return result.all()
+
+    def _ohlc_statement(
+        self,
+        *,
+        ticker: str,
+        interval: int,
+        from_ts: int | None,
+        to_ts: int | None,
+        limit: int,
+        offset: int,
+        after_ts: int | None,
+        before_ts: int | None,
+    ) -> Select:
+        # Cursors hold bucket starts, so seek whole buckets past them; the
+        # narrowed window also lets the rollups cover as much as possible.
+        if after_ts is not None:
+            seek = after_ts + interval
+            from_ts = seek if from_ts is None else max(from_ts, seek)
+        if before_ts is not None:
+            to_ts = before_ts - 1 if to_ts is None else min(to_ts, before_ts - 1)
+
+        partials = _partials(
+            ticker=ticker, from_ts=from_ts, to_ts=to_ts, interval=interval
+        )
+        bucket = _ohlc_bucket(partials.c.ts_unix, interval)
+        stmt = select(
+            bucket.label("ts_unix"),
+            *_candle_columns(partials),
+        ).group_by(bucket)
+        order_by = bucket.desc() if before_ts is not None else bucket.asc()
+        return stmt.order_by(order_by).limit(limit).offset(offset)
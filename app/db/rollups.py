@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from sqlalchemy import (
+    BigInteger,
+    Select,
+    SmallInteger,
+    TableValuedAlias,
+    and_,
+    delete,
+    func,
+    literal,
+    select,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, Insert, aggregate_order_by, insert
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.db.models import (
+    PricePoint,
+    PriceRollupDaily,
+    PriceRollupDirty,
+    PriceRollupHourly,
+)
+
+HOUR_SECONDS = 3_600
+DAY_SECONDS = 86_400
+
+RollupModel = type[PriceRollupDaily | PriceRollupHourly]
+
+# Coarsest first, so readers take the first one that fits.
+ROLLUPS: tuple[tuple[int, RollupModel], ...] = (
+    (DAY_SECONDS, PriceRollupDaily),
+    (HOUR_SECONDS, PriceRollupHourly),
+)
+
+
+async def claim_dirty_hours(
+    connection: AsyncConnection, *, limit: int
+) -> list[tuple[int, int]]:
+    # Deleting the marks first means an upsert that lands while this batch
+    # is folded marks its hour again and is picked up by the next run.
+    batch = (
+        select(PriceRollupDirty.ticker_id, PriceRollupDirty.bucket_ts)
+        .order_by(PriceRollupDirty.bucket_ts)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    stmt = (
+        delete(PriceRollupDirty)
+        .where(
+            tuple_(PriceRollupDirty.ticker_id, PriceRollupDirty.bucket_ts).in_(batch)
+        )
+        .returning(PriceRollupDirty.ticker_id, PriceRollupDirty.bucket_ts)
+    )
+    result = await connection.execute(stmt)
+    return [(int(ticker_id), int(bucket_ts)) for ticker_id, bucket_ts in result]
+
+
+async def refresh_hourly(
+    connection: AsyncConnection, hours: Sequence[tuple[int, int]]
+) -> None:
+    claimed = _pairs(hours, name="claimed")
+    source = (
+        select(
+            claimed.c.ticker_id,
+            claimed.c.bucket_ts,
+            func.array_agg(
+                aggregate_order_by(PricePoint.price, PricePoint.ts_unix.asc())
+            )[1],
+            func.max(PricePoint.price),
+            func.min(PricePoint.price),
+            func.array_agg(
+                aggregate_order_by(PricePoint.price, PricePoint.ts_unix.desc())
+            )[1],
+            func.count(),
+            func.sum(PricePoint.price),
+        )
+        .join_from(
+            claimed,
+            PricePoint,
+            and_(
+                PricePoint.ticker_id == claimed.c.ticker_id,
+                PricePoint.ts_unix >= claimed.c.bucket_ts,
+                PricePoint.ts_unix < claimed.c.bucket_ts + HOUR_SECONDS,
+            ),
+        )
+        .group_by(claimed.c.ticker_id, claimed.c.bucket_ts)
+    )
+    await connection.execute(_upsert(PriceRollupHourly, source))
+
+
+async def refresh_daily(
+    connection: AsyncConnection, days: Sequence[tuple[int, int]]
+) -> None:
+    # Days are folded from their hours, never from raw points.
+    claimed = _pairs(days, name="claimed")
+    hourly = PriceRollupHourly
+    source = (
+        select(
+            claimed.c.ticker_id,
+            claimed.c.bucket_ts,
+            func.array_agg(aggregate_order_by(hourly.open, hourly.bucket_ts.asc()))[1],
+            func.max(hourly.high),
+            func.min(hourly.low),
+            func.array_agg(aggregate_order_by(hourly.close, hourly.bucket_ts.desc()))[
+                1
+            ],
+            func.sum(hourly.count),
+            func.sum(hourly.price_sum),
+        )
+        .join_from(
+            claimed,
+            hourly,
+            and_(
+                hourly.ticker_id == claimed.c.ticker_id,
+                hourly.bucket_ts >= claimed.c.bucket_ts,
+                hourly.bucket_ts < claimed.c.bucket_ts + DAY_SECONDS,
+            ),
+        )
+        .group_by(claimed.c.ticker_id, claimed.c.bucket_ts)
+    )
+    await connection.execute(_upsert(PriceRollupDaily, source))
+
+
+async def fold_dirty_hours(connection: AsyncConnection, *, limit: int) -> int:
+    hours = await claim_dirty_hours(connection, limit=limit)
+    if not hours:
+        return 0
+
+    await refresh_hourly(connection, hours)
+    days = sorted({(ticker_id, ts - ts % DAY_SECONDS) for ticker_id, ts in hours})
+    await refresh_daily(connection, days)
+    return len(hours)
+
+
+async def drop_rollups(
+    connection: AsyncConnection, *, from_ts: int, to_ts: int
+) -> None:
+    # Retention drops raw partitions without firing row triggers, so the
+    # rollups over them go too and never count points that no longer exist.
+    for model in (PriceRollupDaily, PriceRollupHourly, PriceRollupDirty):
+        await connection.execute(
+            delete(model).where(model.bucket_ts >= from_ts, model.bucket_ts < to_ts)
+        )
+
+
+def _pairs(pairs: Sequence[tuple[int, int]], *, name: str) -> TableValuedAlias:
+    ticker_ids = [ticker_id for ticker_id, _ in pairs]
+    buckets = [bucket_ts for _, bucket_ts in pairs]
+    return (
+        func.unnest(
+            literal(ticker_ids, ARRAY(SmallInteger)),
+            literal(buckets, ARRAY(BigInteger)),
+        )
+        .table_valued("ticker_id", "bucket_ts")
+        .render_derived(name=name)
+    )
+
+
+def _upsert(rollup: RollupModel, source: Select) -> Insert:
+    columns = [
+        "ticker_id",
+        "bucket_ts",
+        "open",
+        "high",
+        "low",
+        "close",
+        "count",
+        "price_sum",
+    ]
+    stmt = insert(rollup).from_select(columns, source)
+    return stmt.on_conflict_do_update(
+        index_elements=["ticker_id", "bucket_ts"],
+        set_={column: stmt.excluded[column] for column in columns[2:]},
+    )
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import time
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
@@ -9,20 +11,86 @@ from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.pool import QueuePool
+from starlette.requests import Request
 
 from app.core.config import get_settings
+from app.core.metrics import DB_POOL_WAIT_SECONDS
+from app.db.instrumentation import instrument_engine
 
 
 def create_engine(*, database_url: str | None = None) -> AsyncEngine:
     settings = get_settings()
     url = database_url or settings.database_url
-    return create_async_engine(url, pool_pre_ping=True)
+    engine = create_async_engine(
+        url,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout_seconds,
+        pool_recycle=settings.db_pool_recycle_seconds,
+        pool_pre_ping=settings.db_pool_pre_ping,
+    )
+    instrument_engine(engine)
+    return engine
 
 
 def create_sessionmaker(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
     return async_sessionmaker(engine, expire_on_commit=False)
 
 
+@dataclass
+class PoolStats:
+    acquisitions: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        self.acquisitions += 1
+        self.wait_seconds_total += seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+
+@dataclass
+class Database:
+    engine: AsyncEngine
+    sessionmaker: async_sessionmaker[AsyncSession]
+    pool_stats: PoolStats = field(default_factory=PoolStats)
+
+    @classmethod
+    def create(cls, *, database_url: str | None = None) -> Database:
+        engine = create_engine(database_url=database_url)
+        return cls(engine=engine, sessionmaker=create_sessionmaker(engine))
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
+        async with self.sessionmaker() as session:
+            started = time.perf_counter()
+            await session.connection()
+            waited = time.perf_counter() - started
+            self.pool_stats.record_wait(waited)
+            DB_POOL_WAIT_SECONDS.observe(waited)
+            yield session
+
+    def pool_status(self) -> dict[str, object]:
+        pool = self.engine.pool
+        status: dict[str, object] = {
+            "acquisitions": self.pool_stats.acquisitions,
+            "wait_seconds_total": round(self.pool_stats.wait_seconds_total, 6),
+            "wait_seconds_max": round(self.pool_stats.wait_seconds_max, 6),
+        }
+        if isinstance(pool, QueuePool):
+            status.update(
+                size=pool.size(),
+                checked_in=pool.checkedin(),
+                checked_out=pool.checkedout(),
+                overflow=pool.overflow(),
+            )
+        return status
+
+    async def dispose(self) -> None:
+        await self.engine.dispose()
+
+
 @asynccontextmanager
 async def session_scope(
     *, database_url: str | None = None
@@ -38,13 +106,16 @@ async def session_scope(
             await engine.dispose()
 
 
-async def get_db_session() -> AsyncIterator[AsyncSession]:
-    engine = create_engine()
-    session_factory = create_sessionmaker(engine)
+def get_database(request: Request) -> Database:
+    return request.app.state.db
 
-    async with session_factory() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
-            await engine.dispose()
+
+async def get_db_session(request: Request) -> AsyncIterator[AsyncSession]:
+    async with get_database(request).session() as session:
+        yield session
+
+
+async def get_lazy_db_session(request: Request) -> AsyncIterator[AsyncSession]:
+    # Only checks out a connection once the session is first used.
+    async with get_database(request).sessionmaker() as session:
+        yield session
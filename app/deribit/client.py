@@ -1,11 +1,32 @@
 from __future__ import annotations
 
+import asyncio
+import random
+import time
 from decimal import Decimal
+from typing import Any
 
 import aiohttp
 
 from app.core.config import get_settings
-from app.deribit.errors import DeribitHttpError, DeribitRateLimitError, DeribitRpcError
+from app.core.metrics import DERIBIT_ERRORS, DERIBIT_REQUEST_SECONDS
+from app.deribit.errors import (
+    DeribitDeadlineExceededError,
+    DeribitError,
+    DeribitHttpError,
+    DeribitRateLimitError,
+    DeribitRpcError,
+)
+from app.deribit.rate_limit import TokenBucket
+
+
+def _is_retryable(exc: DeribitError) -> bool:
+    if isinstance(exc, DeribitRateLimitError):
+        return True
+    if isinstance(exc, DeribitHttpError):
+        # 0 is a transport failure (connect error, timeout, reset).
+        return exc.status == 0 or exc.status == 429 or exc.status >= 500
+    return False
 
 
 class DeribitClient:
@@ -14,11 +35,26 @@ class DeribitClient:
         *,
         base_url: str | None = None,
         timeout_seconds: float = 10.0,
+        keepalive_timeout_seconds: float = 90.0,
+        max_retries: int | None = None,
+        rate_limiter: TokenBucket | None = None,
         session: aiohttp.ClientSession | None = None,
     ) -> None:
         settings = get_settings()
         self._base_url = (base_url or settings.deribit_base_url).rstrip("/")
+        self._timeout_seconds = timeout_seconds
         self._timeout = aiohttp.ClientTimeout(total=timeout_seconds)
+        self._keepalive_timeout_seconds = keepalive_timeout_seconds
+        self._max_retries = (
+            settings.deribit_max_retries if max_retries is None else max_retries
+        )
+        self._backoff_seconds = settings.deribit_retry_backoff_seconds
+        self._backoff_max_seconds = settings.deribit_retry_backoff_max_seconds
+        # Every request made through this client draws from one bucket.
+        self._rate_limiter = rate_limiter or TokenBucket(
+            rate_per_second=settings.deribit_rate_limit_per_second,
+            capacity=settings.deribit_rate_limit_burst,
+        )
         self._session = session
         self._owned_session: aiohttp.ClientSession | None = None
 
@@ -33,12 +69,94 @@ class DeribitClient:
     ) -> None:
         await self.close()
 
-    async def get_index_price(self, index_name: str) -> Decimal:
-        url = f"{self._base_url}/public/get_index_price"
+    async def get_index_price(
+        self, index_name: str, *, deadline: float | None = None
+    ) -> Decimal:
+        result = await self._call(
+            "public/get_index_price", {"index_name": index_name}, deadline=deadline
+        )
+        try:
+            index_price = result["index_price"]
+        except (KeyError, TypeError) as exc:
+            raise DeribitRpcError(
+                code=-1, message="unexpected response shape", data=result
+            ) from exc
+
+        return Decimal(str(index_price))
+
+    async def get_index_chart_data(
+        self, index_name: str, *, range_name: str, deadline: float | None = None
+    ) -> list[tuple[int, Decimal]]:
+        result = await self._call(
+            "public/get_index_chart_data",
+            {"index_name": index_name, "range": range_name},
+            deadline=deadline,
+        )
+        if not isinstance(result, list):
+            raise DeribitRpcError(
+                code=-1, message="unexpected response shape", data=result
+            )
+
+        try:
+            return [
+                (int(timestamp_ms), Decimal(str(price)))
+                for timestamp_ms, price in result
+            ]
+        except (TypeError, ValueError, ArithmeticError) as exc:
+            raise DeribitRpcError(
+                code=-1, message="unexpected response shape", data=result
+            ) from exc
+
+    async def get_index_price_names(self) -> list[str]:
+        result = await self._call("public/get_index_price_names", {})
+        if not isinstance(result, list):
+            raise DeribitRpcError(
+                code=-1, message="unexpected response shape", data=result
+            )
+        return [str(name) for name in result]
+
+    async def _call(
+        self, method: str, params: dict[str, str], *, deadline: float | None = None
+    ) -> Any:
+        # deadline is a time.monotonic() value; no attempt or backoff sleep
+        # is started that could not finish before it.
+        attempt = 0
+        while True:
+            await self._rate_limiter.acquire(deadline=deadline)
+            started = time.perf_counter()
+            try:
+                return await self._request(method, params, deadline=deadline)
+            except DeribitError as exc:
+                DERIBIT_ERRORS.labels(method=method, error=type(exc).__name__).inc()
+                error = exc
+            finally:
+                DERIBIT_REQUEST_SECONDS.labels(method=method).observe(
+                    time.perf_counter() - started
+                )
+
+            if attempt >= self._max_retries or not _is_retryable(error):
+                raise error
+            cap = min(self._backoff_max_seconds, self._backoff_seconds * 2**attempt)
+            delay = random.uniform(0, cap)
+            if deadline is not None and time.monotonic() + delay >= deadline:
+                raise error
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _request(
+        self, method: str, params: dict[str, str], *, deadline: float | None
+    ) -> Any:
+        url = f"{self._base_url}/{method}"
+        timeout = self._timeout
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise DeribitDeadlineExceededError(f"{method} deadline exceeded")
+            timeout = aiohttp.ClientTimeout(total=min(self._timeout_seconds, remaining))
 
         try:
             session = self._get_session()
-            async with session.get(url, params={"index_name": index_name}) as resp:
+            async with session.get(url, params=params, timeout=timeout) as resp:
                 body_text = await resp.text()
                 if resp.status != 200:
                     raise DeribitHttpError(status=resp.status, body=body_text)
@@ -57,15 +175,12 @@ class DeribitClient:
             raise DeribitRpcError(code=code, message=message, data=data)
 
         try:
-            result = payload["result"]
-            index_price = result["index_price"]
+            return payload["result"]
         except (KeyError, TypeError) as exc:
             raise DeribitRpcError(
                 code=-1, message="unexpected response shape", data=payload
             ) from exc
 
-        return Decimal(str(index_price))
-
     async def close(self) -> None:
         if self._owned_session is None:
             return
@@ -76,5 +191,13 @@ class DeribitClient:
         if self._session is not None:
             return self._session
         if self._owned_session is None:
-            self._owned_session = aiohttp.ClientSession(timeout=self._timeout)
+            # Idle connections outlive the one-minute poll interval, so a
+            # long-lived client reuses its TLS connection between runs.
+            connector = aiohttp.TCPConnector(
+                keepalive_timeout=self._keepalive_timeout_seconds,
+                ttl_dns_cache=300,
+            )
+            self._owned_session = aiohttp.ClientSession(
+                timeout=self._timeout, connector=connector
+            )
         return self._owned_session
@@ -22,3 +22,7 @@ class DeribitRpcError(DeribitError):
 
 class DeribitRateLimitError(DeribitRpcError):
     pass
+
+
+class DeribitDeadlineExceededError(DeribitError):
+    pass
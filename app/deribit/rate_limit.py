@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+
+from app.deribit.errors import DeribitDeadlineExceededError
+
+
+class TokenBucket:
+    def __init__(
+        self,
+        *,
+        rate_per_second: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[object]] = asyncio.sleep,
+    ) -> None:
+        self._rate = rate_per_second
+        self._capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = capacity
+        self._updated = clock()
+        # Waiters queue on the lock, so tokens are handed out first come,
+        # first served instead of to whoever wakes up first.
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, *, deadline: float | None = None) -> None:
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                wait = (1 - self._tokens) / self._rate
+                if deadline is not None and self._clock() + wait > deadline:
+                    raise DeribitDeadlineExceededError(
+                        "rate limit wait exceeds deadline"
+                    )
+                await self._sleep(wait)
+                self._refill()
+            self._tokens -= 1
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._updated
+        self._tokens = min(self._capacity, self._tokens + elapsed * self._rate)
+        self._updated = now
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import logging
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
+
+import aiohttp
+
+from app.core.config import get_settings
+from app.deribit.errors import DeribitRpcError
+
+logger = logging.getLogger(__name__)
+
+PRICE_INDEX_CHANNEL_PREFIX = "deribit_price_index."
+
+_CLOSED_TYPES = frozenset(
+    {aiohttp.WSMsgType.CLOSE, aiohttp.WSMsgType.CLOSING, aiohttp.WSMsgType.CLOSED}
+)
+
+
+@dataclass(frozen=True)
+class IndexPriceTick:
+    index_name: str
+    price: Decimal
+    timestamp_ms: int
+
+
+class DeribitPriceStream:
+    _reconnect_initial_seconds: float = 1.0
+    _reconnect_max_seconds: float = 30.0
+
+    def __init__(
+        self,
+        *,
+        tickers: Iterable[str],
+        ws_url: str | None = None,
+        heartbeat_seconds: int | None = None,
+        session: aiohttp.ClientSession | None = None,
+    ) -> None:
+        settings = get_settings()
+        self._ws_url = ws_url or settings.deribit_ws_url
+        self._heartbeat_seconds = heartbeat_seconds or settings.stream_heartbeat_seconds
+        self._channels = [f"{PRICE_INDEX_CHANNEL_PREFIX}{t}" for t in tickers]
+        self._session = session
+        self._owned_session: aiohttp.ClientSession | None = None
+        self._request_ids = itertools.count(1)
+
+    async def ticks(self) -> AsyncIterator[IndexPriceTick]:
+        delay = self._reconnect_initial_seconds
+        while True:
+            try:
+                async for tick in self._subscribe_once():
+                    delay = self._reconnect_initial_seconds
+                    yield tick
+                logger.warning("deribit websocket closed; reconnecting in %.0fs", delay)
+            except Exception:
+                # Anything short of cancellation reconnects: the stream is
+                # the only ingest path in this mode, so it must not die.
+                logger.warning(
+                    "deribit websocket failed; reconnecting in %.0fs",
+                    delay,
+                    exc_info=True,
+                )
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self._reconnect_max_seconds)
+
+    async def close(self) -> None:
+        if self._owned_session is None:
+            return
+        await self._owned_session.close()
+        self._owned_session = None
+
+    async def _subscribe_once(self) -> AsyncIterator[IndexPriceTick]:
+        # Deribit sends a heartbeat every interval, so twice that with no
+        # traffic at all means the connection is gone.
+        async with self._get_session().ws_connect(self._ws_url) as ws:
+            await self._send(
+                ws, "public/set_heartbeat", {"interval": self._heartbeat_seconds}
+            )
+            await self._send(ws, "public/subscribe", {"channels": self._channels})
+
+            while True:
+                message = await ws.receive(timeout=self._heartbeat_seconds * 2)
+                if message.type in _CLOSED_TYPES:
+                    return
+                if message.type == aiohttp.WSMsgType.ERROR:
+                    raise ws.exception() or aiohttp.ClientError("websocket error")
+                if message.type != aiohttp.WSMsgType.TEXT:
+                    continue
+
+                try:
+                    payload = json.loads(message.data)
+                except ValueError:
+                    logger.warning("ignoring undecodable frame: %.200r", message.data)
+                    continue
+                if not isinstance(payload, dict):
+                    logger.warning("ignoring non-object frame: %.200r", payload)
+                    continue
+
+                tick = await self._handle(ws, payload)
+                if tick is not None:
+                    yield tick
+
+    async def _handle(
+        self, ws: aiohttp.ClientWebSocketResponse, payload: dict[str, object]
+    ) -> IndexPriceTick | None:
+        method = payload.get("method")
+        params = payload.get("params")
+
+        if method == "heartbeat":
+            if isinstance(params, dict) and params.get("type") == "test_request":
+                await self._send(ws, "public/test", {})
+            return None
+
+        if method == "subscription" and isinstance(params, dict):
+            return _parse_tick(params)
+
+        error = payload.get("error")
+        if isinstance(error, dict):
+            raise DeribitRpcError(
+                code=int(error.get("code", -1)),
+                message=str(error.get("message")),
+                data=error.get("data"),
+            )
+        return None
+
+    async def _send(
+        self,
+        ws: aiohttp.ClientWebSocketResponse,
+        method: str,
+        params: dict[str, object],
+    ) -> None:
+        await ws.send_json(
+            {
+                "jsonrpc": "2.0",
+                "id": next(self._request_ids),
+                "method": method,
+                "params": params,
+            }
+        )
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is not None:
+            return self._session
+        if self._owned_session is None:
+            self._owned_session = aiohttp.ClientSession()
+        return self._owned_session
+
+
+def _parse_tick(params: dict[object, object]) -> IndexPriceTick | None:
+    channel = params.get("channel")
+    data = params.get("data")
+    if not isinstance(channel, str) or not channel.startswith(
+        PRICE_INDEX_CHANNEL_PREFIX
+    ):
+        return None
+    if not isinstance(data, dict):
+        return None
+
+    try:
+        return IndexPriceTick(
+            index_name=str(data["index_name"]),
+            price=Decimal(str(data["price"])),
+            timestamp_ms=int(data["timestamp"]),
+        )
+    except (KeyError, TypeError, ValueError, InvalidOperation):
+        logger.warning("ignoring malformed price index update: %r", data)
+        return None
@@ -1,13 +1,81 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
+from app.api.metrics import MetricsMiddleware
+from app.api.request_log import RequestLogMiddleware
 from app.api.routes.health import router as health_router
+from app.api.routes.metrics import router as metrics_router
 from app.api.routes.prices import router as prices_router
+from app.core.config import get_settings
 from app.core.logging import configure_logging
+from app.db.replicas import ReadRouter
+from app.db.session import Database
+from app.services.latest_price_cache import LatestPriceCache, LatestPriceListener
+from app.services.price_service import DEFAULT_TICKERS
+from app.services.ticker_registry import TickerRegistry, TickerRegistryRefresher
 
 configure_logging()
 
-app = FastAPI(title="Deribit Index Price History API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    settings = get_settings()
+    db = Database.create()
+    app.state.db = db
+    reads = ReadRouter.create(db)
+    app.state.read_router = reads
+
+    cache = LatestPriceCache(
+        max_age_seconds=settings.latest_price_cache_max_age_seconds
+    )
+    app.state.latest_price_cache = cache
+
+    # Seeded with the built-in tickers until the first DB load lands.
+    registry = TickerRegistry(DEFAULT_TICKERS)
+    app.state.ticker_registry = registry
+    refresher = TickerRegistryRefresher(
+        registry,
+        sessionmaker=db.sessionmaker,
+        interval_seconds=settings.ticker_registry_refresh_seconds,
+    )
+    background_tasks = [asyncio.create_task(refresher.run())]
+    if reads.has_replicas:
+        background_tasks.append(
+            asyncio.create_task(
+                reads.run(interval_seconds=settings.db_replica_check_seconds)
+            )
+        )
+
+    # Runs even with the latest-price cache disabled: closed-window ETags
+    # follow the late writes it also listens for.
+    listener = LatestPriceListener(
+        cache,
+        database_url=settings.database_url,
+        sessionmaker=db.sessionmaker,
+    )
+    background_tasks.append(asyncio.create_task(listener.run()))
+
+    try:
+        yield
+    finally:
+        for task in background_tasks:
+            task.cancel()
+        for task in background_tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        await reads.dispose()
+        await db.dispose()
+
+
+app = FastAPI(title="Deribit Index Price History API", lifespan=lifespan)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(RequestLogMiddleware)
 app.include_router(health_router)
+app.include_router(metrics_router)
 app.include_router(prices_router)
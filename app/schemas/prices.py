@@ -15,7 +15,83 @@ class PricePointOut(BaseModel):
 
 
 class PaginatedPricePointsOut(BaseModel):
-    count: int
+    count: int | None
     next: str | None = Field(default=None)
     previous: str | None = Field(default=None)
     results: Sequence[PricePointOut]
+
+
+class RangePricePointOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    ticker: str
+    ts_unix: int
+    price: Decimal | None
+    filled: bool = False
+
+
+class PaginatedRangePricePointsOut(BaseModel):
+    count: int | None
+    next: str | None = Field(default=None)
+    previous: str | None = Field(default=None)
+    results: Sequence[RangePricePointOut]
+
+
+class PriceGapOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    from_ts: int
+    to_ts: int
+    missing: int
+
+
+class PaginatedPriceGapsOut(BaseModel):
+    count: int | None
+    next: str | None = Field(default=None)
+    previous: str | None = Field(default=None)
+    results: Sequence[PriceGapOut]
+
+
+class DownsampledPointOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    ts_unix: int
+    price: Decimal
+
+
+class DownsampleOut(BaseModel):
+    ticker: str
+    method: str
+    from_ts: int
+    to_ts: int
+    results: Sequence[DownsampledPointOut]
+
+
+class OhlcCandleOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    ts_unix: int
+    open: Decimal
+    high: Decimal
+    low: Decimal
+    close: Decimal
+    count: int
+
+
+class PaginatedOhlcOut(BaseModel):
+    count: int | None
+    next: str | None = Field(default=None)
+    previous: str | None = Field(default=None)
+    results: Sequence[OhlcCandleOut]
+
+
+class PriceStatsOut(BaseModel):
+    ticker: str
+    from_ts: int | None
+    to_ts: int | None
+    open: Decimal | None
+    high: Decimal | None
+    low: Decimal | None
+    close: Decimal | None
+    count: int
+    mean: Decimal | None
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator, Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from decimal import Decimal
+
+from app.core.config import get_settings
+from app.core.metrics import ADVISORY_LOCK_SKIPS
+from app.db.locks import release_advisory_lock, try_advisory_lock
+from app.db.repository import PricePointRepository, TickerRepository
+from app.db.session import Database
+from app.deribit.client import DeribitClient
+from app.deribit.errors import DeribitError
+from app.services.price_service import compute_minute_bucket
+
+logger = logging.getLogger(__name__)
+
+# public/get_index_chart_data only takes a range ending now; the first one
+# whose span reaches back to the oldest gap is fetched.
+CHART_RANGES: tuple[tuple[str, int], ...] = (
+    ("1h", 3_600),
+    ("1d", 86_400),
+    ("2d", 2 * 86_400),
+    ("1m", 30 * 86_400),
+    ("1y", 365 * 86_400),
+)
+
+
+def chart_range_for(oldest_ts: int, *, now_ts: int) -> str:
+    age = now_ts - oldest_ts
+    for range_name, span in CHART_RANGES:
+        if age <= span:
+            return range_name
+    return "all"
+
+
+# Only these ranges come back at minute resolution; coarser charts cannot
+# fill minute buckets, so older holes are left for good.
+MINUTE_CHART_RANGES = frozenset({"1h", "1d", "2d"})
+
+
+def chart_range_groups(buckets: Iterable[int], *, now_ts: int) -> dict[str, list[int]]:
+    # Each bucket is fetched with the finest range reaching it, so a recent
+    # outage is filled exactly however old the other holes are.
+    groups: dict[str, list[int]] = {}
+    for bucket in buckets:
+        range_name = chart_range_for(bucket, now_ts=now_ts)
+        if range_name in MINUTE_CHART_RANGES:
+            groups.setdefault(range_name, []).append(bucket)
+    return groups
+
+
+def missing_buckets(gaps: Iterable[tuple[int, int]]) -> list[int]:
+    buckets: list[int] = []
+    for start, end in gaps:
+        first = -(-start // 60) * 60
+        buckets.extend(range(first, end, 60))
+    return buckets
+
+
+def bucket_chart_points(
+    points: Iterable[tuple[int, Decimal]], *, wanted: Iterable[int]
+) -> list[tuple[int, Decimal]]:
+    # The last point inside a minute stands for that bucket, which matches
+    # what live ingest would have stored during it.
+    wanted_set = set(wanted)
+    by_bucket: dict[int, tuple[int, Decimal]] = {}
+    for timestamp_ms, price in points:
+        bucket = compute_minute_bucket(timestamp_ms // 1000)
+        if bucket not in wanted_set:
+            continue
+        current = by_bucket.get(bucket)
+        if current is None or timestamp_ms >= current[0]:
+            by_bucket[bucket] = (timestamp_ms, price)
+    return [(bucket, by_bucket[bucket][1]) for bucket in sorted(by_bucket)]
+
+
+async def _as_rows(
+    ticker: str, points: Iterable[tuple[int, Decimal]]
+) -> AsyncIterator[tuple[str, int, Decimal]]:
+    for ts_unix, price in points:
+        yield ticker, ts_unix, price
+
+
+@dataclass(frozen=True)
+class BackfillResult:
+    from_ts: int
+    to_ts: int
+    missing: Mapping[str, int]
+    filled: Mapping[str, int]
+    failed: Sequence[str] = ()
+
+
+class BackfillService:
+    _backfill_lock_key: int = 640_003
+
+    def __init__(self, *, database: Database, deribit: DeribitClient) -> None:
+        self._database = database
+        self._deribit = deribit
+
+    async def backfill(
+        self,
+        *,
+        tickers: Sequence[str] | None = None,
+        from_ts: int | None = None,
+        to_ts: int | None = None,
+        chunk_size: int | None = None,
+        concurrency: int | None = None,
+    ) -> BackfillResult | None:
+        settings = get_settings()
+        now_ts = int(time.time())
+        # The bucket being written right now belongs to live ingest.
+        to_ts = compute_minute_bucket(
+            to_ts if to_ts is not None else compute_minute_bucket(now_ts) - 60
+        )
+        if from_ts is None:
+            from_ts = to_ts - settings.backfill_lookback_days * 86_400
+        from_ts = -(-from_ts // 60) * 60
+        chunk_size = chunk_size or settings.backfill_chunk_size
+        semaphore = asyncio.Semaphore(concurrency or settings.backfill_concurrency)
+
+        async with self._database.engine.connect() as connection:
+            locked = await try_advisory_lock(connection, key=self._backfill_lock_key)
+            if not locked:
+                ADVISORY_LOCK_SKIPS.labels(lock="backfill").inc()
+                return None
+
+            try:
+                if tickers is None:
+                    async with self._database.sessionmaker() as session:
+                        tickers = await TickerRepository(session).list_ingested()
+
+                async def _run(ticker: str) -> tuple[int, int] | None:
+                    async with semaphore:
+                        try:
+                            return await self._backfill_ticker(
+                                ticker,
+                                from_ts=from_ts,
+                                to_ts=to_ts,
+                                now_ts=now_ts,
+                                chunk_size=chunk_size,
+                            )
+                        except DeribitError:
+                            logger.warning(
+                                "backfill of %s failed", ticker, exc_info=True
+                            )
+                            return None
+
+                outcomes = await asyncio.gather(*(_run(ticker) for ticker in tickers))
+            finally:
+                await release_advisory_lock(connection, key=self._backfill_lock_key)
+
+        missing: dict[str, int] = {}
+        filled: dict[str, int] = {}
+        failed: list[str] = []
+        for ticker, outcome in zip(tickers, outcomes, strict=True):
+            if outcome is None:
+                failed.append(ticker)
+            else:
+                missing[ticker], filled[ticker] = outcome
+
+        return BackfillResult(
+            from_ts=from_ts,
+            to_ts=to_ts,
+            missing=missing,
+            filled=filled,
+            failed=failed,
+        )
+
+    async def _backfill_ticker(
+        self,
+        ticker: str,
+        *,
+        from_ts: int,
+        to_ts: int,
+        now_ts: int,
+        chunk_size: int,
+    ) -> tuple[int, int]:
+        # Gaps are recomputed from the table on every run, so a run that dies
+        # half way simply resumes from the chunks it did not commit.
+        async with self._database.sessionmaker() as session:
+            repo = PricePointRepository(session)
+            # History from before the ticker's first point is not a gap.
+            first_ts = await repo.get_first_ts(ticker=ticker)
+            if first_ts is None or first_ts > to_ts:
+                return 0, 0
+            gaps = await repo.find_gaps(
+                ticker=ticker, from_ts=max(from_ts, first_ts), to_ts=to_ts
+            )
+        wanted = missing_buckets(gaps)
+        if not wanted:
+            return 0, 0
+
+        groups = chart_range_groups(wanted, now_ts=now_ts)
+        points: list[tuple[int, Decimal]] = []
+        for range_name, buckets in groups.items():
+            chart = await self._deribit.get_index_chart_data(
+                ticker, range_name=range_name
+            )
+            points.extend(bucket_chart_points(chart, wanted=buckets))
+        points.sort()
+
+        filled = 0
+        for start in range(0, len(points), chunk_size):
+            rows = _as_rows(ticker, points[start : start + chunk_size])
+            async with self._database.sessionmaker() as session:
+                # DO NOTHING: a bucket live ingest wrote meanwhile is kept.
+                filled += await PricePointRepository(session).bulk_load(
+                    rows, overwrite=False
+                )
+                await session.commit()
+
+        if filled < len(wanted):
+            logger.info(
+                "backfill of %s left %d of %d buckets empty (ranges %s)",
+                ticker,
+                len(wanted) - filled,
+                len(wanted),
+                ",".join(groups) or "none within reach",
+            )
+        return len(wanted), filled
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import importlib.util
+from collections.abc import AsyncIterator, Sequence
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import TYPE_CHECKING, Literal
+
+from sqlalchemy import Row
+
+if TYPE_CHECKING:
+    import numpy as np
+
+DownsampleMethod = Literal["lttb", "minmax"]
+
+
+@dataclass(frozen=True)
+class ChartPoint:
+    ts_unix: int
+    price: Decimal
+
+
+def lttb_available() -> bool:
+    return importlib.util.find_spec("numpy") is not None
+
+
+def min_max_interval(*, from_ts: int, to_ts: int, points: int) -> int:
+    # Every bucket yields up to two points (its low and its high).
+    buckets = max(points // 2, 1)
+    width = -(-(to_ts - from_ts + 1) // buckets)
+    return max(-(-width // 60) * 60, 60)
+
+
+def min_max_points(rows: Sequence[Row]) -> list[ChartPoint]:
+    points: list[ChartPoint] = []
+    for row in rows:
+        low = ChartPoint(ts_unix=row.low_ts, price=row.low)
+        high = ChartPoint(ts_unix=row.high_ts, price=row.high)
+        if low.ts_unix == high.ts_unix:
+            points.append(low)
+        elif low.ts_unix < high.ts_unix:
+            points.extend((low, high))
+        else:
+            points.extend((high, low))
+    return points
+
+
+async def collect_series(
+    chunks: AsyncIterator[Sequence[Row]],
+) -> tuple[np.ndarray, np.ndarray]:
+    import numpy as np
+
+    # Only two flat arrays are kept while the range streams in; exact
+    # prices are re-read for the handful of points that get selected.
+    ts_parts: list[np.ndarray] = []
+    price_parts: list[np.ndarray] = []
+    async for rows in chunks:
+        ts_parts.append(
+            np.fromiter((row.ts_unix for row in rows), dtype=np.int64, count=len(rows))
+        )
+        price_parts.append(
+            np.fromiter((row.price for row in rows), dtype=np.float64, count=len(rows))
+        )
+
+    if not ts_parts:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+    return np.concatenate(ts_parts), np.concatenate(price_parts)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    import numpy as np
+
+    size = len(x)
+    if threshold >= size or threshold < 3:
+        return np.arange(size)
+
+    # Largest-Triangle-Three-Buckets: keep both ends, then from each bucket
+    # the point forming the largest triangle with the previous pick and the
+    # next bucket's average. Areas within a bucket are computed at once.
+    x = (x - x[0]).astype(np.float64)
+    edges = np.linspace(1, size - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = size - 1
+
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < len(edges):
+            next_x = x[end : edges[bucket + 2]].mean()
+            next_y = y[end : edges[bucket + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+
+        areas = np.abs(
+            (x[previous] - next_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (next_y - y[previous])
+        )
+        previous = int(start + np.argmax(areas))
+        selected[bucket + 1] = previous
+
+    return selected
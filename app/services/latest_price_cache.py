@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
+
+import asyncpg
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from starlette.requests import Request
+
+from app.db.notify import LATE_WRITE_CHANNEL, LATEST_PRICE_CHANNEL
+from app.db.repository import PricePointRepository, TickerRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CachedPrice:
+    ticker: str
+    ts_unix: int
+    price: Decimal
+    cached_at: float
+
+
+class LatestPriceCache:
+    def __init__(
+        self,
+        *,
+        max_age_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_age_seconds = max_age_seconds
+        self._clock = clock
+        self._entries: dict[str, CachedPrice] = {}
+        self._late_writes: dict[str, int] = {}
+        # Unknown until the listener has loaded them: a late write missed
+        # while disconnected must not leave old validators standing.
+        self._late_writes_known = False
+
+    def get(self, ticker: str) -> CachedPrice | None:
+        if self._max_age_seconds <= 0:
+            return None
+        entry = self._entries.get(ticker)
+        if entry is None:
+            return None
+        if self._clock() - entry.cached_at > self._max_age_seconds:
+            return None
+        return entry
+
+    def put(self, *, ticker: str, ts_unix: int, price: Decimal) -> None:
+        current = self._entries.get(ticker)
+        if current is not None and current.ts_unix > ts_unix:
+            return
+        self._entries[ticker] = CachedPrice(
+            ticker=ticker, ts_unix=ts_unix, price=price, cached_at=self._clock()
+        )
+
+    def late_write_ts(self, ticker: str) -> int | None:
+        if not self._late_writes_known:
+            return None
+        return self._late_writes.get(ticker, 0)
+
+    def load_late_writes(self, late_writes: Mapping[str, int]) -> None:
+        # Merged, not replaced: notifications that arrived while the stamps
+        # were being read may be newer than what was read.
+        for ticker, late_write_ts in late_writes.items():
+            self._record_late_write(ticker, late_write_ts)
+        self._late_writes_known = True
+
+    def forget_late_writes(self) -> None:
+        self._late_writes.clear()
+        self._late_writes_known = False
+
+    def handle_late_write(self, payload: str) -> None:
+        try:
+            data = json.loads(payload)
+            ticker = str(data["ticker"])
+            late_write_ts = int(data["late_write_ts"])
+        except (ValueError, KeyError, TypeError):
+            logger.warning("ignoring malformed late-write notification: %r", payload)
+            return
+        self._record_late_write(ticker, late_write_ts)
+
+    def _record_late_write(self, ticker: str, late_write_ts: int) -> None:
+        self._late_writes[ticker] = max(self._late_writes.get(ticker, 0), late_write_ts)
+
+    def handle_notification(self, payload: str) -> None:
+        try:
+            data = json.loads(payload)
+            self.put(
+                ticker=str(data["ticker"]),
+                ts_unix=int(data["ts_unix"]),
+                price=Decimal(str(data["price"])),
+            )
+        except (ValueError, KeyError, TypeError, InvalidOperation):
+            logger.warning("ignoring malformed latest-price notification: %r", payload)
+
+
+class LatestPriceListener:
+    _reconnect_initial_seconds: float = 1.0
+    _reconnect_max_seconds: float = 30.0
+    _keepalive_seconds: float = 30.0
+
+    def __init__(
+        self,
+        cache: LatestPriceCache,
+        *,
+        database_url: str,
+        sessionmaker: async_sessionmaker[AsyncSession],
+    ) -> None:
+        self._cache = cache
+        # asyncpg wants a plain libpq DSN, not the SQLAlchemy driver URL.
+        self._dsn = (
+            make_url(database_url)
+            .set(drivername="postgresql")
+            .render_as_string(hide_password=False)
+        )
+        self._sessionmaker = sessionmaker
+
+    async def run(self) -> None:
+        delay = self._reconnect_initial_seconds
+        while True:
+            try:
+                await self._listen_once()
+                delay = self._reconnect_initial_seconds
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning(
+                    "latest-price listener failed; retrying in %.0fs",
+                    delay,
+                    exc_info=True,
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self._reconnect_max_seconds)
+
+    async def prime(self) -> None:
+        async with self._sessionmaker() as session:
+            points = await PricePointRepository(session).get_latest_all()
+            late_writes = await TickerRepository(session).list_late_writes()
+        for point in points:
+            self._cache.put(
+                ticker=point.ticker, ts_unix=point.ts_unix, price=point.price
+            )
+        self._cache.load_late_writes(late_writes)
+
+    async def _listen_once(self) -> None:
+        connection = await asyncpg.connect(self._dsn)
+        closed = asyncio.Event()
+        connection.add_termination_listener(lambda _conn: closed.set())
+
+        def _on_notify(_conn: object, _pid: int, _channel: str, payload: str) -> None:
+            self._cache.handle_notification(payload)
+
+        def _on_late_write(
+            _conn: object, _pid: int, _channel: str, payload: str
+        ) -> None:
+            self._cache.handle_late_write(payload)
+
+        try:
+            await connection.add_listener(LATEST_PRICE_CHANNEL, _on_notify)
+            await connection.add_listener(LATE_WRITE_CHANNEL, _on_late_write)
+            # Prime only after LISTEN is active so no update can slip between.
+            await self.prime()
+            while not closed.is_set():
+                try:
+                    await asyncio.wait_for(closed.wait(), self._keepalive_seconds)
+                except TimeoutError:
+                    # Surfaces half-open connections that never report termination.
+                    await connection.execute("SELECT 1")
+        finally:
+            self._cache.forget_late_writes()
+            if not connection.is_closed():
+                await connection.close()
+
+
+def get_latest_price_cache(request: Request) -> LatestPriceCache:
+    return request.app.state.latest_price_cache
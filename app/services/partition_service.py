@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import get_settings
+from app.core.metrics import ADVISORY_LOCK_SKIPS
+from app.db.locks import release_advisory_lock, try_advisory_lock
+from app.db.partitions import (
+    MonthPartition,
+    create_partition,
+    drop_partition,
+    list_partitions,
+)
+from app.db.rollups import drop_rollups
+from app.db.session import Database, create_engine
+
+
+@dataclass(frozen=True)
+class PartitionMaintenanceResult:
+    created: Sequence[str]
+    dropped: Sequence[str]
+
+
+class PartitionService:
+    _maintenance_lock_key: int = 640_002
+
+    def __init__(self, *, database: Database | None = None) -> None:
+        self._database = database
+
+    async def maintain_partitions(
+        self, *, now_ts: int | None = None
+    ) -> PartitionMaintenanceResult | None:
+        if self._database is not None:
+            return await self._maintain(self._database.engine, now_ts=now_ts)
+
+        engine = create_engine()
+        try:
+            return await self._maintain(engine, now_ts=now_ts)
+        finally:
+            await engine.dispose()
+
+    async def _maintain(
+        self, engine: AsyncEngine, *, now_ts: int | None
+    ) -> PartitionMaintenanceResult | None:
+        settings = get_settings()
+        current = MonthPartition.containing(int(now_ts or time.time()))
+        wanted = [
+            current.shift(offset)
+            for offset in range(settings.price_points_partition_months_ahead + 1)
+        ]
+
+        created: list[str] = []
+        dropped: list[str] = []
+
+        async with engine.connect() as connection:
+            locked = await try_advisory_lock(connection, key=self._maintenance_lock_key)
+            if not locked:
+                ADVISORY_LOCK_SKIPS.labels(lock="partitions").inc()
+                return None
+
+            try:
+                existing = set(await list_partitions(connection))
+                for partition in wanted:
+                    if partition not in existing:
+                        await create_partition(connection, partition)
+                        created.append(partition.name)
+
+                if settings.price_points_retention_months > 0:
+                    oldest_kept = current.shift(-settings.price_points_retention_months)
+                    for partition in sorted(existing):
+                        if partition < oldest_kept:
+                            await drop_partition(connection, partition)
+                            await drop_rollups(
+                                connection,
+                                from_ts=partition.start_ts,
+                                to_ts=partition.end_ts,
+                            )
+                            dropped.append(partition.name)
+
+                await connection.commit()
+            finally:
+                await release_advisory_lock(connection, key=self._maintenance_lock_key)
+
+        return PartitionMaintenanceResult(created=created, dropped=dropped)
@@ -1,18 +1,48 @@
 from __future__ import annotations
 
+import asyncio
+import logging
 import time
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Sequence
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
+from decimal import Decimal
+from typing import Literal
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 
+from app.core.config import get_settings
+from app.core.metrics import ADVISORY_LOCK_SKIPS, INGEST_LAG_SECONDS
 from app.db.locks import release_advisory_lock, try_advisory_lock
-from app.db.models import PricePoint
-from app.db.repository import PricePointRepository
-from app.db.session import create_engine, create_sessionmaker
+from app.db.notify import notify_latest_prices
+from app.db.repository import (
+    PricePointRepository,
+    TickerRepository,
+    series_bounds,
+)
+from app.db.session import Database, create_engine, create_sessionmaker
 from app.deribit.client import DeribitClient
+from app.deribit.errors import DeribitError
+from app.services.downsample import (
+    ChartPoint,
+    DownsampleMethod,
+    collect_series,
+    lttb_indices,
+    min_max_interval,
+    min_max_points,
+)
 
-SUPPORTED_TICKERS: tuple[str, ...] = ("btc_usd", "eth_usd")
+logger = logging.getLogger(__name__)
+
+# Seed for the API's ticker registry until it has loaded the tickers table.
+DEFAULT_TICKERS: tuple[str, ...] = ("btc_usd", "eth_usd")
+
+CountMode = Literal["exact", "estimated", "none"]
+FillMode = Literal["none", "previous", "null"]
+
+# Time left at the end of the minute for the bucket write itself.
+_INGEST_WRITE_MARGIN_SECONDS = 5.0
 
 
 def compute_minute_bucket(now_ts: int | None = None) -> int:
@@ -20,50 +50,180 @@ def compute_minute_bucket(now_ts: int | None = None) -> int:
     return (ts // 60) * 60
 
 
+async def fetch_index_prices(
+    deribit: DeribitClient,
+    tickers: Sequence[str],
+    *,
+    concurrency: int,
+    batch_size: int | None = None,
+    spread_seconds: float = 0.0,
+    deadline: float | None = None,
+) -> tuple[dict[str, Decimal], list[str]]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _fetch(ticker: str) -> Decimal | None:
+        async with semaphore:
+            try:
+                return await deribit.get_index_price(ticker, deadline=deadline)
+            except DeribitError:
+                # One bad ticker must not cost the rest of the bucket.
+                logger.warning("failed to fetch %s index price", ticker, exc_info=True)
+                return None
+
+    size = batch_size or len(tickers) or 1
+    batches = [tickers[i : i + size] for i in range(0, len(tickers), size)]
+
+    async def _fetch_batch(index: int, batch: Sequence[str]) -> list[Decimal | None]:
+        # Batch starts are spread evenly over the window instead of bursting
+        # every request at the top of the minute.
+        if index and spread_seconds > 0:
+            await asyncio.sleep(spread_seconds * index / len(batches))
+        return await asyncio.gather(*(_fetch(ticker) for ticker in batch))
+
+    batch_results = await asyncio.gather(
+        *(_fetch_batch(index, batch) for index, batch in enumerate(batches))
+    )
+
+    prices: dict[str, Decimal] = {}
+    failed: list[str] = []
+    for batch, results in zip(batches, batch_results, strict=True):
+        for ticker, price in zip(batch, results, strict=True):
+            if price is None:
+                failed.append(ticker)
+            else:
+                prices[ticker] = price
+    return prices, failed
+
+
 @dataclass(frozen=True)
 class IngestResult:
     ts_unix: int
     tickers: Sequence[str]
+    failed: Sequence[str] = ()
+
+
+@dataclass(frozen=True)
+class PricePage:
+    rows: Sequence[Row]
+    count: int | None
+
+
+@dataclass(frozen=True)
+class PriceGap:
+    from_ts: int
+    to_ts: int
+    missing: int
+
+
+@dataclass(frozen=True)
+class PriceStats:
+    open: Decimal | None
+    high: Decimal | None
+    low: Decimal | None
+    close: Decimal | None
+    count: int
+    mean: Decimal | None
+
+
+@dataclass(frozen=True)
+class CandlePage:
+    rows: Sequence[Row]
+    count: int | None
 
 
 class PriceService:
     _ingest_lock_key: int = 640_001
 
+    def __init__(
+        self,
+        *,
+        database: Database | None = None,
+        deribit: DeribitClient | None = None,
+    ) -> None:
+        self._database = database
+        self._deribit = deribit
+
     async def poll_and_store_prices(self) -> IngestResult | None:
-        ts_unix = compute_minute_bucket()
+        if self._database is not None:
+            return await self._poll_and_store(
+                self._database.engine, self._database.sessionmaker
+            )
 
         engine = create_engine()
-        session_factory = create_sessionmaker(engine)
+        try:
+            return await self._poll_and_store(engine, create_sessionmaker(engine))
+        finally:
+            await engine.dispose()
+
+    async def _poll_and_store(
+        self,
+        engine: AsyncEngine,
+        session_factory: async_sessionmaker[AsyncSession],
+    ) -> IngestResult | None:
+        ts_unix = compute_minute_bucket()
+        settings = get_settings()
+        # Retries stop in time for this minute's bucket to still be written,
+        # and a late start squeezes the batch spread to fit what is left.
+        remaining = max(ts_unix + 60 - time.time() - _INGEST_WRITE_MARGIN_SECONDS, 0.0)
+        deadline = time.monotonic() + remaining
+        spread_seconds = min(settings.ingest_spread_seconds, remaining / 2)
 
         async with engine.connect() as connection:
             locked = await try_advisory_lock(connection, key=self._ingest_lock_key)
             if not locked:
-                await engine.dispose()
+                ADVISORY_LOCK_SKIPS.labels(lock="ingest").inc()
                 return None
 
             try:
                 async with session_factory(bind=connection) as session:
-                    repo = PricePointRepository(session)
+                    tickers = await TickerRepository(session).list_ingested()
 
-                    async with DeribitClient() as deribit:
-                        for ticker in SUPPORTED_TICKERS:
-                            price = await deribit.get_index_price(ticker)
-                            await repo.upsert_price_point(
-                                ticker=ticker, ts_unix=ts_unix, price=price
-                            )
+                async with self._deribit_client() as deribit:
+                    prices, failed = await fetch_index_prices(
+                        deribit,
+                        tickers,
+                        concurrency=settings.ingest_fetch_concurrency,
+                        batch_size=settings.ingest_batch_size,
+                        spread_seconds=spread_seconds,
+                        deadline=deadline,
+                    )
 
+                async with session_factory(bind=connection) as session:
+                    repo = PricePointRepository(session)
+                    await repo.upsert_price_points(ts_unix=ts_unix, prices=prices)
+                    await notify_latest_prices(session, ts_unix=ts_unix, prices=prices)
                     await session.commit()
+                INGEST_LAG_SECONDS.observe(time.time() - ts_unix)
             finally:
                 await release_advisory_lock(connection, key=self._ingest_lock_key)
-                await engine.dispose()
 
-        return IngestResult(ts_unix=ts_unix, tickers=SUPPORTED_TICKERS)
+        return IngestResult(ts_unix=ts_unix, tickers=list(prices), failed=failed)
+
+    @asynccontextmanager
+    async def _deribit_client(self) -> AsyncIterator[DeribitClient]:
+        # A shared client stays open for the next run; a private one closes.
+        if self._deribit is not None:
+            yield self._deribit
+            return
+        async with DeribitClient() as deribit:
+            yield deribit
 
     async def list_prices(
-        self, *, session: AsyncSession, ticker: str, limit: int, offset: int
-    ) -> Sequence[PricePoint]:
+        self,
+        *,
+        session: AsyncSession,
+        ticker: str,
+        limit: int,
+        offset: int,
+        after_ts: int | None = None,
+        before_ts: int | None = None,
+    ) -> Sequence[Row]:
         return await PricePointRepository(session).list_price_points(
-            ticker=ticker, limit=limit, offset=offset
+            ticker=ticker,
+            limit=limit,
+            offset=offset,
+            after_ts=after_ts,
+            before_ts=before_ts,
         )
 
     async def count_prices(
@@ -78,9 +238,7 @@ class PriceService:
             ticker=ticker, from_ts=from_ts, to_ts=to_ts
         )
 
-    async def latest_price(
-        self, *, session: AsyncSession, ticker: str
-    ) -> PricePoint | None:
+    async def latest_price(self, *, session: AsyncSession, ticker: str) -> Row | None:
         return await PricePointRepository(session).get_latest(ticker=ticker)
 
     async def list_range(
@@ -92,11 +250,231 @@ class PriceService:
         to_ts: int | None,
         limit: int,
         offset: int,
-    ) -> Sequence[PricePoint]:
+        after_ts: int | None = None,
+        before_ts: int | None = None,
+    ) -> Sequence[Row]:
         return await PricePointRepository(session).list_range(
             ticker=ticker,
             from_ts=from_ts,
             to_ts=to_ts,
             limit=limit,
             offset=offset,
+            after_ts=after_ts,
+            before_ts=before_ts,
+        )
+
+    def stream_prices(
+        self,
+        *,
+        session: AsyncSession,
+        ticker: str,
+        from_ts: int | None,
+        to_ts: int | None,
+        chunk_size: int,
+    ) -> AsyncIterator[Sequence[Row]]:
+        return PricePointRepository(session).stream_range(
+            ticker=ticker, from_ts=from_ts, to_ts=to_ts, chunk_size=chunk_size
+        )
+
+    async def page_prices(
+        self,
+        *,
+        session: AsyncSession,
+        ticker: str,
+        limit: int,
+        offset: int,
+        from_ts: int | None = None,
+        to_ts: int | None = None,
+        after_ts: int | None = None,
+        before_ts: int | None = None,
+        count_mode: CountMode = "exact",
+    ) -> PricePage:
+        repo = PricePointRepository(session)
+
+        if count_mode == "exact":
+            rows, count = await repo.list_range_with_count(
+                ticker=ticker,
+                from_ts=from_ts,
+                to_ts=to_ts,
+                limit=limit,
+                offset=offset,
+                after_ts=after_ts,
+                before_ts=before_ts,
+            )
+            return PricePage(rows=rows, count=count)
+
+        rows = await repo.list_range(
+            ticker=ticker,
+            from_ts=from_ts,
+            to_ts=to_ts,
+            limit=limit,
+            offset=offset,
+            after_ts=after_ts,
+            before_ts=before_ts,
+        )
+        if count_mode == "none":
+            return PricePage(rows=rows, count=None)
+
+        count = await repo.estimate_price_points(
+            ticker=ticker, from_ts=from_ts, to_ts=to_ts
+        )
+        return PricePage(rows=rows, count=count)
+
+    async def page_filled_prices(
+        self,
+        *,
+        session: AsyncSession,
+        ticker: str,
+        from_ts: int,
+        to_ts: int,
+        fill: Literal["previous", "null"],
+        limit: int,
+        offset: int,
+        after_ts: int | None = None,
+        before_ts: int | None = None,
+        count_mode: CountMode = "exact",
+    ) -> PricePage:
+        rows = await PricePointRepository(session).list_filled_range(
+            ticker=ticker,
+            from_ts=from_ts,
+            to_ts=to_ts,
+            fill=fill,
+            limit=limit,
+            offset=offset,
+            after_ts=after_ts,
+            before_ts=before_ts,
+        )
+        if count_mode == "none":
+            return PricePage(rows=rows, count=None)
+
+        # A dense series has one row per minute, so its size is exact for free.
+        first, last = series_bounds(from_ts=from_ts, to_ts=to_ts)
+        return PricePage(rows=rows, count=max((last - first) // 60 + 1, 0))
+
+    async def list_gaps(
+        self,
+        *,
+        session: AsyncSession,
+        ticker: str,
+        from_ts: int,
+        to_ts: int,
+        limit: int,
+        offset: int,
+    ) -> Sequence[PriceGap]:
+        first, last = series_bounds(from_ts=from_ts, to_ts=to_ts)
+        spans = await PricePointRepository(session).find_gaps(
+            ticker=ticker, from_ts=first, to_ts=last, limit=limit, offset=offset
+        )
+
+        gaps: list[PriceGap] = []
+        for start, end in spans:
+            # Spans are [start, end); report the missing minute buckets in them.
+            gap_first = -(-start // 60) * 60
+            missing = len(range(gap_first, end, 60))
+            if missing:
+                gaps.append(
+                    PriceGap(
+                        from_ts=gap_first,
+                        to_ts=gap_first + (missing - 1) * 60,
+                        missing=missing,
+                    )
+                )
+        return gaps
+
+    async def price_stats(
+        self,
+        *,
+        session: AsyncSession,
+        ticker: str,
+        from_ts: int | None,
+        to_ts: int | None,
+    ) -> PriceStats:
+        row = await PricePointRepository(session).get_stats(
+            ticker=ticker, from_ts=from_ts, to_ts=to_ts
+        )
+        count = int(row.count)
+        return PriceStats(
+            open=row.open,
+            high=row.high,
+            low=row.low,
+            close=row.close,
+            count=count,
+            mean=row.price_sum / count if count else None,
+        )
+
+    async def downsample(
+        self,
+        *,
+        session: AsyncSession,
+        ticker: str,
+        from_ts: int,
+        to_ts: int,
+        points: int,
+        method: DownsampleMethod,
+        chunk_size: int,
+    ) -> Sequence[Row | ChartPoint]:
+        repo = PricePointRepository(session)
+        if method == "minmax":
+            rows = await repo.list_min_max(
+                ticker=ticker,
+                from_ts=from_ts,
+                to_ts=to_ts,
+                interval=min_max_interval(from_ts=from_ts, to_ts=to_ts, points=points),
+            )
+            return min_max_points(rows)
+
+        ts_unix, prices = await collect_series(
+            repo.stream_range(
+                ticker=ticker, from_ts=from_ts, to_ts=to_ts, chunk_size=chunk_size
+            )
+        )
+        selected = ts_unix[lttb_indices(ts_unix, prices, points)]
+        return await repo.list_points_at(ticker=ticker, timestamps=selected.tolist())
+
+    async def page_ohlc(
+        self,
+        *,
+        session: AsyncSession,
+        ticker: str,
+        interval: int,
+        limit: int,
+        offset: int,
+        from_ts: int | None = None,
+        to_ts: int | None = None,
+        after_ts: int | None = None,
+        before_ts: int | None = None,
+        count_mode: CountMode = "exact",
+    ) -> CandlePage:
+        repo = PricePointRepository(session)
+
+        if count_mode == "exact":
+            rows, count = await repo.list_ohlc_with_count(
+                ticker=ticker,
+                interval=interval,
+                from_ts=from_ts,
+                to_ts=to_ts,
+                limit=limit,
+                offset=offset,
+                after_ts=after_ts,
+                before_ts=before_ts,
+            )
+            return CandlePage(rows=rows, count=count)
+
+        rows = await repo.list_ohlc(
+            ticker=ticker,
+            interval=interval,
+            from_ts=from_ts,
+            to_ts=to_ts,
+            limit=limit,
+            offset=offset,
+            after_ts=after_ts,
+            before_ts=before_ts,
+        )
+        if count_mode == "none":
+            return CandlePage(rows=rows, count=None)
+
+        # One stored point per minute, so buckets ~= points * 60 / interval.
+        points = await repo.estimate_price_points(
+            ticker=ticker, from_ts=from_ts, to_ts=to_ts
         )
+        return CandlePage(rows=rows, count=-(-points * 60 // interval))
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import get_settings
+from app.core.metrics import ADVISORY_LOCK_SKIPS
+from app.db.locks import release_advisory_lock, try_advisory_lock
+from app.db.rollups import fold_dirty_hours
+from app.db.session import Database, create_engine
+
+
+@dataclass(frozen=True)
+class RollupRefreshResult:
+    hours: int
+    batches: int
+
+
+class RollupService:
+    _rollup_lock_key: int = 640_004
+
+    def __init__(self, *, database: Database | None = None) -> None:
+        self._database = database
+
+    async def refresh_rollups(
+        self, *, batch_size: int | None = None
+    ) -> RollupRefreshResult | None:
+        if self._database is not None:
+            return await self._refresh(self._database.engine, batch_size=batch_size)
+
+        engine = create_engine()
+        try:
+            return await self._refresh(engine, batch_size=batch_size)
+        finally:
+            await engine.dispose()
+
+    async def _refresh(
+        self, engine: AsyncEngine, *, batch_size: int | None
+    ) -> RollupRefreshResult | None:
+        batch_size = batch_size or get_settings().rollup_batch_size
+        hours = 0
+        batches = 0
+
+        async with engine.connect() as connection:
+            locked = await try_advisory_lock(connection, key=self._rollup_lock_key)
+            if not locked:
+                ADVISORY_LOCK_SKIPS.labels(lock="rollups").inc()
+                return None
+
+            try:
+                # Each batch commits on its own (the advisory lock is held by
+                # the session, not the transaction), so a backlog such as the
+                # history queued by the migration drains in bounded
+                # transactions and a crash only repeats the batch in flight.
+                while True:
+                    folded = await fold_dirty_hours(connection, limit=batch_size)
+                    await connection.commit()
+                    if not folded:
+                        break
+                    hours += folded
+                    batches += 1
+                    if folded < batch_size:
+                        break
+            finally:
+                await release_advisory_lock(connection, key=self._rollup_lock_key)
+
+        return RollupRefreshResult(hours=hours, batches=batches)
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Mapping
+from decimal import Decimal
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.db.notify import notify_latest_prices
+from app.db.repository import PricePointRepository
+from app.db.session import Database
+from app.deribit.stream import DeribitPriceStream, IndexPriceTick
+
+logger = logging.getLogger(__name__)
+
+
+class BucketAggregator:
+    def __init__(self, *, bucket_seconds: int) -> None:
+        self._bucket_seconds = bucket_seconds
+        self._open: dict[int, dict[str, Decimal]] = {}
+
+    def add(self, tick: IndexPriceTick) -> list[tuple[int, dict[str, Decimal]]]:
+        bucket = tick.timestamp_ms // 1000 // self._bucket_seconds
+        bucket *= self._bucket_seconds
+        # Each bucket keeps the last price seen for every ticker in it.
+        self._open.setdefault(bucket, {})[tick.index_name] = tick.price
+
+        # A tick for a newer bucket closes every older one. A straggler for a
+        # closed bucket reopens it and is simply upserted again later.
+        closed = sorted(b for b in self._open if b < bucket)
+        return [(b, self._open.pop(b)) for b in closed]
+
+    def drain(self) -> list[tuple[int, dict[str, Decimal]]]:
+        buckets = sorted(self._open.items())
+        self._open.clear()
+        return buckets
+
+
+class StreamIngestService:
+    def __init__(
+        self,
+        *,
+        database: Database,
+        stream: DeribitPriceStream,
+        bucket_seconds: int,
+    ) -> None:
+        self._database = database
+        self._stream = stream
+        self._bucket_seconds = bucket_seconds
+
+    async def run(self) -> None:
+        aggregator = BucketAggregator(bucket_seconds=self._bucket_seconds)
+        try:
+            async for tick in self._stream.ticks():
+                for ts_unix, prices in aggregator.add(tick):
+                    await self._write(ts_unix=ts_unix, prices=prices)
+        finally:
+            for ts_unix, prices in aggregator.drain():
+                await self._write(ts_unix=ts_unix, prices=prices)
+
+    async def _write(self, *, ts_unix: int, prices: Mapping[str, Decimal]) -> None:
+        try:
+            async with self._database.sessionmaker() as session:
+                repo = PricePointRepository(session)
+                await repo.upsert_price_points(ts_unix=ts_unix, prices=prices)
+                await notify_latest_prices(session, ts_unix=ts_unix, prices=prices)
+                await session.commit()
+        except (SQLAlchemyError, OSError):
+            # Keep the subscription alive through a database blip; the bucket
+            # is lost but the next one is written normally.
+            logger.exception("failed to store streamed bucket %s", ts_unix)
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from starlette.requests import Request
+
+from app.db.repository import TickerRepository
+from app.db.session import Database
+from app.deribit.client import DeribitClient
+
+logger = logging.getLogger(__name__)
+
+
+class TickerRegistry:
+    def __init__(self, tickers: Iterable[str] = ()) -> None:
+        self._tickers = frozenset(tickers)
+
+    def __contains__(self, ticker: object) -> bool:
+        return ticker in self._tickers
+
+    def __len__(self) -> int:
+        return len(self._tickers)
+
+    def names(self) -> tuple[str, ...]:
+        return tuple(sorted(self._tickers))
+
+    def replace(self, tickers: Iterable[str]) -> None:
+        # Swapped wholesale, so readers never see a half-updated set.
+        self._tickers = frozenset(tickers)
+
+
+class TickerRegistryRefresher:
+    def __init__(
+        self,
+        registry: TickerRegistry,
+        *,
+        sessionmaker: async_sessionmaker[AsyncSession],
+        interval_seconds: float,
+    ) -> None:
+        self._registry = registry
+        self._sessionmaker = sessionmaker
+        self._interval_seconds = interval_seconds
+
+    async def refresh(self) -> None:
+        async with self._sessionmaker() as session:
+            tickers = await TickerRepository(session).list_enabled()
+        self._registry.replace(tickers)
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("ticker registry refresh failed", exc_info=True)
+            await asyncio.sleep(self._interval_seconds)
+
+
+@dataclass(frozen=True)
+class TickerSyncResult:
+    added: Sequence[str]
+    total: int
+
+
+class TickerRegistryService:
+    def __init__(self, *, database: Database, deribit: DeribitClient) -> None:
+        self._database = database
+        self._deribit = deribit
+
+    async def sync_from_deribit(self) -> TickerSyncResult:
+        names = await self._deribit.get_index_price_names()
+        async with self._database.sessionmaker() as session:
+            added = await TickerRepository(session).register(names)
+            await session.commit()
+        return TickerSyncResult(added=added, total=len(names))
+
+
+def get_ticker_registry(request: Request) -> TickerRegistry:
+    return request.app.state.ticker_registry
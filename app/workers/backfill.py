@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+from collections.abc import Sequence
+
+from app.core.logging import configure_logging
+from app.db.session import Database
+from app.deribit.client import DeribitClient
+from app.services.backfill_service import BackfillResult, BackfillService
+
+
+def _parse_args(argv: Sequence[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.workers.backfill",
+        description="Fill missing minute buckets in price_points from Deribit.",
+    )
+    parser.add_argument("--from-ts", type=int, help="window start (unix seconds)")
+    parser.add_argument("--to-ts", type=int, help="window end (unix seconds)")
+    parser.add_argument(
+        "--ticker",
+        action="append",
+        dest="tickers",
+        help="ticker to backfill; repeatable (default: all enabled tickers)",
+    )
+    parser.add_argument("--chunk-size", type=int, help="rows per committed chunk")
+    parser.add_argument("--concurrency", type=int, help="tickers run in parallel")
+    return parser.parse_args(argv)
+
+
+async def run_backfill(args: argparse.Namespace) -> BackfillResult | None:
+    database = Database.create()
+    try:
+        async with DeribitClient() as deribit:
+            return await BackfillService(database=database, deribit=deribit).backfill(
+                tickers=args.tickers,
+                from_ts=args.from_ts,
+                to_ts=args.to_ts,
+                chunk_size=args.chunk_size,
+                concurrency=args.concurrency,
+            )
+    finally:
+        await database.dispose()
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    configure_logging()
+    result = asyncio.run(run_backfill(_parse_args(argv)))
+    if result is None:
+        print(json.dumps({"skipped": True}))
+        return 1
+
+    print(
+        json.dumps(
+            {
+                "skipped": False,
+                "from_ts": result.from_ts,
+                "to_ts": result.to_ts,
+                "missing": dict(result.missing),
+                "filled": dict(result.filled),
+                "failed": list(result.failed),
+            }
+        )
+    )
+    return 1 if result.failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
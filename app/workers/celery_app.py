@@ -1,8 +1,18 @@
 from __future__ import annotations
 
+import os
+
 from celery import Celery
+from celery.signals import (
+    worker_init,
+    worker_process_init,
+    worker_process_shutdown,
+    worker_shutdown,
+)
 
 from app.core.config import get_settings
+from app.core.metrics import mark_process_dead, serve_metrics
+from app.workers.runtime import worker_runtime
 from app.workers.schedule import beat_schedule
 
 
@@ -30,3 +40,25 @@ def create_celery_app() -> Celery:
 
 
 celery_app = create_celery_app()
+
+
+@worker_init.connect
+def _start_metrics_server(**_kwargs: object) -> None:
+    # Runs in the parent only; prefork children write their samples to
+    # PROMETHEUS_MULTIPROC_DIR and this server sums them on each scrape.
+    port = get_settings().worker_metrics_port
+    if port:
+        serve_metrics(port)
+
+
+@worker_process_init.connect
+def _start_worker_runtime(**_kwargs: object) -> None:
+    # Each prefork child opens its own loop, pool and HTTP session.
+    worker_runtime.start()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def _stop_worker_runtime(**_kwargs: object) -> None:
+    worker_runtime.stop()
+    mark_process_dead(os.getpid())
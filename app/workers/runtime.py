@@ -1,11 +1,93 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import Coroutine
+import logging
+from collections.abc import Callable, Coroutine
+from dataclasses import dataclass
 from typing import Any, TypeVar
 
+from app.db.session import Database
+from app.deribit.client import DeribitClient
+
 T = TypeVar("T")
 
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class WorkerResources:
+    database: Database
+    deribit: DeribitClient
+
+
+class WorkerRuntime:
+    def __init__(self) -> None:
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._resources: WorkerResources | None = None
+
+    @property
+    def started(self) -> bool:
+        return self._loop is not None
+
+    def start(self) -> None:
+        self._ensure_started()
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        loop, _ = self._ensure_started()
+        return loop.run_until_complete(coro)
+
+    def run_with_resources(
+        self, task: Callable[[WorkerResources], Coroutine[Any, Any, T]]
+    ) -> T:
+        loop, resources = self._ensure_started()
+        return loop.run_until_complete(task(resources))
+
+    def stop(self) -> None:
+        loop = self._loop
+        if loop is None:
+            return
+        try:
+            if self._resources is not None:
+                loop.run_until_complete(self._close(self._resources))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            self._loop = None
+            self._resources = None
+            asyncio.set_event_loop(None)
+            loop.close()
+            logger.info("worker runtime stopped")
+
+    def _ensure_started(self) -> tuple[asyncio.AbstractEventLoop, WorkerResources]:
+        if self._loop is not None and self._resources is not None:
+            return self._loop, self._resources
+
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        resources = loop.run_until_complete(self._open())
+        self._loop, self._resources = loop, resources
+        logger.info("worker runtime started")
+        return loop, resources
+
+    async def _open(self) -> WorkerResources:
+        # Built inside the loop: the engine's pool and aiohttp's connector
+        # bind to whichever loop first uses them.
+        return WorkerResources(database=Database.create(), deribit=DeribitClient())
+
+    async def _close(self, resources: WorkerResources) -> None:
+        try:
+            await resources.deribit.close()
+        finally:
+            await resources.database.dispose()
+
+
+worker_runtime = WorkerRuntime()
+
 
 def run_async(coro: Coroutine[Any, Any, T]) -> T:
-    return asyncio.run(coro)
+    return worker_runtime.run(coro)
+
+
+def run_with_resources(
+    task: Callable[[WorkerResources], Coroutine[Any, Any, T]],
+) -> T:
+    return worker_runtime.run_with_resources(task)
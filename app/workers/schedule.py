@@ -7,5 +7,21 @@ beat_schedule = {
     "poll-deribit-index-prices-every-minute": {
         "task": "poll_deribit_index_prices",
         "schedule": crontab(minute="*"),
-    }
+    },
+    "refresh-ticker-registry-hourly": {
+        "task": "refresh_ticker_registry",
+        "schedule": crontab(minute=30),
+    },
+    "backfill-price-gaps-hourly": {
+        "task": "backfill_price_gaps",
+        "schedule": crontab(minute=15),
+    },
+    "refresh-price-rollups-every-5-minutes": {
+        "task": "refresh_price_rollups",
+        "schedule": crontab(minute="*/5"),
+    },
+    "maintain-price-point-partitions-daily": {
+        "task": "maintain_price_point_partitions",
+        "schedule": crontab(minute=5, hour=0),
+    },
 }
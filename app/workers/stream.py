@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import signal
+
+from app.core.config import get_settings
+from app.core.logging import configure_logging
+from app.db.repository import TickerRepository
+from app.db.session import Database
+from app.deribit.stream import DeribitPriceStream
+from app.services.stream_ingest import StreamIngestService
+
+
+async def run_stream_ingest() -> None:
+    settings = get_settings()
+    database = Database.create()
+    try:
+        # The subscription is fixed per connection; restart to pick up new
+        # tickers.
+        async with database.sessionmaker() as session:
+            tickers = await TickerRepository(session).list_ingested()
+        stream = DeribitPriceStream(tickers=tickers)
+
+        try:
+            await StreamIngestService(
+                database=database,
+                stream=stream,
+                bucket_seconds=settings.stream_bucket_seconds,
+            ).run()
+        finally:
+            await stream.close()
+    finally:
+        await database.dispose()
+
+
+async def _main() -> None:
+    task = asyncio.current_task()
+    if task is not None:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, task.cancel)
+
+    with contextlib.suppress(asyncio.CancelledError):
+        await run_stream_ingest()
+
+
+def main() -> None:
+    configure_logging()
+    asyncio.run(_main())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,29 @@
 from __future__ import annotations
 
+from app.core.config import get_settings
 from app.core.logging import configure_logging
+from app.services.backfill_service import BackfillService
+from app.services.partition_service import PartitionService
 from app.services.price_service import PriceService
+from app.services.rollup_service import RollupService
+from app.services.ticker_registry import TickerRegistryService
 from app.workers.celery_app import celery_app
-from app.workers.runtime import run_async
+from app.workers.runtime import run_with_resources
 
 configure_logging()
 
 
 @celery_app.task(name="poll_deribit_index_prices")
 def poll_deribit_index_prices() -> dict[str, object]:
-    service = PriceService()
-    result = run_async(service.poll_and_store_prices())
+    if get_settings().ingest_mode == "stream":
+        # The WebSocket ingest process owns price_points writes.
+        return {"skipped": True}
+
+    result = run_with_resources(
+        lambda resources: PriceService(
+            database=resources.database, deribit=resources.deribit
+        ).poll_and_store_prices()
+    )
 
     if result is None:
         return {"skipped": True}
@@ -20,4 +32,71 @@ def poll_deribit_index_prices() -> dict[str, object]:
         "skipped": False,
         "ts_unix": result.ts_unix,
         "tickers": list(result.tickers),
+        "failed": list(result.failed),
     }
+
+
+@celery_app.task(name="maintain_price_point_partitions")
+def maintain_price_point_partitions() -> dict[str, object]:
+    result = run_with_resources(
+        lambda resources: PartitionService(
+            database=resources.database
+        ).maintain_partitions()
+    )
+
+    if result is None:
+        return {"skipped": True}
+
+    return {
+        "skipped": False,
+        "created": list(result.created),
+        "dropped": list(result.dropped),
+    }
+
+
+@celery_app.task(name="refresh_ticker_registry")
+def refresh_ticker_registry() -> dict[str, object]:
+    result = run_with_resources(
+        lambda resources: TickerRegistryService(
+            database=resources.database, deribit=resources.deribit
+        ).sync_from_deribit()
+    )
+
+    return {"added": list(result.added), "total": result.total}
+
+
+@celery_app.task(name="backfill_price_gaps")
+def backfill_price_gaps(
+    from_ts: int | None = None,
+    to_ts: int | None = None,
+    tickers: list[str] | None = None,
+) -> dict[str, object]:
+    result = run_with_resources(
+        lambda resources: BackfillService(
+            database=resources.database, deribit=resources.deribit
+        ).backfill(tickers=tickers, from_ts=from_ts, to_ts=to_ts)
+    )
+
+    if result is None:
+        return {"skipped": True}
+
+    return {
+        "skipped": False,
+        "from_ts": result.from_ts,
+        "to_ts": result.to_ts,
+        "missing": dict(result.missing),
+        "filled": dict(result.filled),
+        "failed": list(result.failed),
+    }
+
+
+@celery_app.task(name="refresh_price_rollups")
+def refresh_price_rollups() -> dict[str, object]:
+    result = run_with_resources(
+        lambda resources: RollupService(database=resources.database).refresh_rollups()
+    )
+
+    if result is None:
+        return {"skipped": True}
+
+    return {"skipped": False, "hours": result.hours, "batches": result.batches}
@@ -0,0 +1,302 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import subprocess
+import time
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from benchmarks.seed import benchmark_tickers, positive_int
+
+REPORT_VERSION = 1
+
+_COMPARED = ("p50_ms", "p95_ms", "p99_ms", "throughput_rps")
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    # Requests cycle through these, so every ticker gets the same load.
+    urls: Sequence[str]
+
+
+@dataclass
+class ScenarioRun:
+    latencies: list[float] = field(default_factory=list)
+    errors: dict[str, int] = field(default_factory=dict)
+    seconds: float = 0.0
+
+
+@dataclass(frozen=True)
+class Dataset:
+    tickers: Sequence[str]
+    rows: int
+    from_ts: int
+    to_ts: int
+
+
+def percentile(ordered: Sequence[float], fraction: float) -> float:
+    # Nearest rank: always a latency that was actually observed.
+    if not ordered:
+        return 0.0
+    rank = max(math.ceil(fraction * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def summarize(run: ScenarioRun) -> dict[str, Any]:
+    ordered = sorted(run.latencies)
+    completed = len(ordered) + sum(run.errors.values())
+    return {
+        "requests": completed,
+        "errors": dict(sorted(run.errors.items())),
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3) if ordered else 0.0,
+        "max_ms": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+        "throughput_rps": round(completed / run.seconds, 2) if run.seconds else 0.0,
+    }
+
+
+def compare(
+    report: Mapping[str, Any], baseline: Mapping[str, Any]
+) -> dict[str, dict[str, float | None]]:
+    # Relative change in percent; positive means slower latency or more
+    # throughput than the baseline.
+    changes: dict[str, dict[str, float | None]] = {}
+    for name, current in report["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if previous is None:
+            continue
+        changes[name] = {
+            metric: round((current[metric] / previous[metric] - 1) * 100, 2)
+            if previous.get(metric)
+            else None
+            for metric in _COMPARED
+        }
+    return changes
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    *,
+    requests: int,
+    concurrency: int,
+) -> ScenarioRun:
+    run = ScenarioRun()
+    urls = itertools.islice(itertools.cycle(scenario.urls), requests)
+
+    async def _worker() -> None:
+        # Workers share one iterator, so exactly `requests` are sent however
+        # the latencies interleave.
+        for url in urls:
+            started = time.perf_counter()
+            try:
+                resp = await client.get(url)
+            except httpx.HTTPError as exc:
+                error = type(exc).__name__
+            else:
+                if resp.status_code < 400:
+                    run.latencies.append(time.perf_counter() - started)
+                    continue
+                error = str(resp.status_code)
+            run.errors[error] = run.errors.get(error, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_worker() for _ in range(concurrency)))
+    run.seconds = time.perf_counter() - started
+    return run
+
+
+def build_scenarios(
+    dataset: Dataset, *, limit: int, deep_offset: int
+) -> list[Scenario]:
+    window = f"from_ts={dataset.from_ts}&to_ts={dataset.to_ts}&limit={limit}"
+    return [
+        Scenario(
+            name="prices",
+            urls=[f"/prices?ticker={t}&limit={limit}" for t in dataset.tickers],
+        ),
+        Scenario(
+            name="range_shallow",
+            urls=[f"/prices/range?ticker={t}&{window}" for t in dataset.tickers],
+        ),
+        Scenario(
+            name="range_deep",
+            urls=[
+                f"/prices/range?ticker={t}&{window}&offset={deep_offset}"
+                for t in dataset.tickers
+            ],
+        ),
+        Scenario(
+            name="latest",
+            urls=[f"/prices/latest?ticker={t}" for t in dataset.tickers],
+        ),
+    ]
+
+
+async def discover_dataset(
+    client: httpx.AsyncClient, tickers: Sequence[str]
+) -> Dataset:
+    # The window and row count come from the API itself, so the load run
+    # needs nothing from the seed step but the ticker count.
+    rows: list[int] = []
+    bounds: list[tuple[int, int]] = []
+    for ticker in tickers:
+        latest = await client.get("/prices/latest", params={"ticker": ticker})
+        if latest.status_code != 200:
+            raise SystemExit(
+                f"{ticker}: /prices/latest returned {latest.status_code};"
+                " seed the database and let the API reload its tickers first"
+            )
+        first = await client.get("/prices/range", params={"ticker": ticker, "limit": 1})
+        first.raise_for_status()
+        page = first.json()
+        rows.append(page["count"])
+        bounds.append((page["results"][0]["ts_unix"], latest.json()["ts_unix"]))
+
+    return Dataset(
+        tickers=tickers,
+        rows=min(rows),
+        from_ts=max(start for start, _ in bounds),
+        to_ts=min(end for _, end in bounds),
+    )
+
+
+def _git_commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parent,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+async def run_benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    started_at = datetime.now(tz=timezone.utc).isoformat()
+    limits = httpx.Limits(
+        max_connections=args.concurrency, max_keepalive_connections=args.concurrency
+    )
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=args.timeout
+    ) as client:
+        dataset = await discover_dataset(client, benchmark_tickers(args.tickers))
+        deep_offset = max(int(dataset.rows * args.deep_offset_fraction) - args.limit, 0)
+        scenarios = build_scenarios(dataset, limit=args.limit, deep_offset=deep_offset)
+        if args.scenario:
+            scenarios = [s for s in scenarios if s.name in args.scenario]
+
+        results: dict[str, Any] = {}
+        for scenario in scenarios:
+            if args.warmup:
+                await run_scenario(
+                    client, scenario, requests=args.warmup, concurrency=args.concurrency
+                )
+            run = await run_scenario(
+                client,
+                scenario,
+                requests=args.requests,
+                concurrency=args.concurrency,
+            )
+            results[scenario.name] = summarize(run)
+
+    return {
+        "version": REPORT_VERSION,
+        "started_at": started_at,
+        "git_commit": _git_commit(),
+        "config": {
+            "base_url": args.base_url,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "limit": args.limit,
+            "deep_offset": deep_offset,
+        },
+        "dataset": {
+            "tickers": list(dataset.tickers),
+            "rows_per_ticker": dataset.rows,
+            "from_ts": dataset.from_ts,
+            "to_ts": dataset.to_ts,
+        },
+        "scenarios": results,
+    }
+
+
+def _parse_args(argv: Sequence[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.load",
+        description="Drive the price routes against a seeded database.",
+    )
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument(
+        "--tickers",
+        type=positive_int,
+        default=4,
+        help="tickers seeded by benchmarks.seed",
+    )
+    parser.add_argument("--concurrency", type=positive_int, default=16)
+    parser.add_argument(
+        "--requests",
+        type=positive_int,
+        default=2_000,
+        help="measured requests per scenario",
+    )
+    parser.add_argument(
+        "--warmup", type=int, default=100, help="unmeasured requests per scenario"
+    )
+    parser.add_argument("--limit", type=positive_int, default=100, help="page size")
+    parser.add_argument(
+        "--deep-offset-fraction",
+        type=float,
+        default=0.9,
+        help="how far into the window range_deep pages (0..1)",
+    )
+    parser.add_argument("--timeout", type=float, default=30.0, help="seconds")
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=["prices", "range_shallow", "range_deep", "latest"],
+        help="scenario to run; repeatable (default: all)",
+    )
+    parser.add_argument("--output", type=Path, help="write the report here")
+    parser.add_argument(
+        "--baseline", type=Path, help="earlier report to compare against"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = _parse_args(argv)
+    report = asyncio.run(run_benchmark(args))
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text())
+        report["baseline"] = {
+            "git_commit": baseline.get("git_commit"),
+            "started_at": baseline.get("started_at"),
+            "change_pct": compare(report, baseline),
+        }
+
+    text = json.dumps(report, indent=2)
+    if args.output is not None:
+        args.output.write_text(text + "\n")
+    print(text)
+    return 1 if any(s["errors"] for s in report["scenarios"].values()) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections.abc import AsyncIterator, Iterator, Sequence
+from decimal import Decimal
+
+from app.core.logging import configure_logging
+from app.db.partitions import MonthPartition, create_partition, list_partitions
+from app.db.repository import PricePointRepository, TickerRepository
+from app.db.session import Database
+from app.services.price_service import compute_minute_bucket
+
+
+def benchmark_tickers(count: int) -> list[str]:
+    return [f"bench{index:02d}_usd" for index in range(count)]
+
+
+def synthetic_prices(
+    ticker: str, *, rows: int, end_ts: int, seed: int
+) -> Iterator[tuple[int, Decimal]]:
+    # A random walk in whole cents, seeded per ticker, so every run with the
+    # same arguments writes byte-identical prices.
+    rng = random.Random(f"{seed}:{ticker}")
+    cents = rng.randint(1_000_000, 10_000_000)
+    start_ts = end_ts - (rows - 1) * 60
+    for ts_unix in range(start_ts, end_ts + 1, 60):
+        cents = max(cents + rng.randint(-2_500, 2_500), 1)
+        yield ts_unix, Decimal(cents).scaleb(-2)
+
+
+async def _as_rows(
+    tickers: Sequence[str], *, rows: int, end_ts: int, seed: int
+) -> AsyncIterator[tuple[str, int, Decimal]]:
+    for ticker in tickers:
+        for ts_unix, price in synthetic_prices(
+            ticker, rows=rows, end_ts=end_ts, seed=seed
+        ):
+            yield ticker, ts_unix, price
+
+
+async def seed_database(
+    *, tickers: Sequence[str], rows_per_ticker: int, end_ts: int, seed: int
+) -> int:
+    database = Database.create()
+    try:
+        # Month partitions go in first: rows landing in the default partition
+        # would be moved again by partition maintenance and skew the layout.
+        start_ts = end_ts - (rows_per_ticker - 1) * 60
+        last = MonthPartition.containing(end_ts)
+        async with database.engine.begin() as connection:
+            existing = set(await list_partitions(connection))
+            partition = MonthPartition.containing(start_ts)
+            while partition <= last:
+                if partition not in existing:
+                    await create_partition(connection, partition)
+                partition = partition.shift(1)
+
+        async with database.sessionmaker() as session:
+            # Registered up front and flagged in the same transaction, so the
+            # ingest, backfill and stream jobs never ask Deribit about them.
+            tickers_repo = TickerRepository(session)
+            await tickers_repo.register(tickers)
+            await tickers_repo.exclude_from_ingest(tickers)
+            written = await PricePointRepository(session).bulk_load(
+                _as_rows(tickers, rows=rows_per_ticker, end_ts=end_ts, seed=seed)
+            )
+            await session.commit()
+
+        async with database.engine.begin() as connection:
+            await connection.exec_driver_sql("ANALYZE price_points")
+        return written
+    finally:
+        await database.dispose()
+
+
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def _parse_args(argv: Sequence[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.seed",
+        description="Load synthetic minute prices for the API benchmarks.",
+    )
+    parser.add_argument(
+        "--rows",
+        type=positive_int,
+        default=1_000_000,
+        help="total rows across all tickers",
+    )
+    parser.add_argument(
+        "--tickers", type=positive_int, default=4, help="number of bench*_usd tickers"
+    )
+    parser.add_argument(
+        "--end-ts", type=int, help="last minute bucket (default: current minute)"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="random walk seed")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    configure_logging()
+    args = _parse_args(argv)
+    tickers = benchmark_tickers(args.tickers)
+    rows_per_ticker = max(args.rows // len(tickers), 1)
+    end_ts = compute_minute_bucket(args.end_ts)
+
+    started = time.perf_counter()
+    written = asyncio.run(
+        seed_database(
+            tickers=tickers,
+            rows_per_ticker=rows_per_ticker,
+            end_ts=end_ts,
+            seed=args.seed,
+        )
+    )
+    print(
+        json.dumps(
+            {
+                "tickers": tickers,
+                "rows_per_ticker": rows_per_ticker,
+                "written": written,
+                "from_ts": end_ts - (rows_per_ticker - 1) * 60,
+                "to_ts": end_ts,
+                "seed": args.seed,
+                "seconds": round(time.perf_counter() - started, 3),
+            }
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
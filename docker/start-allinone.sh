@@ -1,5 +1,8 @@
 #!/usr/bin/env sh
 set -eu
 
+# Metric files from a previous run would be summed into the new one.
+rm -rf "${PROMETHEUS_MULTIPROC_DIR:?}" && mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+
 uv run alembic upgrade head
 exec /usr/bin/supervisord -c /etc/supervisor/conf.d/supervisord.conf
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from aiohttp import WSMsgType, web
+
+
+def price_index_update(index_name: str, price: float, timestamp_ms: int) -> dict:
+    return {
+        "jsonrpc": "2.0",
+        "method": "subscription",
+        "params": {
+            "channel": f"deribit_price_index.{index_name}",
+            "data": {
+                "index_name": index_name,
+                "price": price,
+                "timestamp": timestamp_ms,
+            },
+        },
+    }
+
+
+class FakeDeribitWsServer:
+    # Local stand-in for Deribit's JSON-RPC WebSocket. The n-th subscription
+    # receives batches[n]; every batch but the last ends with the server
+    # dropping the connection, so clients have to reconnect for the next one.
+    # A str in a batch goes out verbatim, for frames that are not valid JSON.
+    def __init__(self, batches: Sequence[Sequence[dict | str]]) -> None:
+        self.batches = list(batches)
+        self.calls: list[dict] = []
+        self._subscriptions = 0
+        self._runner: web.AppRunner | None = None
+        self.url = ""
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_get("/ws/api/v2", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        host, port = self._runner.addresses[0][:2]
+        self.url = f"ws://{host}:{port}/ws/api/v2"
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    def methods(self) -> list[str]:
+        return [call["method"] for call in self.calls]
+
+    async def _handle(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+
+        async for message in ws:
+            if message.type != WSMsgType.TEXT:
+                continue
+            call = message.json()
+            self.calls.append(call)
+            await ws.send_json({"jsonrpc": "2.0", "id": call["id"], "result": "ok"})
+
+            if call["method"] == "public/set_heartbeat":
+                await ws.send_json(
+                    {
+                        "jsonrpc": "2.0",
+                        "method": "heartbeat",
+                        "params": {"type": "test_request"},
+                    }
+                )
+            elif call["method"] == "public/subscribe":
+                batch_index = self._subscriptions
+                self._subscriptions += 1
+                for update in self.batches[batch_index]:
+                    if isinstance(update, str):
+                        await ws.send_str(update)
+                    else:
+                        await ws.send_json(update)
+                if batch_index < len(self.batches) - 1:
+                    await ws.close()
+
+        return ws
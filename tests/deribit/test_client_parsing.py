@@ -1,12 +1,22 @@
 from __future__ import annotations
 
+import time
 from decimal import Decimal
 
 import pytest
 from aioresponses import aioresponses
 
 from app.deribit.client import DeribitClient
-from app.deribit.errors import DeribitRateLimitError, DeribitRpcError
+from app.deribit.errors import (
+    DeribitDeadlineExceededError,
+    DeribitHttpError,
+    DeribitRateLimitError,
+    DeribitRpcError,
+)
+
+_INDEX_PRICE_URL = (
+    "https://test.deribit.com/api/v2/public/get_index_price?index_name=btc_usd"
+)
 
 
 @pytest.mark.asyncio
@@ -36,7 +46,7 @@ async def test_get_index_price_parses_decimal() -> None:
 
 @pytest.mark.asyncio
 async def test_get_index_price_rate_limit_errors() -> None:
-    client = DeribitClient(base_url="https://test.deribit.com/api/v2")
+    client = DeribitClient(base_url="https://test.deribit.com/api/v2", max_retries=0)
 
     with aioresponses() as mocked:
         mocked.get(
@@ -80,3 +90,104 @@ async def test_get_index_price_other_rpc_error() -> None:
 
     assert excinfo.value.code == 10009
     assert excinfo.value.message == "invalid_argument"
+
+
+@pytest.mark.asyncio
+async def test_get_index_price_names_returns_list() -> None:
+    client = DeribitClient(base_url="https://test.deribit.com/api/v2")
+
+    with aioresponses() as mocked:
+        mocked.get(
+            "https://test.deribit.com/api/v2/public/get_index_price_names",
+            payload={
+                "jsonrpc": "2.0",
+                "result": ["btc_usd", "eth_usd", "sol_usdc"],
+                "id": 7,
+            },
+        )
+
+        try:
+            names = await client.get_index_price_names()
+        finally:
+            await client.close()
+
+    assert names == ["btc_usd", "eth_usd", "sol_usdc"]
+
+
+@pytest.mark.asyncio
+async def test_get_index_price_retries_rate_limit_then_succeeds(monkeypatch) -> None:
+    monkeypatch.setattr("app.deribit.client.random.uniform", lambda _a, _b: 0.0)
+    client = DeribitClient(base_url="https://test.deribit.com/api/v2", max_retries=2)
+
+    with aioresponses() as mocked:
+        mocked.get(
+            _INDEX_PRICE_URL,
+            payload={"jsonrpc": "2.0", "error": {"code": 10028, "message": "tmr"}},
+        )
+        mocked.get(_INDEX_PRICE_URL, status=502, body="bad gateway")
+        mocked.get(
+            _INDEX_PRICE_URL,
+            payload={"jsonrpc": "2.0", "result": {"index_price": 42.5}},
+        )
+
+        try:
+            price = await client.get_index_price("btc_usd")
+        finally:
+            await client.close()
+
+    assert price == Decimal("42.5")
+
+
+@pytest.mark.asyncio
+async def test_get_index_price_gives_up_after_max_retries(monkeypatch) -> None:
+    monkeypatch.setattr("app.deribit.client.random.uniform", lambda _a, _b: 0.0)
+    client = DeribitClient(base_url="https://test.deribit.com/api/v2", max_retries=1)
+
+    with aioresponses() as mocked:
+        mocked.get(_INDEX_PRICE_URL, status=503, body="unavailable", repeat=True)
+
+        try:
+            with pytest.raises(DeribitHttpError) as excinfo:
+                await client.get_index_price("btc_usd")
+        finally:
+            await client.close()
+
+    assert excinfo.value.status == 503
+    assert len(next(iter(mocked.requests.values()))) == 2
+
+
+@pytest.mark.asyncio
+async def test_get_index_price_respects_deadline() -> None:
+    client = DeribitClient(base_url="https://test.deribit.com/api/v2")
+
+    try:
+        with pytest.raises(DeribitDeadlineExceededError):
+            await client.get_index_price("btc_usd", deadline=time.monotonic() - 1)
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_get_index_chart_data_parses_points() -> None:
+    client = DeribitClient(base_url="https://test.deribit.com/api/v2")
+
+    with aioresponses() as mocked:
+        mocked.get(
+            "https://test.deribit.com/api/v2/public/get_index_chart_data"
+            "?index_name=btc_usd&range=1d",
+            payload={
+                "jsonrpc": "2.0",
+                "result": [[1_700_000_000_000, 42000.5], [1_700_000_060_000, 42001]],
+                "id": 9,
+            },
+        )
+
+        try:
+            points = await client.get_index_chart_data("btc_usd", range_name="1d")
+        finally:
+            await client.close()
+
+    assert points == [
+        (1_700_000_000_000, Decimal("42000.5")),
+        (1_700_000_060_000, Decimal("42001")),
+    ]
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import pytest
+
+from app.deribit.errors import DeribitDeadlineExceededError
+from app.deribit.rate_limit import TokenBucket
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_allows_burst_then_paces() -> None:
+    clock = _FakeClock()
+    bucket = TokenBucket(rate_per_second=10, capacity=3, clock=clock, sleep=clock.sleep)
+
+    for _ in range(3):
+        await bucket.acquire()
+    assert clock.sleeps == []
+
+    await bucket.acquire()
+    await bucket.acquire()
+    assert clock.sleeps == pytest.approx([0.1, 0.1])
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_refills_over_time() -> None:
+    clock = _FakeClock()
+    bucket = TokenBucket(rate_per_second=2, capacity=2, clock=clock, sleep=clock.sleep)
+
+    await bucket.acquire()
+    await bucket.acquire()
+    clock.now += 1.0
+    await bucket.acquire()
+    await bucket.acquire()
+
+    assert clock.sleeps == []
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_refuses_waits_past_deadline() -> None:
+    clock = _FakeClock()
+    bucket = TokenBucket(rate_per_second=1, capacity=1, clock=clock, sleep=clock.sleep)
+
+    await bucket.acquire()
+    with pytest.raises(DeribitDeadlineExceededError):
+        await bucket.acquire(deadline=0.5)
+    await bucket.acquire(deadline=1.0)
+
+    assert clock.sleeps == [1.0]
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Sequence
+from contextlib import asynccontextmanager
+from decimal import Decimal
+
+import pytest
+
+from app.deribit.stream import DeribitPriceStream, IndexPriceTick
+from tests.deribit.fake_ws_server import FakeDeribitWsServer, price_index_update
+
+
+async def _take(stream: DeribitPriceStream, count: int) -> list[IndexPriceTick]:
+    ticks: list[IndexPriceTick] = []
+    iterator = stream.ticks()
+    try:
+        async for tick in iterator:
+            ticks.append(tick)
+            if len(ticks) == count:
+                break
+    finally:
+        await iterator.aclose()
+    return ticks
+
+
+@asynccontextmanager
+async def _serve(
+    batches: Sequence[Sequence[dict | str]],
+) -> AsyncIterator[FakeDeribitWsServer]:
+    server = FakeDeribitWsServer(batches)
+    await server.start()
+    try:
+        yield server
+    finally:
+        await server.stop()
+
+
+@pytest.mark.asyncio
+async def test_stream_subscribes_and_answers_heartbeats() -> None:
+    batches = [
+        [
+            price_index_update("btc_usd", 11628.81, 1_700_000_000_123),
+            price_index_update("eth_usd", 2000, 1_700_000_000_456),
+        ]
+    ]
+    async with _serve(batches) as server:
+        stream = DeribitPriceStream(
+            tickers=["btc_usd", "eth_usd"], ws_url=server.url, heartbeat_seconds=10
+        )
+        try:
+            ticks = await asyncio.wait_for(_take(stream, 2), timeout=5)
+        finally:
+            await stream.close()
+
+        assert ticks == [
+            IndexPriceTick("btc_usd", Decimal("11628.81"), 1_700_000_000_123),
+            IndexPriceTick("eth_usd", Decimal("2000"), 1_700_000_000_456),
+        ]
+        assert server.calls[0]["params"] == {"interval": 10}
+        assert server.calls[1]["params"] == {
+            "channels": ["deribit_price_index.btc_usd", "deribit_price_index.eth_usd"]
+        }
+        assert server.methods()[:3] == [
+            "public/set_heartbeat",
+            "public/subscribe",
+            "public/test",
+        ]
+
+
+@pytest.mark.asyncio
+async def test_stream_reconnects_and_resubscribes_after_drop() -> None:
+    batches = [
+        [price_index_update("btc_usd", 1.0, 60_000)],
+        [price_index_update("btc_usd", 2.0, 120_000)],
+    ]
+    async with _serve(batches) as server:
+        stream = DeribitPriceStream(
+            tickers=["btc_usd"], ws_url=server.url, heartbeat_seconds=10
+        )
+        stream._reconnect_initial_seconds = 0.01
+        try:
+            ticks = await asyncio.wait_for(_take(stream, 2), timeout=5)
+        finally:
+            await stream.close()
+
+        assert [tick.price for tick in ticks] == [Decimal("1.0"), Decimal("2.0")]
+        assert server.methods().count("public/subscribe") == 2
+
+
+@pytest.mark.asyncio
+async def test_stream_skips_malformed_frames() -> None:
+    batches = [
+        [
+            "{not json",
+            "[1, 2, 3]",
+            "42",
+            price_index_update("btc_usd", 3.0, 180_000),
+        ]
+    ]
+    async with _serve(batches) as server:
+        stream = DeribitPriceStream(
+            tickers=["btc_usd"], ws_url=server.url, heartbeat_seconds=10
+        )
+        try:
+            ticks = await asyncio.wait_for(_take(stream, 1), timeout=5)
+        finally:
+            await stream.close()
+
+        assert ticks == [IndexPriceTick("btc_usd", Decimal("3.0"), 180_000)]
+        assert server.methods().count("public/subscribe") == 1
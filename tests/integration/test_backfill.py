@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Iterable
+from decimal import Decimal
+
+import pytest
+
+from app.db.repository import PricePointRepository
+from app.db.session import session_scope
+
+
+async def _rows(
+    rows: Iterable[tuple[str, int, Decimal]],
+) -> AsyncIterator[tuple[str, int, Decimal]]:
+    for row in rows:
+        yield row
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_find_gaps_and_fill_without_overwriting(test_database_url: str) -> None:
+    async with session_scope(database_url=test_database_url) as session:
+        repo = PricePointRepository(session)
+        for ts_unix in (120, 180, 360):
+            await repo.upsert_price_points(
+                ts_unix=ts_unix, prices={"backfill_a": Decimal("1")}
+            )
+
+        gaps = await repo.find_gaps(ticker="backfill_a", from_ts=60, to_ts=420)
+        assert gaps == [(60, 120), (240, 360), (420, 480)]
+
+        inserted = await repo.bulk_load(
+            _rows(
+                [
+                    ("backfill_a", 60, Decimal("2")),
+                    ("backfill_a", 240, Decimal("2")),
+                    ("backfill_a", 360, Decimal("2")),
+                ]
+            ),
+            overwrite=False,
+        )
+        # 360 already holds a live value and is left alone.
+        assert inserted == 2
+        latest = await repo.get_latest(ticker="backfill_a")
+        assert latest is not None
+        assert latest.price == Decimal("1")
+
+        gaps = await repo.find_gaps(ticker="backfill_a", from_ts=60, to_ts=360)
+        assert gaps == [(300, 360)]
+        await session.rollback()
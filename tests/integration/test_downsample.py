@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+
+from app.db.repository import PricePointRepository
+from app.db.session import session_scope
+from app.services.price_service import PriceService
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_downsample_keeps_exact_prices_and_extremes(
+    test_database_url: str,
+) -> None:
+    pytest.importorskip("numpy")
+
+    async with session_scope(database_url=test_database_url) as session:
+        repo = PricePointRepository(session)
+        for minute in range(30):
+            price = Decimal("100.0000000001") if minute == 17 else Decimal(minute)
+            await repo.upsert_price_point(
+                ticker="downsample_test", ts_unix=minute * 60, price=price
+            )
+
+        service = PriceService()
+        lttb = await service.downsample(
+            session=session,
+            ticker="downsample_test",
+            from_ts=0,
+            to_ts=29 * 60,
+            points=6,
+            method="lttb",
+            chunk_size=7,
+        )
+        assert len(lttb) == 6
+        assert (17 * 60, Decimal("100.0000000001")) in [
+            (p.ts_unix, p.price) for p in lttb
+        ]
+
+        minmax = await service.downsample(
+            session=session,
+            ticker="downsample_test",
+            from_ts=0,
+            to_ts=29 * 60,
+            points=6,
+            method="minmax",
+            chunk_size=7,
+        )
+        assert [(p.ts_unix, p.price) for p in minmax][:2] == [
+            (0, Decimal(0)),
+            (540, Decimal(9)),
+        ]
+        await session.rollback()
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_minmax_on_unaligned_window_stays_within_points(
+    test_database_url: str,
+) -> None:
+    async with session_scope(database_url=test_database_url) as session:
+        repo = PricePointRepository(session)
+        for minute in range(30):
+            await repo.upsert_price_point(
+                ticker="downsample_test",
+                ts_unix=minute * 60,
+                price=Decimal(minute % 7),
+            )
+
+        # Epoch-aligned 840s buckets would split this window into three.
+        minmax = await PriceService().downsample(
+            session=session,
+            ticker="downsample_test",
+            from_ts=90,
+            to_ts=29 * 60,
+            points=4,
+            method="minmax",
+            chunk_size=7,
+        )
+        timestamps = [p.ts_unix for p in minmax]
+        assert len(minmax) <= 4
+        assert timestamps == sorted(timestamps)
+        assert all(90 <= ts <= 29 * 60 for ts in timestamps)
+        await session.rollback()
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+
+from app.db.partitions import MonthPartition, create_partition, list_partitions
+from app.db.session import create_engine
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_create_partition_moves_rows_out_of_default(
+    test_database_url: str,
+) -> None:
+    engine = create_engine(database_url=test_database_url)
+    partition = MonthPartition(year=1999, month=1)
+
+    try:
+        async with engine.connect() as connection:
+            await connection.exec_driver_sql(f"DROP TABLE IF EXISTS {partition.name}")
+            await connection.exec_driver_sql(
+                "INSERT INTO tickers (name) VALUES ('partition_test')"
+                " ON CONFLICT (name) DO NOTHING"
+            )
+            await connection.exec_driver_sql(
+                "INSERT INTO price_points (ts_unix, ticker_id, price)"
+                f" SELECT {partition.start_ts}, id, {Decimal('1.5')} FROM tickers"
+                " WHERE name = 'partition_test'"
+                " ON CONFLICT (ticker_id, ts_unix) DO NOTHING"
+            )
+
+            await create_partition(connection, partition)
+            assert partition in await list_partitions(connection)
+
+            moved = await connection.exec_driver_sql(
+                f"SELECT count(*) FROM {partition.name}"
+            )
+            assert moved.scalar_one() == 1
+            await connection.rollback()
+    finally:
+        await engine.dispose()
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+
+from app.db.repository import PricePointRepository
+from app.db.session import session_scope
+from app.services.price_service import PriceGap, PriceService
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_gaps_and_filled_ranges(test_database_url: str) -> None:
+    async with session_scope(database_url=test_database_url) as session:
+        repo = PricePointRepository(session)
+        for ts_unix in (120, 300):
+            await repo.upsert_price_point(
+                ticker="gaps_test", ts_unix=ts_unix, price=Decimal(ts_unix)
+            )
+
+        service = PriceService()
+        gaps = await service.list_gaps(
+            session=session,
+            ticker="gaps_test",
+            from_ts=30,
+            to_ts=420,
+            limit=10,
+            offset=0,
+        )
+        assert gaps == [
+            PriceGap(from_ts=60, to_ts=60, missing=1),
+            PriceGap(from_ts=180, to_ts=240, missing=2),
+            PriceGap(from_ts=360, to_ts=420, missing=2),
+        ]
+
+        page = await service.page_filled_prices(
+            session=session,
+            ticker="gaps_test",
+            from_ts=60,
+            to_ts=360,
+            fill="previous",
+            limit=10,
+            offset=0,
+        )
+        assert page.count == 6
+        assert [(r.ts_unix, r.price, r.filled) for r in page.rows] == [
+            (60, None, True),
+            (120, Decimal(120), False),
+            (180, Decimal(120), True),
+            (240, Decimal(120), True),
+            (300, Decimal(300), False),
+            (360, Decimal(300), True),
+        ]
+
+        backward = await repo.list_filled_range(
+            ticker="gaps_test",
+            from_ts=60,
+            to_ts=360,
+            fill="null",
+            limit=2,
+            offset=0,
+            before_ts=300,
+        )
+        assert [(r.ts_unix, r.price) for r in backward] == [(180, None), (240, None)]
+        await session.rollback()
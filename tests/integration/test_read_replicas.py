@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import make_url, text
+
+from app.db.replicas import ReadRouter, connect_read_session
+from app.db.session import Database
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_probe_measures_lag_and_routes_reads(test_database_url: str) -> None:
+    primary = Database.create(database_url=test_database_url)
+    # The primary stands in for a replica: not in recovery, so zero lag.
+    reads = ReadRouter(
+        primary,
+        [Database.create(database_url=test_database_url)],
+        max_lag_seconds=5,
+    )
+    try:
+        await reads.check()
+        (status,) = reads.status()
+        assert status["healthy"] is True
+        assert status["eligible"] is True
+        assert status["lag_seconds"] == 0.0
+
+        async with reads.session() as session:
+            assert (await session.execute(text("SELECT 1"))).scalar_one() == 1
+    finally:
+        await reads.dispose()
+        await primary.dispose()
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_lazy_read_session_fails_over_to_primary(test_database_url: str) -> None:
+    primary = Database.create(database_url=test_database_url)
+    # Nothing listens on port 1, so connecting to this "replica" is refused.
+    dead = make_url(test_database_url).set(host="127.0.0.1", port=1)
+    reads = ReadRouter(
+        primary,
+        [Database.create(database_url=dead.render_as_string(hide_password=False))],
+    )
+    try:
+        async with reads.session(lazy=True) as session:
+            await connect_read_session(session)
+            assert (await session.execute(text("SELECT 1"))).scalar_one() == 1
+        (status,) = reads.status()
+        assert status["healthy"] is False
+    finally:
+        await reads.dispose()
+        await primary.dispose()
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+
+from app.db.repository import PricePointRepository
+from app.db.session import session_scope
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_list_ohlc_aggregates_buckets(test_database_url: str) -> None:
+    async with session_scope(database_url=test_database_url) as session:
+        repo = PricePointRepository(session)
+
+        prices = {0: "10", 60: "12", 120: "9", 180: "11", 300: "20"}
+        for ts, price in prices.items():
+            await repo.upsert_price_point(
+                ticker="ohlc_test", ts_unix=ts, price=Decimal(price)
+            )
+        await session.commit()
+
+        rows, total = await repo.list_ohlc_with_count(
+            ticker="ohlc_test",
+            interval=300,
+            from_ts=None,
+            to_ts=None,
+            limit=10,
+            offset=0,
+        )
+
+        assert total == 2
+        assert [r.ts_unix for r in rows] == [0, 300]
+        first = rows[0]
+        assert (first.open, first.high, first.low, first.close, first.count) == (
+            Decimal("10"),
+            Decimal("12"),
+            Decimal("9"),
+            Decimal("11"),
+            4,
+        )
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+
+from app.db.repository import PricePointRepository
+from app.db.session import session_scope
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_keyset_pagination_seeks_both_directions(
+    test_database_url: str,
+) -> None:
+    async with session_scope(database_url=test_database_url) as session:
+        repo = PricePointRepository(session)
+
+        for ts in (60, 120, 180, 240):
+            await repo.upsert_price_point(
+                ticker="keyset_test", ts_unix=ts, price=Decimal(ts)
+            )
+        await session.commit()
+
+        forward = await repo.list_price_points(
+            ticker="keyset_test", limit=2, offset=0, after_ts=120
+        )
+        assert [p.ts_unix for p in forward] == [180, 240]
+
+        backward = await repo.list_range(
+            ticker="keyset_test",
+            from_ts=100,
+            to_ts=None,
+            limit=2,
+            offset=0,
+            before_ts=240,
+        )
+        assert [p.ts_unix for p in backward] == [120, 180]
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_list_range_with_count_returns_total_in_one_query(
+    test_database_url: str,
+) -> None:
+    async with session_scope(database_url=test_database_url) as session:
+        repo = PricePointRepository(session)
+
+        for ts in (60, 120, 180):
+            await repo.upsert_price_point(
+                ticker="count_test", ts_unix=ts, price=Decimal(ts)
+            )
+        await session.commit()
+
+        rows, total = await repo.list_range_with_count(
+            ticker="count_test", from_ts=None, to_ts=None, limit=2, offset=0
+        )
+        assert [p.ts_unix for p in rows] == [60, 120]
+        assert total == 3
+
+        rows, total = await repo.list_range_with_count(
+            ticker="count_test", from_ts=None, to_ts=None, limit=2, offset=10
+        )
+        assert rows == []
+        assert total == 3
+
+        estimate = await repo.estimate_price_points(ticker="count_test")
+        assert estimate >= 0
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import AsyncIterator
 from decimal import Decimal
 
 import pytest
@@ -32,3 +33,70 @@ async def test_upsert_overwrites_price_for_same_ticker_ts(
         assert len(rows) == 1
         assert rows[0].ts_unix == 1
         assert rows[0].price == Decimal("2.2")
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_upsert_registers_unknown_ticker(test_database_url: str) -> None:
+    async with session_scope(database_url=test_database_url) as session:
+        repo = PricePointRepository(session)
+
+        await repo.upsert_price_point(
+            ticker="new_ticker_usd", ts_unix=60, price=Decimal("3.3")
+        )
+
+        latest = await repo.get_latest(ticker="new_ticker_usd")
+        assert latest is not None
+        assert latest.ticker == "new_ticker_usd"
+        assert latest.price == Decimal("3.3")
+        await session.rollback()
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_upsert_price_points_writes_whole_bucket(test_database_url: str) -> None:
+    async with session_scope(database_url=test_database_url) as session:
+        repo = PricePointRepository(session)
+
+        await repo.upsert_price_points(
+            ts_unix=120,
+            prices={"btc_usd": Decimal("1.5"), "batch_new_usd": Decimal("2.5")},
+        )
+
+        for ticker, price in (("btc_usd", "1.5"), ("batch_new_usd", "2.5")):
+            rows = await repo.list_range(
+                ticker=ticker, from_ts=120, to_ts=120, limit=10, offset=0
+            )
+            assert [row.price for row in rows] == [Decimal(price)]
+        await session.rollback()
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_bulk_load_merges_batches_and_registers_tickers(
+    test_database_url: str,
+) -> None:
+    async def _rows() -> AsyncIterator[tuple[str, int, Decimal]]:
+        for ts_unix in range(60, 660, 60):
+            yield "bulk_a", ts_unix, Decimal(ts_unix)
+        # Later copies of a key win, even across batches.
+        yield "bulk_a", 60, Decimal("1.5")
+        yield "bulk_b", 60, Decimal("7")
+        yield "bulk_b", 60, Decimal("8")
+
+    async with session_scope(database_url=test_database_url) as session:
+        repo = PricePointRepository(session)
+        await repo.upsert_price_point(ticker="bulk_a", ts_unix=60, price=Decimal("9"))
+
+        written = await repo.bulk_load(_rows(), batch_size=4)
+
+        assert written == 13
+        first = await repo.list_range(
+            ticker="bulk_a", from_ts=60, to_ts=60, limit=10, offset=0
+        )
+        assert first[0].price == Decimal("1.5")
+        assert await repo.count_price_points(ticker="bulk_a") == 10
+        latest_b = await repo.get_latest(ticker="bulk_b")
+        assert latest_b is not None
+        assert latest_b.price == Decimal("8")
+        await session.rollback()
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+
+from app.db.repository import PricePointRepository
+from app.db.rollups import fold_dirty_hours
+from app.db.session import session_scope
+
+# Two and a half days of ten-minute points starting mid-afternoon.
+_START = 86_400 + 15 * 3_600
+_POINTS = {ts: Decimal(ts % 7_919) / 10 for ts in range(_START, _START + 216_000, 600)}
+
+
+def _expected_candles(
+    points: dict[int, Decimal], *, interval: int, from_ts: int, to_ts: int
+) -> list[tuple[int, Decimal, Decimal, Decimal, Decimal, int]]:
+    buckets: dict[int, list[tuple[int, Decimal]]] = {}
+    for ts, price in sorted(points.items()):
+        if from_ts <= ts <= to_ts:
+            buckets.setdefault(ts - ts % interval, []).append((ts, price))
+    return [
+        (
+            bucket,
+            rows[0][1],
+            max(price for _, price in rows),
+            min(price for _, price in rows),
+            rows[-1][1],
+            len(rows),
+        )
+        for bucket, rows in sorted(buckets.items())
+    ]
+
+
+async def _candles(
+    repo: PricePointRepository, *, interval: int, from_ts: int, to_ts: int
+) -> list[tuple]:
+    rows, total = await repo.list_ohlc_with_count(
+        ticker="rollup_a",
+        interval=interval,
+        from_ts=from_ts,
+        to_ts=to_ts,
+        limit=1_000,
+        offset=0,
+    )
+    assert total == len(rows)
+    return [
+        (row.ts_unix, row.open, row.high, row.low, row.close, row.count) for row in rows
+    ]
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_rollup_reads_match_raw_points_through_late_upserts(
+    test_database_url: str,
+) -> None:
+    async with session_scope(database_url=test_database_url) as session:
+        repo = PricePointRepository(session)
+        points = dict(_POINTS)
+        for ts, price in points.items():
+            await repo.upsert_price_points(ts_unix=ts, prices={"rollup_a": price})
+
+        from_ts, to_ts = _START + 1_234, _START + 200_000
+        windows = [(86_400, from_ts, to_ts), (3_600, from_ts, to_ts)]
+
+        async def _check() -> None:
+            for interval, lo, hi in windows:
+                assert await _candles(
+                    repo, interval=interval, from_ts=lo, to_ts=hi
+                ) == _expected_candles(points, interval=interval, from_ts=lo, to_ts=hi)
+            in_window = [p for ts, p in points.items() if from_ts <= ts <= to_ts]
+            assert await repo.count_price_points(
+                ticker="rollup_a", from_ts=from_ts, to_ts=to_ts
+            ) == len(in_window)
+            stats = await repo.get_stats(
+                ticker="rollup_a", from_ts=from_ts, to_ts=to_ts
+            )
+            assert stats.count == len(in_window)
+            assert stats.price_sum == sum(in_window)
+
+        # Nothing folded yet: every hour is dirty and read from raw points.
+        await _check()
+
+        connection = await session.connection()
+        while await fold_dirty_hours(connection, limit=50):
+            pass
+        await _check()
+
+        # A late overwrite inside a folded day marks its hour dirty again;
+        # reads stay exact before and after the next fold.
+        late_ts = _START + 86_400 + 3_000
+        points[late_ts] = Decimal("99999")
+        await repo.upsert_price_points(
+            ts_unix=late_ts, prices={"rollup_a": points[late_ts]}
+        )
+        await _check()
+        while await fold_dirty_hours(connection, limit=50):
+            pass
+        await _check()
+        await session.rollback()
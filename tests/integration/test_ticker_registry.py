@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+
+from app.db.repository import PricePointRepository, TickerRepository
+from app.db.session import session_scope
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_register_is_idempotent_and_feeds_latest_prices(
+    test_database_url: str,
+) -> None:
+    async with session_scope(database_url=test_database_url) as session:
+        tickers = TickerRepository(session)
+
+        added = await tickers.register(["registry_a", "registry_b"])
+        assert added == ["registry_a", "registry_b"]
+        assert await tickers.register(["registry_a"]) == []
+
+        enabled = await tickers.list_enabled()
+        assert {"registry_a", "registry_b"} <= set(enabled)
+
+        # Still served by the API, but no longer fetched from Deribit.
+        await tickers.exclude_from_ingest(["registry_b"])
+        assert "registry_b" in await tickers.list_enabled()
+        ingested = await tickers.list_ingested()
+        assert "registry_a" in ingested
+        assert "registry_b" not in ingested
+
+        prices = PricePointRepository(session)
+        await prices.upsert_price_points(
+            ts_unix=60, prices={"registry_a": Decimal("1")}
+        )
+        await prices.upsert_price_points(
+            ts_unix=120, prices={"registry_a": Decimal("2")}
+        )
+
+        latest = {row.ticker: row for row in await prices.get_latest_all()}
+        assert latest["registry_a"].ts_unix == 120
+        assert latest["registry_a"].price == Decimal("2")
+        assert "registry_b" not in latest
+        await session.rollback()
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_writes_into_closed_windows_stamp_the_ticker(
+    test_database_url: str,
+) -> None:
+    async with session_scope(database_url=test_database_url) as session:
+        tickers = TickerRepository(session)
+        await tickers.register(["late_a", "late_b"])
+        assert "late_a" not in await tickers.list_late_writes()
+
+        await PricePointRepository(session).upsert_price_points(
+            ts_unix=60, prices={"late_a": Decimal("1")}
+        )
+
+        late_writes = await tickers.list_late_writes()
+        assert late_writes["late_a"] > 60
+        assert "late_b" not in late_writes
+        await session.rollback()
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterable
+from contextlib import asynccontextmanager
+from decimal import Decimal
+
+import pytest
+
+from app.services.backfill_service import (
+    BackfillService,
+    bucket_chart_points,
+    chart_range_for,
+    chart_range_groups,
+    missing_buckets,
+)
+
+_NOW_TS = 1_700_000_000
+_DAY = 86_400
+
+
+def test_chart_range_for_picks_smallest_covering_range() -> None:
+    now_ts = 1_700_000_000
+
+    assert chart_range_for(now_ts - 600, now_ts=now_ts) == "1h"
+    assert chart_range_for(now_ts - 3_601, now_ts=now_ts) == "1d"
+    assert chart_range_for(now_ts - 20 * 86_400, now_ts=now_ts) == "1m"
+    assert chart_range_for(now_ts - 400 * 86_400, now_ts=now_ts) == "all"
+
+
+def test_missing_buckets_expands_gaps_to_minutes() -> None:
+    assert missing_buckets([(60, 240), (390, 480)]) == [60, 120, 180, 420]
+
+
+def test_bucket_chart_points_keeps_last_point_of_wanted_buckets() -> None:
+    points = [
+        (60_000, Decimal("1")),
+        (119_000, Decimal("2")),
+        (125_000, Decimal("3")),
+        (180_500, Decimal("4")),
+    ]
+
+    assert bucket_chart_points(points, wanted=[60, 180]) == [
+        (60, Decimal("2")),
+        (180, Decimal("4")),
+    ]
+
+
+def test_chart_range_groups_fetch_each_bucket_at_its_finest_range() -> None:
+    recent = [_NOW_TS - 600, _NOW_TS - 540]
+    yesterday = [_NOW_TS - 30 * 3_600]
+    ten_days_old = [_NOW_TS - 10 * _DAY, _NOW_TS - 10 * _DAY + 60]
+
+    groups = chart_range_groups(ten_days_old + yesterday + recent, now_ts=_NOW_TS)
+
+    # Charts beyond two days are coarser than a minute, so that gap is skipped.
+    assert groups == {"1h": recent, "2d": yesterday}
+
+
+class _FakeRepository:
+    first_ts: int | None = None
+    gaps: list[tuple[int, int]] = []
+    loaded: list[tuple[str, int, Decimal]] = []
+    gap_calls: list[tuple[int, int]] = []
+
+    def __init__(self, _session: object) -> None:
+        pass
+
+    async def get_first_ts(self, *, ticker: str) -> int | None:
+        return self.first_ts
+
+    async def find_gaps(
+        self, *, ticker: str, from_ts: int, to_ts: int
+    ) -> list[tuple[int, int]]:
+        self.gap_calls.append((from_ts, to_ts))
+        return self.gaps
+
+    async def bulk_load(
+        self, rows: AsyncIterable[tuple[str, int, Decimal]], *, overwrite: bool
+    ) -> int:
+        loaded = [row async for row in rows]
+        self.loaded.extend(loaded)
+        return len(loaded)
+
+
+class _FakeSession:
+    async def commit(self) -> None:
+        pass
+
+
+class _FakeDatabase:
+    @asynccontextmanager
+    async def sessionmaker(self):
+        yield _FakeSession()
+
+
+class _FakeDeribit:
+    def __init__(self) -> None:
+        self.ranges: list[str] = []
+
+    async def get_index_chart_data(
+        self, ticker: str, *, range_name: str
+    ) -> list[tuple[int, Decimal]]:
+        self.ranges.append(range_name)
+        # Minute points over the whole range, as the minute-resolution
+        # charts return them.
+        span = {"1h": 3_600, "1d": _DAY, "2d": 2 * _DAY}[range_name]
+        start = _NOW_TS - span
+        return [(ts * 1000, Decimal(ts)) for ts in range(start, _NOW_TS, 60)]
+
+
+@pytest.mark.asyncio
+async def test_recent_gap_is_filled_while_an_old_gap_exists(monkeypatch) -> None:
+    to_ts = _NOW_TS - _NOW_TS % 60 - 60
+    recent_gap = (to_ts - 300, to_ts - 120)
+    old_gap = (to_ts - 10 * _DAY, to_ts - 10 * _DAY + 180)
+    monkeypatch.setattr(_FakeRepository, "first_ts", to_ts - 20 * _DAY)
+    monkeypatch.setattr(_FakeRepository, "gaps", [old_gap, recent_gap])
+    monkeypatch.setattr(_FakeRepository, "loaded", [])
+    monkeypatch.setattr(_FakeRepository, "gap_calls", [])
+    monkeypatch.setattr(
+        "app.services.backfill_service.PricePointRepository", _FakeRepository
+    )
+    deribit = _FakeDeribit()
+    service = BackfillService(
+        database=_FakeDatabase(),  # pyright: ignore[reportArgumentType]
+        deribit=deribit,  # pyright: ignore[reportArgumentType]
+    )
+
+    missing, filled = await service._backfill_ticker(
+        "btc_usd",
+        from_ts=to_ts - 30 * _DAY,
+        to_ts=to_ts,
+        now_ts=_NOW_TS,
+        chunk_size=100,
+    )
+
+    assert deribit.ranges == ["1h"]
+    assert missing == 6
+    assert filled == 3
+    assert [ts for _, ts, _ in _FakeRepository.loaded] == list(range(*recent_gap, 60))
+    # The search starts at the first stored point, not the window start.
+    assert _FakeRepository.gap_calls == [(to_ts - 20 * _DAY, to_ts)]
+
+
+@pytest.mark.asyncio
+async def test_ticker_without_points_has_no_gaps(monkeypatch) -> None:
+    monkeypatch.setattr(_FakeRepository, "first_ts", None)
+    monkeypatch.setattr(_FakeRepository, "gap_calls", [])
+    monkeypatch.setattr(
+        "app.services.backfill_service.PricePointRepository", _FakeRepository
+    )
+    deribit = _FakeDeribit()
+    service = BackfillService(
+        database=_FakeDatabase(),  # pyright: ignore[reportArgumentType]
+        deribit=deribit,  # pyright: ignore[reportArgumentType]
+    )
+
+    outcome = await service._backfill_ticker(
+        "btc_usd", from_ts=0, to_ts=_NOW_TS, now_ts=_NOW_TS, chunk_size=100
+    )
+
+    assert outcome == (0, 0)
+    assert deribit.ranges == []
+    assert _FakeRepository.gap_calls == []
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+import httpx
+import pytest
+
+from benchmarks.load import (
+    Dataset,
+    Scenario,
+    ScenarioRun,
+    build_scenarios,
+    compare,
+    percentile,
+    run_scenario,
+    summarize,
+)
+from benchmarks.seed import _parse_args, benchmark_tickers, synthetic_prices
+
+
+def test_synthetic_prices_are_reproducible_minute_rows() -> None:
+    first = list(synthetic_prices("bench00_usd", rows=5, end_ts=1_700_000_040, seed=1))
+    again = list(synthetic_prices("bench00_usd", rows=5, end_ts=1_700_000_040, seed=1))
+    other = list(synthetic_prices("bench01_usd", rows=5, end_ts=1_700_000_040, seed=1))
+
+    assert first == again
+    assert first != other
+    assert [ts for ts, _ in first] == list(range(1_699_999_800, 1_700_000_041, 60))
+    assert all(
+        price > 0 and price == price.quantize(Decimal("0.01")) for _, price in first
+    )
+
+
+def test_percentile_uses_nearest_rank() -> None:
+    ordered = [float(value) for value in range(1, 101)]
+
+    assert percentile(ordered, 0.50) == 50.0
+    assert percentile(ordered, 0.99) == 99.0
+    assert percentile([0.2], 0.95) == 0.2
+    assert percentile([], 0.5) == 0.0
+
+
+def test_summarize_counts_errors_in_throughput() -> None:
+    run = ScenarioRun(latencies=[0.01, 0.02, 0.03], errors={"500": 1}, seconds=2.0)
+
+    summary = summarize(run)
+
+    assert summary["requests"] == 4
+    assert summary["errors"] == {"500": 1}
+    assert summary["p50_ms"] == 20.0
+    assert summary["max_ms"] == 30.0
+    assert summary["throughput_rps"] == 2.0
+
+
+def test_build_scenarios_cover_every_ticker() -> None:
+    dataset = Dataset(
+        tickers=benchmark_tickers(2), rows=1_000, from_ts=60, to_ts=60_000
+    )
+
+    scenarios = {s.name: s for s in build_scenarios(dataset, limit=50, deep_offset=850)}
+
+    assert set(scenarios) == {"prices", "range_shallow", "range_deep", "latest"}
+    assert scenarios["range_deep"].urls == [
+        "/prices/range?ticker=bench00_usd&from_ts=60&to_ts=60000&limit=50&offset=850",
+        "/prices/range?ticker=bench01_usd&from_ts=60&to_ts=60000&limit=50&offset=850",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_run_scenario_sends_exactly_the_requested_count() -> None:
+    seen: list[str] = []
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.params["ticker"])
+        status = 503 if request.url.params["ticker"] == "b" and len(seen) == 2 else 200
+        return httpx.Response(status, json={})
+
+    async with httpx.AsyncClient(
+        base_url="http://bench", transport=httpx.MockTransport(_handler)
+    ) as client:
+        run = await run_scenario(
+            client,
+            Scenario(
+                name="latest",
+                urls=["/prices/latest?ticker=a", "/prices/latest?ticker=b"],
+            ),
+            requests=7,
+            concurrency=3,
+        )
+
+    assert len(seen) == 7
+    assert seen.count("a") == 4
+    assert len(run.latencies) == 6
+    assert run.errors == {"503": 1}
+
+
+def test_compare_reports_relative_change() -> None:
+    baseline = {
+        "scenarios": {
+            "prices": {
+                "p50_ms": 10.0,
+                "p95_ms": 20.0,
+                "p99_ms": 0.0,
+                "throughput_rps": 100.0,
+            }
+        }
+    }
+    report = {
+        "scenarios": {
+            "prices": {
+                "p50_ms": 12.0,
+                "p95_ms": 15.0,
+                "p99_ms": 5.0,
+                "throughput_rps": 90.0,
+            },
+            "latest": {
+                "p50_ms": 1.0,
+                "p95_ms": 1.0,
+                "p99_ms": 1.0,
+                "throughput_rps": 1.0,
+            },
+        }
+    }
+
+    assert compare(report, baseline) == {
+        "prices": {
+            "p50_ms": 20.0,
+            "p95_ms": -25.0,
+            "p99_ms": None,
+            "throughput_rps": -10.0,
+        }
+    }
+
+
+@pytest.mark.parametrize("argv", [["--tickers", "0"], ["--rows", "0"], ["--rows", "x"]])
+def test_seed_rejects_empty_datasets(argv: list[str]) -> None:
+    with pytest.raises(SystemExit):
+        _parse_args(argv)
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Sequence
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.downsample import (
+    ChartPoint,
+    collect_series,
+    lttb_indices,
+    min_max_interval,
+    min_max_points,
+)
+
+np = pytest.importorskip("numpy")
+
+
+def test_lttb_keeps_ends_and_spikes() -> None:
+    x = np.arange(0, 60_000, 60, dtype=np.int64)
+    y = np.sin(np.arange(len(x)) / 50.0)
+    y[437] = 25.0
+
+    selected = lttb_indices(x, y, 100)
+
+    assert len(selected) == 100
+    assert selected[0] == 0
+    assert selected[-1] == len(x) - 1
+    assert 437 in selected
+    assert np.all(np.diff(selected) > 0)
+
+
+def test_lttb_returns_everything_below_threshold() -> None:
+    x = np.arange(5, dtype=np.int64)
+
+    assert lttb_indices(x, x.astype(float), 10).tolist() == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_collect_series_concatenates_chunks() -> None:
+    async def _chunks() -> AsyncIterator[Sequence[SimpleNamespace]]:
+        yield [SimpleNamespace(ts_unix=60, price=Decimal("1.5"))]
+        yield [
+            SimpleNamespace(ts_unix=120, price=Decimal("2")),
+            SimpleNamespace(ts_unix=180, price=Decimal("3")),
+        ]
+
+    ts_unix, prices = await collect_series(_chunks())  # pyright: ignore[reportArgumentType]
+
+    assert ts_unix.tolist() == [60, 120, 180]
+    assert prices.tolist() == [1.5, 2.0, 3.0]
+
+
+def test_min_max_points_orders_extremes_in_time() -> None:
+    rows = [
+        SimpleNamespace(low_ts=180, low=Decimal("1"), high_ts=60, high=Decimal("3")),
+        SimpleNamespace(low_ts=300, low=Decimal("2"), high_ts=300, high=Decimal("2")),
+    ]
+
+    assert min_max_points(rows) == [  # pyright: ignore[reportArgumentType]
+        ChartPoint(ts_unix=60, price=Decimal("3")),
+        ChartPoint(ts_unix=180, price=Decimal("1")),
+        ChartPoint(ts_unix=300, price=Decimal("2")),
+    ]
+
+
+def test_min_max_interval_fits_target_in_whole_minutes() -> None:
+    year = 365 * 86_400
+
+    interval = min_max_interval(from_ts=0, to_ts=year - 1, points=2000)
+
+    assert interval % 60 == 0
+    assert year / interval <= 1000
+    assert min_max_interval(from_ts=0, to_ts=600, points=2000) == 60
+
+
+@pytest.mark.parametrize(
+    ("from_ts", "to_ts", "points"),
+    [(90, 29 * 60, 4), (1_700_000_017, 1_700_086_399, 7), (59, 121, 3)],
+)
+def test_min_max_buckets_from_window_start_fit_points(
+    from_ts: int, to_ts: int, points: int
+) -> None:
+    interval = min_max_interval(from_ts=from_ts, to_ts=to_ts, points=points)
+
+    buckets = -(-(to_ts - from_ts + 1) // interval)
+    assert 2 * buckets <= points
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import json
+from decimal import Decimal
+from typing import NamedTuple
+
+from app.api.encoding import FastJSONResponse, encode_rows
+from app.schemas.prices import PricePointOut, RangePricePointOut
+
+
+class _Row(NamedTuple):
+    ticker: str
+    ts_unix: int
+    price: Decimal
+
+
+def test_encode_rows_matches_response_models() -> None:
+    rows = [
+        _Row(ticker="btc_usd", ts_unix=60, price=Decimal("42000.1000000000")),
+        _Row(ticker="btc_usd", ts_unix=120, price=Decimal("0.0000000001")),
+    ]
+
+    body = FastJSONResponse({"results": encode_rows(rows, schema=PricePointOut)}).body
+
+    expected = [PricePointOut.model_validate(r).model_dump(mode="json") for r in rows]
+    assert json.loads(body)["results"] == expected
+    assert b'"price":"42000.1000000000"' in body
+
+
+def test_encode_rows_fills_schema_defaults() -> None:
+    rows = [_Row(ticker="btc_usd", ts_unix=60, price=Decimal("1"))]
+
+    assert encode_rows(rows, schema=RangePricePointOut) == [
+        {"ticker": "btc_usd", "ts_unix": 60, "price": Decimal("1"), "filled": False}
+    ]
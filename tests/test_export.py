@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import json
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.db.replicas import get_read_router
+from app.main import app
+
+_ROWS = [
+    ("btc_usd", 60, Decimal("42000.1234567890")),
+    ("btc_usd", 120, Decimal("42001.0000000000")),
+]
+
+
+class _FakeReadRouter:
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[object]:
+        yield object()
+
+
+class _FakeService:
+    async def stream_prices(self, **kwargs) -> AsyncIterator[list[tuple]]:
+        assert kwargs["chunk_size"] > 0
+        yield _ROWS[:1]
+        yield _ROWS[1:]
+
+
+@pytest.fixture
+def client(monkeypatch) -> Iterator[TestClient]:
+    monkeypatch.setattr("app.api.routes.prices.PriceService", _FakeService)
+    app.dependency_overrides[get_read_router] = _FakeReadRouter
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+    app.dependency_overrides.clear()
+
+
+def test_export_ndjson_streams_decimal_strings(client: TestClient) -> None:
+    resp = client.get("/prices/export", params={"ticker": "btc_usd"})
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert lines == [
+        {"ticker": "btc_usd", "ts_unix": 60, "price": "42000.1234567890"},
+        {"ticker": "btc_usd", "ts_unix": 120, "price": "42001.0000000000"},
+    ]
+
+
+def test_export_csv_has_header(client: TestClient) -> None:
+    resp = client.get("/prices/export", params={"ticker": "btc_usd", "format": "csv"})
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/csv")
+    assert resp.text.splitlines() == [
+        "ticker,ts_unix,price",
+        "btc_usd,60,42000.1234567890",
+        "btc_usd,120,42001.0000000000",
+    ]
+
+
+def test_export_validates_ticker(client: TestClient) -> None:
+    resp = client.get("/prices/export", params={"ticker": "nope"})
+    assert resp.status_code == 422
+
+
+@pytest.mark.parametrize("fmt", ["arrow", "parquet"])
+def test_export_columnar_round_trips(client: TestClient, fmt: str) -> None:
+    pa = pytest.importorskip("pyarrow")
+
+    resp = client.get("/prices/export", params={"ticker": "btc_usd", "format": fmt})
+    assert resp.status_code == 200
+
+    if fmt == "arrow":
+        table = pa.ipc.open_stream(resp.content).read_all()
+    else:
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(pa.BufferReader(resp.content))
+
+    assert table.schema.field("ts_unix").type == pa.int64()
+    assert table.schema.field("price").type == pa.decimal128(20, 10)
+    assert table.schema.metadata[b"ticker"] == b"btc_usd"
+    assert table.column("ts_unix").to_pylist() == [60, 120]
+    assert table.column("price").to_pylist() == [price for _, _, price in _ROWS]
+
+
+def test_export_columnar_requires_pyarrow(monkeypatch, client: TestClient) -> None:
+    monkeypatch.setattr("app.api.routes.prices.columnar_available", lambda: False)
+
+    resp = client.get("/prices/export", params={"ticker": "btc_usd", "format": "arrow"})
+    assert resp.status_code == 501
+    assert resp.json()["detail"]["error"] == "format_unavailable"
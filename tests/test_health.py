@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+def test_health() -> None:
+    with TestClient(app) as client:
+        resp = client.get("/health")
+
+    assert resp.status_code == 200
+    assert resp.json() == {"status": "ok"}
+
+
+def test_db_pool_reports_configured_pool_without_connecting() -> None:
+    with TestClient(app) as client:
+        resp = client.get("/health/db-pool")
+
+    assert resp.status_code == 200
+    payload = resp.json()
+    assert payload["size"] == 5
+    assert payload["checked_out"] == 0
+    assert payload["overflow"] <= 0
+    assert payload["acquisitions"] == 0
+    assert payload["wait_seconds_max"] == 0
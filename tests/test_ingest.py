@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+from decimal import Decimal
+
+import pytest
+
+from app.deribit.errors import DeribitHttpError
+from app.services.price_service import fetch_index_prices
+
+
+class _FakeDeribit:
+    def __init__(self, prices: dict[str, Decimal]) -> None:
+        self._prices = prices
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get_index_price(
+        self, index_name: str, *, deadline: float | None = None
+    ) -> Decimal:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0)
+            if index_name not in self._prices:
+                raise DeribitHttpError(status=503)
+            return self._prices[index_name]
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.mark.asyncio
+async def test_fetch_index_prices_isolates_failures() -> None:
+    deribit = _FakeDeribit({"btc_usd": Decimal("1"), "eth_usd": Decimal("2")})
+
+    prices, failed = await fetch_index_prices(
+        deribit,  # pyright: ignore[reportArgumentType]
+        ["btc_usd", "sol_usd", "eth_usd"],
+        concurrency=8,
+    )
+
+    assert prices == {"btc_usd": Decimal("1"), "eth_usd": Decimal("2")}
+    assert failed == ["sol_usd"]
+
+
+@pytest.mark.asyncio
+async def test_fetch_index_prices_bounds_concurrency() -> None:
+    tickers = [f"t{i}" for i in range(10)]
+    deribit = _FakeDeribit({ticker: Decimal(i) for i, ticker in enumerate(tickers)})
+
+    prices, failed = await fetch_index_prices(
+        deribit,  # pyright: ignore[reportArgumentType]
+        tickers,
+        concurrency=3,
+    )
+
+    assert len(prices) == 10
+    assert failed == []
+    assert deribit.max_in_flight == 3
+
+
+@pytest.mark.asyncio
+async def test_fetch_index_prices_spreads_batches() -> None:
+    tickers = ["a", "b", "c", "d"]
+    started: dict[str, float] = {}
+    loop = asyncio.get_running_loop()
+
+    class _RecordingDeribit:
+        async def get_index_price(
+            self, index_name: str, *, deadline: float | None = None
+        ) -> Decimal:
+            started[index_name] = loop.time()
+            return Decimal(1)
+
+    prices, _ = await fetch_index_prices(
+        _RecordingDeribit(),  # pyright: ignore[reportArgumentType]
+        tickers,
+        concurrency=8,
+        batch_size=2,
+        spread_seconds=0.2,
+    )
+
+    assert set(prices) == set(tickers)
+    assert started["b"] - started["a"] < 0.05
+    assert started["c"] - started["a"] >= 0.09
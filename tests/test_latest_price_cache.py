@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+from app.services.latest_price_cache import LatestPriceCache
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cache_expires_entries_past_max_age() -> None:
+    clock = _Clock()
+    cache = LatestPriceCache(max_age_seconds=60, clock=clock)
+
+    cache.put(ticker="btc_usd", ts_unix=120, price=Decimal("1.5"))
+    entry = cache.get("btc_usd")
+    assert entry is not None
+    assert entry.price == Decimal("1.5")
+
+    clock.now += 61
+    assert cache.get("btc_usd") is None
+
+
+def test_cache_ignores_older_timestamps() -> None:
+    cache = LatestPriceCache(max_age_seconds=60)
+
+    cache.put(ticker="btc_usd", ts_unix=180, price=Decimal("2"))
+    cache.put(ticker="btc_usd", ts_unix=120, price=Decimal("1"))
+
+    entry = cache.get("btc_usd")
+    assert entry is not None
+    assert entry.ts_unix == 180
+
+
+def test_cache_applies_notifications() -> None:
+    cache = LatestPriceCache(max_age_seconds=60)
+
+    cache.handle_notification(
+        '{"ticker": "eth_usd", "ts_unix": 60, "price": "3000.1234567890"}'
+    )
+    cache.handle_notification("not json")
+
+    entry = cache.get("eth_usd")
+    assert entry is not None
+    assert entry.price == Decimal("3000.1234567890")
+
+
+def test_cache_tracks_late_writes_once_loaded() -> None:
+    cache = LatestPriceCache(max_age_seconds=60)
+
+    # Unknown until loaded, so callers can't mistake "not listening" for
+    # "never written late".
+    cache.handle_late_write('{"ticker": "btc_usd", "late_write_ts": 500}')
+    assert cache.late_write_ts("btc_usd") is None
+
+    # A notification that raced the load is kept.
+    cache.load_late_writes({"btc_usd": 300})
+    assert cache.late_write_ts("btc_usd") == 500
+    assert cache.late_write_ts("eth_usd") == 0
+
+    cache.handle_late_write('{"ticker": "btc_usd", "late_write_ts": 400}')
+    cache.handle_late_write("not json")
+    assert cache.late_write_ts("btc_usd") == 500
+
+    cache.forget_late_writes()
+    assert cache.late_write_ts("btc_usd") is None
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+import pytest
+from aioresponses import aioresponses
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.db.instrumentation import _operation
+from app.deribit.client import DeribitClient
+from app.main import app
+
+_INDEX_PRICE_URL = (
+    "https://test.deribit.com/api/v2/public/get_index_price?index_name=btc_usd"
+)
+
+
+def _sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.fixture
+def client() -> Iterator[TestClient]:
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def test_metrics_label_requests_by_route_template(client: TestClient) -> None:
+    labels = {"method": "GET", "route": "/health", "status": "200"}
+    before = _sample("http_request_duration_seconds_count", **labels)
+
+    assert client.get("/health").status_code == 200
+    client.get("/no/such/path")
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    assert _sample("http_request_duration_seconds_count", **labels) == before + 1
+    assert 'route="<unmatched>"' in resp.text
+    assert "/no/such/path" not in resp.text
+    # The scrape itself was in flight while it rendered.
+    assert 'http_requests_in_flight{method="GET"} 1.0' in resp.text
+    assert _sample("http_requests_in_flight", method="GET") == 0
+
+
+@pytest.mark.parametrize(
+    ("statement", "expected"),
+    [
+        ("SELECT 1", "SELECT"),
+        ("\n  insert into price_points VALUES (1)", "INSERT"),
+        ("WITH x AS (SELECT 1) SELECT * FROM x", "WITH"),
+        ("SET statement_timeout = 0", "OTHER"),
+        ("", "OTHER"),
+    ],
+)
+def test_query_operation_label(statement: str, expected: str) -> None:
+    assert _operation(statement) == expected
+
+
+@pytest.mark.asyncio
+async def test_deribit_errors_counted_by_exception_type(monkeypatch) -> None:
+    monkeypatch.setattr("app.deribit.client.random.uniform", lambda _a, _b: 0.0)
+    method = "public/get_index_price"
+    rate_limited = _sample(
+        "deribit_errors_total", method=method, error="DeribitRateLimitError"
+    )
+    http_errors = _sample(
+        "deribit_errors_total", method=method, error="DeribitHttpError"
+    )
+    attempts = _sample("deribit_request_duration_seconds_count", method=method)
+
+    client = DeribitClient(base_url="https://test.deribit.com/api/v2", max_retries=2)
+    with aioresponses() as mocked:
+        mocked.get(
+            _INDEX_PRICE_URL,
+            payload={"jsonrpc": "2.0", "error": {"code": 10028, "message": "tmr"}},
+        )
+        mocked.get(_INDEX_PRICE_URL, status=502, body="bad gateway")
+        mocked.get(
+            _INDEX_PRICE_URL,
+            payload={"jsonrpc": "2.0", "result": {"index_price": 42.5}},
+        )
+        try:
+            await client.get_index_price("btc_usd")
+        finally:
+            await client.close()
+
+    assert (
+        _sample("deribit_errors_total", method=method, error="DeribitRateLimitError")
+        == rate_limited + 1
+    )
+    assert (
+        _sample("deribit_errors_total", method=method, error="DeribitHttpError")
+        == http_errors + 1
+    )
+    assert (
+        _sample("deribit_request_duration_seconds_count", method=method) == attempts + 3
+    )
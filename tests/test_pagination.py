@@ -1,6 +1,15 @@
 from __future__ import annotations
 
-from app.api.pagination import build_paginated_response
+import pytest
+
+from app.api.pagination import (
+    Cursor,
+    CursorPage,
+    build_paginated_response,
+    decode_cursor,
+    encode_cursor,
+    split_keyset_page,
+)
 
 
 class _FakeRequest:
@@ -72,3 +81,69 @@ def test_build_paginated_response_handles_no_query() -> None:
 
     assert payload["next"] is None
     assert payload["previous"] is None
+
+
+class _Row:
+    def __init__(self, ts_unix: int) -> None:
+        self.ts_unix = ts_unix
+
+
+def test_cursor_round_trip() -> None:
+    assert decode_cursor(encode_cursor(Cursor(after_ts=120))) == Cursor(after_ts=120)
+    assert decode_cursor(encode_cursor(Cursor(before_ts=60))) == Cursor(before_ts=60)
+
+
+@pytest.mark.parametrize(
+    "value", ["", "not-base64!", encode_cursor(Cursor(after_ts=1))[:-1]]
+)
+def test_decode_cursor_rejects_garbage(value: str) -> None:
+    with pytest.raises(ValueError):
+        decode_cursor(value)
+
+
+def test_split_keyset_page_forward() -> None:
+    rows = [_Row(60), _Row(120), _Row(180)]
+
+    page, cursors = split_keyset_page(rows, limit=2, cursor=Cursor())
+    assert [r.ts_unix for r in page] == [60, 120]
+    assert cursors.next_cursor is not None
+    assert decode_cursor(cursors.next_cursor) == Cursor(after_ts=120)
+    assert cursors.previous_cursor is None
+
+    page2, cursors2 = split_keyset_page(rows[2:], limit=2, cursor=Cursor(after_ts=120))
+    assert [r.ts_unix for r in page2] == [180]
+    assert cursors2.next_cursor is None
+    assert cursors2.previous_cursor is not None
+    assert decode_cursor(cursors2.previous_cursor) == Cursor(before_ts=180)
+
+
+def test_split_keyset_page_backward() -> None:
+    rows = [_Row(60), _Row(120), _Row(180)]
+
+    page, cursors = split_keyset_page(rows, limit=2, cursor=Cursor(before_ts=240))
+    assert [r.ts_unix for r in page] == [120, 180]
+    assert cursors.previous_cursor is not None
+    assert decode_cursor(cursors.previous_cursor) == Cursor(before_ts=120)
+    assert cursors.next_cursor is not None
+    assert decode_cursor(cursors.next_cursor) == Cursor(after_ts=180)
+
+
+def test_build_paginated_response_cursor_links_drop_offset() -> None:
+    request = _FakeRequest(
+        "http://test/prices?ticker=btc_usd&limit=10&offset=0&pagination=cursor"
+    )
+
+    payload = build_paginated_response(
+        request,
+        count=25,
+        limit=10,
+        offset=0,
+        results=[],
+        cursor_page=CursorPage(next_cursor="abc", previous_cursor=None),
+    )
+
+    assert (
+        payload["next"]
+        == "http://test/prices?cursor=abc&limit=10&pagination=cursor&ticker=btc_usd"
+    )
+    assert payload["previous"] is None
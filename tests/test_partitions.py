@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from app.db.partitions import MonthPartition
+
+
+def test_month_partition_bounds() -> None:
+    partition = MonthPartition.containing(1_700_000_000)
+
+    assert partition == MonthPartition(year=2023, month=11)
+    assert partition.name == "price_points_p202311"
+    assert partition.start_ts == 1_698_796_800
+    assert partition.end_ts == 1_701_388_800
+    assert partition.start_ts <= 1_700_000_000 < partition.end_ts
+
+
+def test_month_partition_shift_wraps_years() -> None:
+    partition = MonthPartition(year=2024, month=11)
+
+    assert partition.shift(2) == MonthPartition(year=2025, month=1)
+    assert partition.shift(-11) == MonthPartition(year=2023, month=12)
+    assert partition.shift(1).start_ts == partition.end_ts
+
+
+def test_month_partition_from_name() -> None:
+    assert MonthPartition.from_name("price_points_p202401") == MonthPartition(
+        year=2024, month=1
+    )
+    assert MonthPartition.from_name("price_points_default") is None
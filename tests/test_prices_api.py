@@ -5,17 +5,22 @@ from decimal import Decimal
 
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db_session
+from app.db.replicas import get_lazy_read_db_session, get_read_db_session
 from app.main import app
+from app.services.downsample import ChartPoint
+from app.services.price_service import CandlePage, PriceGap, PricePage, PriceStats
 
 
 @pytest.fixture
 def client() -> Iterator[TestClient]:
-    def _override_db_session() -> Iterator[object]:
-        yield object()
+    def _override_db_session() -> Iterator[AsyncSession]:
+        # Never connected: the services these tests hit are faked.
+        yield AsyncSession()
 
-    app.dependency_overrides[get_db_session] = _override_db_session
+    app.dependency_overrides[get_read_db_session] = _override_db_session
+    app.dependency_overrides[get_lazy_read_db_session] = _override_db_session
 
     with TestClient(app) as test_client:
         yield test_client
@@ -41,6 +46,25 @@ def test_prices_latest_returns_404_when_empty(monkeypatch, client: TestClient) -
     assert resp.json()["detail"]["error"] == "not_found"
 
 
+def test_prices_validate_ticker_against_live_registry(
+    monkeypatch, client: TestClient
+) -> None:
+    class _FakeService:
+        async def page_prices(self, **_kwargs) -> PricePage:
+            return PricePage(rows=[], count=0)
+
+    monkeypatch.setattr("app.api.routes.prices.PriceService", _FakeService)
+    registry = client.app.state.ticker_registry  # pyright: ignore[reportAttributeAccessIssue]
+    registry.replace(["sol_usdc"])
+
+    resp = client.get("/prices", params={"ticker": "sol_usdc"})
+    assert resp.status_code == 200
+
+    resp = client.get("/prices", params={"ticker": "btc_usd"})
+    assert resp.status_code == 422
+    assert resp.json()["detail"]["error"] == "invalid_ticker"
+
+
 def test_prices_range_validates_range_order(client: TestClient) -> None:
     resp = client.get(
         "/prices/range",
@@ -52,12 +76,9 @@ def test_prices_range_validates_range_order(client: TestClient) -> None:
 
 def test_prices_list_and_range_envelope_shape(monkeypatch, client: TestClient) -> None:
     class _FakeService:
-        async def count_prices(self, **_kwargs) -> int:
-            return 2
-
-        async def list_prices(self, **kwargs) -> list[object]:
+        async def page_prices(self, **kwargs) -> PricePage:
             ticker = kwargs["ticker"]
-            return [
+            rows = [
                 type(
                     "PP",
                     (),
@@ -69,9 +90,7 @@ def test_prices_list_and_range_envelope_shape(monkeypatch, client: TestClient) -
                     {"ticker": ticker, "ts_unix": 2, "price": Decimal("2.2")},
                 )(),
             ]
-
-        async def list_range(self, **kwargs) -> list[object]:
-            return await self.list_prices(**kwargs)
+            return PricePage(rows=rows, count=2)
 
         async def latest_price(self, **_kwargs) -> None:
             return None
@@ -121,11 +140,8 @@ def test_prices_list_validates_limit_max(client: TestClient) -> None:
 
 def test_prices_list_returns_empty_envelope(monkeypatch, client: TestClient) -> None:
     class _FakeService:
-        async def count_prices(self, **_kwargs) -> int:
-            return 0
-
-        async def list_prices(self, **_kwargs) -> list[object]:
-            return []
+        async def page_prices(self, **_kwargs) -> PricePage:
+            return PricePage(rows=[], count=0)
 
     monkeypatch.setattr("app.api.routes.prices.PriceService", _FakeService)
 
@@ -137,11 +153,8 @@ def test_prices_list_returns_empty_envelope(monkeypatch, client: TestClient) ->
 
 def test_prices_range_returns_empty_envelope(monkeypatch, client: TestClient) -> None:
     class _FakeService:
-        async def count_prices(self, **_kwargs) -> int:
-            return 0
-
-        async def list_range(self, **_kwargs) -> list[object]:
-            return []
+        async def page_prices(self, **_kwargs) -> PricePage:
+            return PricePage(rows=[], count=0)
 
     monkeypatch.setattr("app.api.routes.prices.PriceService", _FakeService)
 
@@ -172,3 +185,408 @@ def test_prices_latest_returns_price_point(monkeypatch, client: TestClient) -> N
     assert payload["ticker"] == "btc_usd"
     assert payload["ts_unix"] == 2
     assert payload["price"] == "2.2"
+
+
+def test_prices_list_cursor_mode(monkeypatch, client: TestClient) -> None:
+    calls: list[dict[str, object]] = []
+
+    class _FakeService:
+        async def page_prices(self, **kwargs) -> PricePage:
+            calls.append(kwargs)
+            rows = [
+                type("PP", (), {"ticker": "btc_usd", "ts_unix": ts, "price": 1})()
+                for ts in (60, 120, 180)
+            ][: kwargs["limit"]]
+            return PricePage(rows=rows, count=3)
+
+    monkeypatch.setattr("app.api.routes.prices.PriceService", _FakeService)
+
+    resp = client.get(
+        "/prices", params={"ticker": "btc_usd", "limit": 2, "pagination": "cursor"}
+    )
+    assert resp.status_code == 200
+    payload = resp.json()
+    assert [r["ts_unix"] for r in payload["results"]] == [60, 120]
+    assert payload["previous"] is None
+    assert "offset=" not in payload["next"]
+    assert calls[0]["limit"] == 3
+    assert calls[0]["after_ts"] is None
+
+    next_cursor = payload["next"].split("cursor=")[1].split("&")[0]
+    client.get("/prices", params={"ticker": "btc_usd", "cursor": next_cursor})
+    assert calls[1]["after_ts"] == 120
+
+
+def test_prices_list_rejects_bad_cursor(client: TestClient) -> None:
+    resp = client.get("/prices", params={"ticker": "btc_usd", "cursor": "???"})
+    assert resp.status_code == 422
+    assert resp.json()["detail"]["error"] == "invalid_cursor"
+
+    resp2 = client.get(
+        "/prices",
+        params={"ticker": "btc_usd", "pagination": "cursor", "offset": 10},
+    )
+    assert resp2.status_code == 422
+    assert resp2.json()["detail"]["error"] == "invalid_pagination"
+
+
+def test_prices_range_count_none_probes_next_page(
+    monkeypatch, client: TestClient
+) -> None:
+    calls: list[dict[str, object]] = []
+
+    class _FakeService:
+        async def page_prices(self, **kwargs) -> PricePage:
+            calls.append(kwargs)
+            rows = [
+                type("PP", (), {"ticker": "btc_usd", "ts_unix": ts, "price": 1})()
+                for ts in (60, 120, 180)
+            ][: kwargs["limit"]]
+            return PricePage(rows=rows, count=None)
+
+    monkeypatch.setattr("app.api.routes.prices.PriceService", _FakeService)
+
+    resp = client.get(
+        "/prices/range",
+        params={"ticker": "btc_usd", "limit": 2, "count": "none"},
+    )
+    assert resp.status_code == 200
+    payload = resp.json()
+    assert payload["count"] is None
+    assert len(payload["results"]) == 2
+    assert payload["next"] is not None
+    assert calls[0]["limit"] == 3
+    assert calls[0]["count_mode"] == "none"
+
+    resp2 = client.get(
+        "/prices/range",
+        params={"ticker": "btc_usd", "limit": 5, "count": "none"},
+    )
+    assert resp2.json()["next"] is None
+
+
+def test_prices_range_fill_requires_window(client: TestClient) -> None:
+    resp = client.get(
+        "/prices/range", params={"ticker": "btc_usd", "from_ts": 60, "fill": "null"}
+    )
+    assert resp.status_code == 422
+    assert resp.json()["detail"]["error"] == "invalid_fill"
+
+
+def test_prices_range_fill_marks_synthetic_rows(
+    monkeypatch, client: TestClient
+) -> None:
+    calls: list[dict[str, object]] = []
+
+    class _FakeService:
+        async def page_filled_prices(self, **kwargs) -> PricePage:
+            calls.append(kwargs)
+            rows = [
+                type(
+                    "PP",
+                    (),
+                    {"ticker": "btc_usd", "ts_unix": ts, "price": price, "filled": f},
+                )()
+                for ts, price, f in ((60, Decimal("1"), False), (120, None, True))
+            ]
+            return PricePage(rows=rows, count=2)
+
+    monkeypatch.setattr("app.api.routes.prices.PriceService", _FakeService)
+
+    resp = client.get(
+        "/prices/range",
+        params={"ticker": "btc_usd", "from_ts": 60, "to_ts": 120, "fill": "null"},
+    )
+    assert resp.status_code == 200
+    assert resp.json()["results"] == [
+        {"ticker": "btc_usd", "ts_unix": 60, "price": "1", "filled": False},
+        {"ticker": "btc_usd", "ts_unix": 120, "price": None, "filled": True},
+    ]
+    assert calls[0]["fill"] == "null"
+
+
+def test_prices_gaps_lists_missing_intervals(monkeypatch, client: TestClient) -> None:
+    class _FakeService:
+        async def list_gaps(self, **kwargs) -> list[PriceGap]:
+            gaps = [
+                PriceGap(from_ts=120, to_ts=240, missing=3),
+                PriceGap(from_ts=600, to_ts=600, missing=1),
+            ]
+            return gaps[: kwargs["limit"]]
+
+    monkeypatch.setattr("app.api.routes.prices.PriceService", _FakeService)
+
+    resp = client.get(
+        "/prices/gaps",
+        params={"ticker": "btc_usd", "from_ts": 60, "to_ts": 660, "limit": 1},
+    )
+    assert resp.status_code == 200
+    payload = resp.json()
+    assert payload["results"] == [{"from_ts": 120, "to_ts": 240, "missing": 3}]
+    assert payload["next"] is not None
+
+    resp = client.get("/prices/gaps", params={"ticker": "btc_usd", "from_ts": 60})
+    assert resp.status_code == 422
+
+
+def test_prices_list_rejects_unknown_count_mode(client: TestClient) -> None:
+    resp = client.get("/prices", params={"ticker": "btc_usd", "count": "maybe"})
+    assert resp.status_code == 422
+
+
+def test_prices_latest_served_from_cache(monkeypatch, client: TestClient) -> None:
+    calls: list[str] = []
+
+    class _FakeService:
+        async def latest_price(self, **kwargs) -> object:
+            calls.append(kwargs["ticker"])
+            return type(
+                "PP",
+                (),
+                {"ticker": kwargs["ticker"], "ts_unix": 60, "price": Decimal("1.5")},
+            )()
+
+    monkeypatch.setattr("app.api.routes.prices.PriceService", _FakeService)
+
+    first = client.get("/prices/latest", params={"ticker": "btc_usd"})
+    second = client.get("/prices/latest", params={"ticker": "btc_usd"})
+
+    assert first.json() == second.json()
+    assert second.json()["price"] == "1.5"
+    assert calls == ["btc_usd"]
+
+
+def test_prices_ohlc_returns_compact_candles(monkeypatch, client: TestClient) -> None:
+    calls: list[dict[str, object]] = []
+
+    class _FakeService:
+        async def page_ohlc(self, **kwargs) -> CandlePage:
+            calls.append(kwargs)
+            candle = type(
+                "Candle",
+                (),
+                {
+                    "ts_unix": 300,
+                    "open": Decimal("1"),
+                    "high": Decimal("3"),
+                    "low": Decimal("0.5"),
+                    "close": Decimal("2"),
+                    "count": 5,
+                },
+            )()
+            return CandlePage(rows=[candle], count=1)
+
+    monkeypatch.setattr("app.api.routes.prices.PriceService", _FakeService)
+
+    resp = client.get("/prices/ohlc", params={"ticker": "btc_usd", "interval": "5m"})
+    assert resp.status_code == 200
+    assert resp.json() == {
+        "count": 1,
+        "next": None,
+        "previous": None,
+        "results": [
+            {
+                "ts_unix": 300,
+                "open": "1",
+                "high": "3",
+                "low": "0.5",
+                "close": "2",
+                "count": 5,
+            }
+        ],
+    }
+    assert calls[0]["interval"] == 300
+
+
+@pytest.mark.parametrize("interval", ["0", "90", "5x", "abc", "-1h"])
+def test_prices_ohlc_validates_interval(client: TestClient, interval: str) -> None:
+    resp = client.get(
+        "/prices/ohlc", params={"ticker": "btc_usd", "interval": interval}
+    )
+    assert resp.status_code == 422
+    assert resp.json()["detail"]["error"] == "invalid_interval"
+
+
+def test_prices_range_closed_window_is_cacheable(
+    monkeypatch, client: TestClient
+) -> None:
+    calls: list[dict[str, object]] = []
+
+    class _FakeService:
+        async def page_prices(self, **kwargs) -> PricePage:
+            calls.append(kwargs)
+            rows = [type("PP", (), {"ticker": "btc_usd", "ts_unix": 60, "price": 1})()]
+            return PricePage(rows=rows, count=1)
+
+    monkeypatch.setattr("app.api.routes.prices.PriceService", _FakeService)
+    cache = client.app.state.latest_price_cache  # pyright: ignore[reportAttributeAccessIssue]
+    cache.load_late_writes({})
+    params = {"ticker": "btc_usd", "from_ts": 60, "to_ts": 120}
+
+    resp = client.get("/prices/range", params=params)
+    assert resp.status_code == 200
+    assert resp.headers["cache-control"] == "public, max-age=86400"
+    assert resp.headers["last-modified"] == "Thu, 01 Jan 1970 00:03:00 GMT"
+    etag = resp.headers["etag"]
+
+    resp = client.get("/prices/range", params=params, headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.headers["etag"] == etag
+    assert len(calls) == 1
+
+    resp = client.get(
+        "/prices/range", params={**params, "limit": 5}, headers={"If-None-Match": etag}
+    )
+    assert resp.status_code == 200
+
+
+def test_prices_range_closed_window_revalidates_after_late_write(
+    monkeypatch, client: TestClient
+) -> None:
+    class _FakeService:
+        async def page_prices(self, **_kwargs) -> PricePage:
+            rows = [type("PP", (), {"ticker": "btc_usd", "ts_unix": 60, "price": 1})()]
+            return PricePage(rows=rows, count=1)
+
+    monkeypatch.setattr("app.api.routes.prices.PriceService", _FakeService)
+    cache = client.app.state.latest_price_cache  # pyright: ignore[reportAttributeAccessIssue]
+    cache.load_late_writes({})
+    params = {"ticker": "btc_usd", "from_ts": 60, "to_ts": 120}
+    etag = client.get("/prices/range", params=params).headers["etag"]
+
+    # A backfilled row landed in the window an hour ago.
+    cache.handle_late_write('{"ticker": "btc_usd", "late_write_ts": 1700000000}')
+
+    resp = client.get("/prices/range", params=params, headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.headers["etag"] != etag
+    assert resp.headers["last-modified"] == "Tue, 14 Nov 2023 22:13:20 GMT"
+
+    resp = client.get(
+        "/prices/range", params=params, headers={"If-None-Match": resp.headers["etag"]}
+    )
+    assert resp.status_code == 304
+
+
+def test_prices_range_closed_window_skips_validators_until_late_writes_known(
+    monkeypatch, client: TestClient
+) -> None:
+    class _FakeService:
+        async def page_prices(self, **_kwargs) -> PricePage:
+            return PricePage(rows=[], count=0)
+
+    monkeypatch.setattr("app.api.routes.prices.PriceService", _FakeService)
+    cache = client.app.state.latest_price_cache  # pyright: ignore[reportAttributeAccessIssue]
+    cache.forget_late_writes()
+
+    resp = client.get(
+        "/prices/range", params={"ticker": "btc_usd", "from_ts": 60, "to_ts": 120}
+    )
+    assert resp.status_code == 200
+    assert "etag" not in resp.headers
+    assert resp.headers["cache-control"] == "public, max-age=5"
+
+
+def test_prices_list_open_window_follows_latest_bucket(
+    monkeypatch, client: TestClient
+) -> None:
+    class _FakeService:
+        async def page_prices(self, **_kwargs) -> PricePage:
+            return PricePage(rows=[], count=0)
+
+    monkeypatch.setattr("app.api.routes.prices.PriceService", _FakeService)
+    cache = client.app.state.latest_price_cache  # pyright: ignore[reportAttributeAccessIssue]
+    cache.put(ticker="btc_usd", ts_unix=1_700_000_000, price=Decimal("1"))
+
+    resp = client.get("/prices", params={"ticker": "btc_usd"})
+    assert resp.headers["cache-control"] == "public, max-age=5"
+    etag = resp.headers["etag"]
+    resp = client.get(
+        "/prices", params={"ticker": "btc_usd"}, headers={"If-None-Match": etag}
+    )
+    assert resp.status_code == 304
+
+    cache.put(ticker="btc_usd", ts_unix=1_700_000_060, price=Decimal("2"))
+    resp = client.get(
+        "/prices", params={"ticker": "btc_usd"}, headers={"If-None-Match": etag}
+    )
+    assert resp.status_code == 200
+    assert resp.headers["etag"] != etag
+
+
+def test_prices_downsample_returns_chart_points(
+    monkeypatch, client: TestClient
+) -> None:
+    calls: list[dict[str, object]] = []
+
+    class _FakeService:
+        async def downsample(self, **kwargs) -> list[ChartPoint]:
+            calls.append(kwargs)
+            return [ChartPoint(ts_unix=60, price=Decimal("1.50"))]
+
+    monkeypatch.setattr("app.api.routes.prices.PriceService", _FakeService)
+
+    resp = client.get(
+        "/prices/downsample",
+        params={
+            "ticker": "btc_usd",
+            "from_ts": 0,
+            "to_ts": 3600,
+            "points": 500,
+            "method": "minmax",
+        },
+    )
+    assert resp.status_code == 200
+    assert resp.json() == {
+        "ticker": "btc_usd",
+        "method": "minmax",
+        "from_ts": 0,
+        "to_ts": 3600,
+        "results": [{"ts_unix": 60, "price": "1.50"}],
+    }
+    assert calls[0]["points"] == 500
+
+
+def test_prices_downsample_lttb_needs_numpy(monkeypatch, client: TestClient) -> None:
+    monkeypatch.setattr("app.api.routes.prices.lttb_available", lambda: False)
+
+    resp = client.get(
+        "/prices/downsample", params={"ticker": "btc_usd", "from_ts": 0, "to_ts": 60}
+    )
+    assert resp.status_code == 501
+    assert resp.json()["detail"]["error"] == "method_unavailable"
+
+
+def test_prices_stats_reports_window_summary(monkeypatch, client: TestClient) -> None:
+    class _FakeService:
+        async def price_stats(self, **kwargs) -> PriceStats:
+            assert (kwargs["from_ts"], kwargs["to_ts"]) == (0, 7199)
+            return PriceStats(
+                open=Decimal("10"),
+                high=Decimal("12"),
+                low=Decimal("9"),
+                close=Decimal("11"),
+                count=4,
+                mean=Decimal("10.5"),
+            )
+
+    monkeypatch.setattr("app.api.routes.prices.PriceService", _FakeService)
+    cache = client.app.state.latest_price_cache  # pyright: ignore[reportAttributeAccessIssue]
+    cache.load_late_writes({})
+
+    resp = client.get(
+        "/prices/stats", params={"ticker": "btc_usd", "from_ts": 0, "to_ts": 7199}
+    )
+    assert resp.status_code == 200
+    assert resp.json() == {
+        "ticker": "btc_usd",
+        "from_ts": 0,
+        "to_ts": 7199,
+        "open": "10",
+        "high": "12",
+        "low": "9",
+        "close": "11",
+        "count": 4,
+        "mean": "10.5",
+    }
+    assert "etag" in resp.headers
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.engine import make_url
+
+from app.api.caching import window_is_closed
+from app.core.config import get_settings
+from app.db.replicas import ReadRouter, connect_read_session, parse_read_urls
+
+
+class _FakeEngine:
+    def __init__(self, name: str, *, down: bool) -> None:
+        self.name = name
+        self.down = down
+        self.url = make_url(f"postgresql+asyncpg://app:secret@{name}/prices")
+        self.sync_engine = self
+        # What the probe query returns: (streaming, lag seconds).
+        self.probe = (True, 0.0)
+
+    @asynccontextmanager
+    async def connect(self) -> AsyncIterator[SimpleNamespace]:
+        if self.down:
+            raise ConnectionRefusedError(self.name)
+
+        async def _execute(_statement: object) -> SimpleNamespace:
+            return SimpleNamespace(one=lambda: self.probe)
+
+        yield SimpleNamespace(execute=_execute)
+
+
+class _FakeSession:
+    def __init__(self, engine: _FakeEngine) -> None:
+        self.bind = engine
+        self.sync_session = SimpleNamespace(bind=engine)
+        self.info: dict[str, object] = {}
+
+    @property
+    def name(self) -> str:
+        return self.bind.name
+
+    async def connection(self) -> None:
+        if self.bind.down:
+            raise ConnectionRefusedError(self.bind.name)
+
+    async def close(self) -> None:
+        pass
+
+
+class _FakeDatabase:
+    def __init__(self, name: str, *, down: bool = False) -> None:
+        self.engine = _FakeEngine(name, down=down)
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[_FakeSession]:
+        session = _FakeSession(self.engine)
+        await session.connection()
+        yield session
+
+    @asynccontextmanager
+    async def _lazy_session(self) -> AsyncIterator[_FakeSession]:
+        yield _FakeSession(self.engine)
+
+    def sessionmaker(self):
+        return self._lazy_session()
+
+
+def test_parse_read_urls_splits_commas() -> None:
+    assert parse_read_urls("") == []
+    assert parse_read_urls(" postgresql://a/x , ,postgresql://b/x") == [
+        "postgresql://a/x",
+        "postgresql://b/x",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_reads_rotate_over_replicas() -> None:
+    reads = ReadRouter(
+        _FakeDatabase("primary"), [_FakeDatabase("r1"), _FakeDatabase("r2")]
+    )
+
+    served = []
+    for _ in range(4):
+        async with reads.session() as session:
+            served.append(session.name)
+    assert served == ["r1", "r2", "r1", "r2"]
+
+
+@pytest.mark.asyncio
+async def test_reads_without_replicas_use_primary() -> None:
+    reads = ReadRouter(_FakeDatabase("primary"))
+
+    async with reads.session(lazy=True) as session:
+        assert session.name == "primary"
+    assert reads.status() == []
+
+
+@pytest.mark.asyncio
+async def test_unreachable_replica_fails_over_to_primary() -> None:
+    reads = ReadRouter(_FakeDatabase("primary"), [_FakeDatabase("r1", down=True)])
+
+    async with reads.session() as session:
+        assert session.name == "primary"
+
+    (status,) = reads.status()
+    assert status["healthy"] is False
+    assert "secret" not in str(status["url"])
+
+
+@pytest.mark.asyncio
+async def test_lazy_session_fails_over_when_it_connects() -> None:
+    reads = ReadRouter(_FakeDatabase("primary"), [_FakeDatabase("r1", down=True)])
+
+    async with reads.session(lazy=True) as session:
+        # Lazy: the dead replica is only found out on connecting.
+        assert session.name == "r1"
+        await connect_read_session(session)
+        assert session.name == "primary"
+        assert session.sync_session.bind.name == "primary"
+
+    (status,) = reads.status()
+    assert status["healthy"] is False
+    async with reads.session(lazy=True) as session:
+        assert session.name == "primary"
+
+
+@pytest.mark.asyncio
+async def test_connection_lost_mid_request_takes_replica_out() -> None:
+    reads = ReadRouter(_FakeDatabase("primary"), [_FakeDatabase("r1")])
+
+    with pytest.raises(ConnectionResetError):
+        async with reads.session(lazy=True) as session:
+            assert session.name == "r1"
+            raise ConnectionResetError
+
+    async with reads.session(lazy=True) as session:
+        assert session.name == "primary"
+
+
+@pytest.mark.asyncio
+async def test_probe_fails_replica_without_streaming_receiver() -> None:
+    r1 = _FakeDatabase("r1")
+    reads = ReadRouter(_FakeDatabase("primary"), [r1], max_lag_seconds=5)
+
+    await reads.check()
+    assert reads.status()[0]["eligible"] is True
+
+    # Cut off from the primary: nothing left to replay, so zero "lag".
+    r1.engine.probe = (False, 0.0)
+    await reads.check()
+    (status,) = reads.status()
+    assert status["healthy"] is False
+    assert status["lag_seconds"] is None
+    async with reads.session(lazy=True) as session:
+        assert session.name == "primary"
+
+    r1.engine.probe = (True, 0.0)
+    await reads.check()
+    assert reads.status()[0]["eligible"] is True
+
+
+@pytest.mark.asyncio
+async def test_lag_guard_skips_stale_and_unmeasured_replicas() -> None:
+    reads = ReadRouter(
+        _FakeDatabase("primary"),
+        [_FakeDatabase("r1"), _FakeDatabase("r2")],
+        max_lag_seconds=5,
+    )
+
+    async with reads.session() as session:
+        assert session.name == "primary"
+
+    r1, r2 = reads._replicas
+    r1.lag_seconds = 30.0
+    r2.lag_seconds = 1.0
+    for _ in range(3):
+        async with reads.session() as session:
+            assert session.name == "r2"
+
+
+@pytest.mark.asyncio
+async def test_default_lag_guard_keeps_closed_windows_off_lagging_replicas() -> None:
+    now_ts = 1_700_000_000
+    # Closed as soon as it ended a minute ago, and then cached for a day.
+    assert window_is_closed(now_ts - 120, now_ts=now_ts)
+    max_lag = get_settings().db_replica_max_lag_seconds
+    assert 0 < max_lag < 60
+
+    reads = ReadRouter(
+        _FakeDatabase("primary"), [_FakeDatabase("r1")], max_lag_seconds=max_lag
+    )
+    (r1,) = reads._replicas
+    r1.lag_seconds = 45.0
+    async with reads.session() as session:
+        assert session.name == "primary"
+
+    r1.lag_seconds = 2.0
+    async with reads.session() as session:
+        assert session.name == "r1"
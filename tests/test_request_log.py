@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import json
+import logging
+from collections.abc import Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import get_settings
+from app.core.logging import JsonFormatter
+from app.db.instrumentation import account_queries, record_query
+from app.main import app
+
+
+@pytest.fixture
+def slow_query_ms(monkeypatch) -> Iterator[None]:
+    monkeypatch.setenv("DB_SLOW_QUERY_MS", "100")
+    get_settings.cache_clear()
+    yield
+    get_settings.cache_clear()
+
+
+def test_queries_are_accounted_to_the_active_source(slow_query_ms, caplog) -> None:
+    with caplog.at_level(logging.WARNING, logger="app.db.slow_query"):
+        with account_queries("GET /prices") as account:
+            record_query("SELECT 1", (), 0.01)
+            record_query("SELECT * FROM price_points WHERE id = $1", (7,), 0.25)
+        record_query("SELECT 2", (), 0.5)
+
+    assert account.count == 2
+    assert account.seconds == pytest.approx(0.26)
+
+    slow = [record for record in caplog.records if record.message == "slow query"]
+    assert [record.source for record in slow] == ["GET /prices", None]
+    assert slow[0].statement == "SELECT * FROM price_points WHERE id = $1"
+    assert slow[0].parameters == "(7,)"
+    assert slow[0].duration_ms == 250.0
+
+
+def test_json_formatter_includes_extra_fields() -> None:
+    record = logging.LogRecord("app.request", logging.INFO, "", 0, "request", (), None)
+    record.db_queries = 3
+    record.route = "/prices/latest"
+    record.color_message = "\x1b[1mrequest\x1b[0m"
+
+    payload = json.loads(JsonFormatter().format(record))
+
+    assert payload["msg"] == "request"
+    assert payload["db_queries"] == 3
+    assert payload["route"] == "/prices/latest"
+    assert "color_message" not in payload
+    assert "args" not in payload
+
+
+def test_request_log_and_server_timing_header(caplog) -> None:
+    with (
+        TestClient(app) as client,
+        caplog.at_level(logging.INFO, logger="app.api.request_log"),
+    ):
+        resp = client.get("/health")
+
+    assert resp.status_code == 200
+    db, app_timing = resp.headers["server-timing"].split(", ")
+    assert db.startswith("db;dur=0.00;") and db.endswith('desc="0 queries"')
+    assert app_timing.startswith("app;dur=")
+
+    (record,) = [r for r in caplog.records if r.name == "app.api.request_log"]
+    assert (record.method, record.route, record.status) == ("GET", "/health", 200)
+    assert record.db_queries == 0
+    assert record.db_time_ms == 0.0
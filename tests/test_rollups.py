@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import pytest
+
+from app.db.models import PriceRollupDaily, PriceRollupHourly
+from app.db.repository import _pick_rollup
+
+
+@pytest.mark.parametrize(
+    ("from_ts", "to_ts", "interval", "expected"),
+    [
+        # Unbounded windows take the coarsest rollup.
+        (None, None, None, PriceRollupDaily),
+        # Two whole days inside, so days answer the middle.
+        (3_000, 3 * 86_400 + 10, None, PriceRollupDaily),
+        # No whole day, but whole hours.
+        (1_800, 4 * 3_600 + 59, None, PriceRollupHourly),
+        # A window ending exactly at a bucket boundary still covers it.
+        (0, 86_399, None, PriceRollupDaily),
+        # Less than one whole hour: raw points only.
+        (60, 3_599 + 60, None, None),
+        # Two-hour candles cannot be built from days.
+        (0, 10 * 86_400, 7_200, PriceRollupHourly),
+        # Fifteen-minute candles are finer than any rollup.
+        (0, 10 * 86_400, 900, None),
+        (0, 10 * 86_400, 2 * 86_400, PriceRollupDaily),
+    ],
+)
+def test_pick_rollup_uses_coarsest_exact_grain(
+    from_ts: int | None, to_ts: int | None, interval: int | None, expected: type | None
+) -> None:
+    picked = _pick_rollup(from_ts=from_ts, to_ts=to_ts, interval=interval)
+    assert (picked[1] if picked else None) is expected
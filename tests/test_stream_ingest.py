@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+from app.deribit.stream import IndexPriceTick
+from app.services.stream_ingest import BucketAggregator
+
+
+def _tick(ticker: str, price: str, ts_unix: int) -> IndexPriceTick:
+    return IndexPriceTick(ticker, Decimal(price), ts_unix * 1000 + 250)
+
+
+def test_bucket_aggregator_keeps_last_price_per_bucket() -> None:
+    aggregator = BucketAggregator(bucket_seconds=60)
+
+    assert aggregator.add(_tick("btc_usd", "1", 60)) == []
+    assert aggregator.add(_tick("eth_usd", "10", 61)) == []
+    assert aggregator.add(_tick("btc_usd", "2", 119)) == []
+
+    closed = aggregator.add(_tick("btc_usd", "3", 120))
+
+    assert closed == [(60, {"btc_usd": Decimal("2"), "eth_usd": Decimal("10")})]
+    assert aggregator.drain() == [(120, {"btc_usd": Decimal("3")})]
+    assert aggregator.drain() == []
+
+
+def test_bucket_aggregator_supports_sub_minute_buckets() -> None:
+    aggregator = BucketAggregator(bucket_seconds=5)
+
+    aggregator.add(_tick("btc_usd", "1", 100))
+    closed = aggregator.add(_tick("btc_usd", "2", 107))
+    late = aggregator.add(_tick("eth_usd", "9", 104))
+
+    assert closed == [(100, {"btc_usd": Decimal("1")})]
+    assert late == []
+    assert aggregator.drain() == [
+        (100, {"eth_usd": Decimal("9")}),
+        (105, {"btc_usd": Decimal("2")}),
+    ]
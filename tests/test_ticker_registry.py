@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from app.services.ticker_registry import TickerRegistry
+
+
+def test_registry_membership_and_replace() -> None:
+    registry = TickerRegistry(["eth_usd", "btc_usd"])
+
+    assert "btc_usd" in registry
+    assert "sol_usdc" not in registry
+    assert registry.names() == ("btc_usd", "eth_usd")
+
+    registry.replace(["sol_usdc"])
+
+    assert "btc_usd" not in registry
+    assert "sol_usdc" in registry
+    assert len(registry) == 1
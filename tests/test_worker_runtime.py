@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import asyncio
+
+from app.workers.runtime import WorkerResources, WorkerRuntime
+
+
+async def _loop_and_resources(
+    resources: WorkerResources,
+) -> tuple[asyncio.AbstractEventLoop, WorkerResources]:
+    return asyncio.get_running_loop(), resources
+
+
+def test_runtime_reuses_loop_and_resources_across_tasks() -> None:
+    runtime = WorkerRuntime()
+
+    try:
+        first = runtime.run_with_resources(_loop_and_resources)
+        second = runtime.run_with_resources(_loop_and_resources)
+    finally:
+        runtime.stop()
+
+    assert first[0] is second[0]
+    assert first[1] is second[1]
+    assert first[0].is_closed()
+    assert not runtime.started
+
+
+def test_runtime_stop_is_idempotent() -> None:
+    runtime = WorkerRuntime()
+
+    runtime.stop()
+    runtime.start()
+    runtime.stop()
+    runtime.stop()
+
+    assert not runtime.started